@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import numpy as np
+
+
+class PCMBuffer:
+    """Growable float32 sample buffer for streaming decodes.
+
+    Storage is preallocated and doubles when full, so appending a chunk
+    costs a copy of the chunk only (amortized), unlike ``bytes += chunk``
+    which copies everything received so far. ``view``/``tail`` return views
+    into the storage; they stay valid until the next ``append`` or ``clear``.
+    """
+
+    def __init__(self, capacity: int = 16000 * 30) -> None:
+        self._data = np.zeros(max(1, int(capacity)), dtype=np.float32)
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    @property
+    def capacity(self) -> int:
+        return len(self._data)
+
+    def append_pcm16(self, chunk: bytes) -> None:
+        """Append int16 PCM bytes, scaled to [-1, 1)."""
+        pcm = np.frombuffer(chunk, dtype=np.int16)
+        end = self._reserve(len(pcm))
+        np.multiply(pcm, 1.0 / 32768.0, out=self._data[self._len:end], casting="unsafe")
+        self._len = end
+
+    def append(self, samples: np.ndarray) -> None:
+        end = self._reserve(len(samples))
+        self._data[self._len:end] = samples
+        self._len = end
+
+    def _reserve(self, n: int) -> int:
+        end = self._len + n
+        if end > len(self._data):
+            grown = np.zeros(max(end, 2 * len(self._data)), dtype=np.float32)
+            grown[:self._len] = self._data[:self._len]
+            self._data = grown
+        return end
+
+    def view(self) -> np.ndarray:
+        return self._data[:self._len]
+
+    def tail(self, n: int) -> np.ndarray:
+        return self._data[max(0, self._len - n):self._len]
+
+    def keep_last(self, n: int) -> None:
+        """Drop all but the last ``n`` samples (capacity is kept)."""
+        if self._len > n:
+            self._data[:n] = self._data[self._len - n:self._len]
+            self._len = n
+
+    def clear(self) -> None:
+        self._len = 0
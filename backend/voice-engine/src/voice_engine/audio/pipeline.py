@@ -6,18 +6,31 @@ import sounddevice as sd
 import numpy as np
 from typing import Callable, Optional
 
+from voice_engine.audio.resample import StreamingResampler
+
 class AudioPipeline:
+    """Mic capture at the device rate, yielded as mono int16 chunks at ``output_rate``.
+
+    A 48 kHz (or stereo) device is downmixed and resampled in ``stream()``,
+    off the audio callback, and re-chunked to ``chunk_size`` output samples
+    (512 at 16 kHz is one Silero VAD window).
+    """
+
     def __init__(
         self, 
         sample_rate: int = 16000, 
         channels: int = 1, 
         chunk_size: int = 512,
-        on_audio_level: Optional[Callable[[float], None]] = None
+        on_audio_level: Optional[Callable[[float], None]] = None,
+        output_rate: Optional[int] = None,
     ):
         self.sample_rate = sample_rate
         self.channels = channels
         self.chunk_size = chunk_size
         self.on_audio_level = on_audio_level
+        self.output_rate = output_rate or sample_rate
+        self._resampler = StreamingResampler(sample_rate, self.output_rate)
+        self._pending = np.zeros(0, dtype=np.float32)
         
         self._queue: queue.Queue[bytes] = queue.Queue()
         self._stream: Optional[sd.InputStream] = None
@@ -41,7 +54,7 @@ class AudioPipeline:
             samplerate=self.sample_rate,
             channels=self.channels,
             callback=self._callback,
-            blocksize=self.chunk_size,
+            blocksize=self.chunk_size * self.sample_rate // self.output_rate,
             dtype='int16'
         )
         self._stream.start()
@@ -52,13 +65,26 @@ class AudioPipeline:
             self._stream.stop()
             self._stream.close()
 
+    def convert(self, raw: bytes) -> list[bytes]:
+        """Device-format int16 bytes -> zero or more ``chunk_size`` mono int16 chunks at ``output_rate``."""
+        if self.channels == 1 and self._resampler.passthrough:
+            return [raw]
+        frames = np.frombuffer(raw, dtype=np.int16).reshape(-1, self.channels)
+        mono = frames.mean(axis=1, dtype=np.float32) if self.channels > 1 else frames[:, 0].astype(np.float32)
+        self._pending = np.concatenate([self._pending, self._resampler.process(mono)])
+        n = len(self._pending) // self.chunk_size * self.chunk_size
+        out = np.clip(np.round(self._pending[:n]), -32768, 32767).astype(np.int16)
+        self._pending = self._pending[n:]
+        return [c.tobytes() for c in out.reshape(-1, self.chunk_size)]
+
     async def stream(self):
         """Generator that yields audio chunks as they arrive."""
         while self._running or not self._queue.empty():
             try:
                 # Use a small timeout to allow checking _running
-                chunk = await asyncio.to_thread(self._queue.get, timeout=0.1)
-                yield chunk
+                raw = await asyncio.to_thread(self._queue.get, timeout=0.1)
+                for chunk in self.convert(raw):
+                    yield chunk
             except queue.Empty:
                 await asyncio.sleep(0.01)
                 continue
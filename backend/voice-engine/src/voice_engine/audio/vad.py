@@ -1,29 +1,182 @@
 from __future__ import annotations
 
-import torch
+import importlib.util
+import logging
+import os
 import numpy as np
 from typing import Optional
 
-class SileroVAD:
-    def __init__(self, threshold: float = 0.5, sample_rate: int = 16000):
-        # Load Silero VAD model
-        self.model, utils = torch.hub.load(repo_or_dir='snakers4/silero-vad',
+from voice_engine.models import registry
+
+logger = logging.getLogger(__name__)
+
+WINDOW = 512  # samples per Silero window at 16 kHz
+
+# OnnxSilero is a verbatim copy of wandavoice.vad.OnnxSilero
+# (tests/test_vendored.py fails when the two differ).
+
+
+def _find_onnx_model() -> Optional[str]:
+    # faster-whisper >= 1.2 ships the v6 Silero export; locate it without importing it
+    spec = importlib.util.find_spec("faster_whisper")
+    if spec and spec.origin:
+        path = os.path.join(os.path.dirname(spec.origin), "assets", "silero_vad_v6.onnx")
+        if os.path.exists(path):
+            return path
+    return None
+
+
+class OnnxSilero:
+    """Silero VAD on ONNX Runtime, pinned to one thread, no per-window allocations.
+
+    The recurrent state lives in two preallocated buffer sets that are
+    swapped after every window, the 64-sample context plus window are
+    copied into one reused input array, and all of them are bound once via
+    IOBinding. Understands the v6 export shipped with faster-whisper
+    (inputs ``input``/``h``/``c``) and the upstream v5 export
+    (``input``/``state``/``sr``).
+
+    The InferenceSession is shared through the model registry; state and
+    bindings are per instance, so several streams can use one session.
+    The backend vendors this class (voice_engine.audio.vad).
+    """
+
+    CONTEXT = 64
+
+    def __init__(self, path: str, samplerate: int = 16000):
+        self.session = registry.acquire("silero_vad", path, loader=lambda: self._load(path), compute_type="onnx")
+        self.samplerate = samplerate
+
+        inputs = {i.name for i in self.session.get_inputs()}
+        outputs = [o.name for o in self.session.get_outputs()]
+        if "state" in inputs:  # upstream v5: one (2, 1, 128) state tensor + sample rate
+            self._state_names = [("state", outputs[1])]
+            state_shape = (2, 1, 128)
+        else:  # v6 (faster-whisper asset): LSTM h and c
+            self._state_names = [("h", outputs[1]), ("c", outputs[2])]
+            state_shape = (1, 1, 128)
+
+        self._input = np.zeros((1, self.CONTEXT + WINDOW), dtype=np.float32)
+        self._prob = np.zeros((1, 1) if "state" in inputs else (1,), dtype=np.float32)
+        self._states = [
+            [np.zeros(state_shape, dtype=np.float32) for _ in self._state_names] for _ in range(2)
+        ]
+        self._cur = 0
+
+        self._binding = self.session.io_binding()
+        self._binding.bind_cpu_input("input", self._input)
+        if "sr" in inputs:
+            self._binding.bind_cpu_input("sr", np.array(samplerate, dtype=np.int64))
+        self._binding.bind_output(outputs[0], "cpu", 0, np.float32, list(self._prob.shape), self._prob.ctypes.data)
+        self._bind_state()
+
+    @staticmethod
+    def _load(path: str):
+        import onnxruntime as ort
+
+        opts = ort.SessionOptions()
+        opts.intra_op_num_threads = 1
+        opts.inter_op_num_threads = 1
+        opts.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        opts.log_severity_level = 4
+        return ort.InferenceSession(path, sess_options=opts, providers=["CPUExecutionProvider"])
+
+    def close(self) -> None:
+        if self.session is not None:
+            registry.release(self.session)
+            self.session = None
+
+    def _bind_state(self) -> None:
+        src, dst = self._states[self._cur], self._states[1 - self._cur]
+        for (in_name, out_name), s, d in zip(self._state_names, src, dst):
+            self._binding.bind_cpu_input(in_name, s)
+            self._binding.bind_output(out_name, "cpu", 0, np.float32, list(d.shape), d.ctypes.data)
+
+    def reset(self) -> None:
+        for bufs in self._states:
+            for b in bufs:
+                b.fill(0.0)
+        self._input.fill(0.0)
+
+    def speech_prob(self, frame: np.ndarray) -> float:
+        buf = self._input[0]
+        buf[: self.CONTEXT] = buf[-self.CONTEXT:]  # previous window's tail
+        buf[self.CONTEXT:] = frame
+        self.session.run_with_iobinding(self._binding)
+        self._cur = 1 - self._cur  # new state becomes next window's input
+        self._bind_state()
+        return float(self._prob.flat[0])
+
+
+class _TorchSilero:
+    def __init__(self, sample_rate: int):
+        import torch
+
+        torch.set_num_threads(1)
+        self._torch = torch
+        self.model = registry.acquire(
+            "silero_vad", "snakers4/silero-vad", compute_type="torch",
+            loader=lambda: torch.hub.load(repo_or_dir='snakers4/silero-vad',
                                           model='silero_vad',
                                           force_reload=False,
-                                          onnx=False)
+                                          onnx=False)[0],
+        )
+        self.sample_rate = sample_rate
+
+    def close(self) -> None:
+        registry.release(self.model)
+
+    def reset(self) -> None:
+        self.model.reset_states()
+
+    def speech_prob(self, frame: np.ndarray) -> float:
+        return self.model(self._torch.from_numpy(frame), self.sample_rate).item()
+
+
+class SileroVAD:
+    """Silero speech detection on 512-sample int16 chunks.
+
+    backend: "auto" (ONNX Runtime if a model is found, else torch) | "onnx" | "torch".
+    """
+
+    def __init__(self, threshold: float = 0.5, sample_rate: int = 16000, backend: str = "auto"):
         self.threshold = threshold
         self.sample_rate = sample_rate
         self._is_speaking = False
+        self._frame = np.zeros(WINDOW, dtype=np.float32)
+        self._pending = np.zeros(0, dtype=np.int16)  # samples short of a full window
+
+        path = _find_onnx_model() if backend in ("auto", "onnx") else None
+        if backend == "onnx" and path is None:
+            raise FileNotFoundError("Silero ONNX model not found (faster-whisper assets)")
+        self.model = OnnxSilero(path, sample_rate) if path else _TorchSilero(sample_rate)
+        self.backend = "onnx" if path else "torch"
+        logger.info("Silero VAD backend: %s%s", self.backend, f" ({path})" if path else "")
+
+    def reset(self) -> None:
+        self.model.reset()
+        self._pending = np.zeros(0, dtype=np.int16)
+        self._is_speaking = False
+
+    def close(self) -> None:
+        self.model.close()
 
     def is_speech(self, audio_chunk: bytes) -> bool:
-        # Convert bytes back to float32 for Silero
+        """Speech in any full window of the chunk; other sizes are re-chunked to 512 samples.
+
+        Samples short of a window carry over to the next call; a chunk that
+        completes no window repeats the previous decision.
+        """
         audio_int16 = np.frombuffer(audio_chunk, dtype=np.int16)
-        audio_float32 = audio_int16.astype(np.float32) / 32768.0
-        
-        # Add batch dimension
-        tensor = torch.from_numpy(audio_float32)
-        
-        # Get probability
-        speech_prob = self.model(tensor, self.sample_rate).item()
-        
-        return speech_prob > self.threshold
+        if len(self._pending):
+            audio_int16 = np.concatenate([self._pending, audio_int16])
+        n = len(audio_int16) // WINDOW * WINDOW
+        self._pending = audio_int16[n:].copy()
+        if n:
+            speech = False
+            for start in range(0, n, WINDOW):
+                # int16 -> float32 into the reused frame buffer
+                np.multiply(audio_int16[start:start + WINDOW], 1.0 / 32768.0, out=self._frame, casting="unsafe")
+                speech = self.model.speech_prob(self._frame) > self.threshold or speech
+            self._is_speaking = speech
+        return self._is_speaking
@@ -48,6 +48,7 @@ class VADProfile(BaseModel):
     continue_window_ms: int
 
 class VADConfig(BaseModel):
+    backend: str = "auto"  # auto|onnx|torch (Silero runtime)
     command: VADProfile = VADProfile(min_speech_ms=120, end_silence_ms=350, continue_window_ms=800)
     chat: VADProfile = VADProfile(min_speech_ms=160, end_silence_ms=650, continue_window_ms=1100)
 
@@ -103,6 +104,22 @@ class STTProfile(BaseModel):
     model: str
 
 
+class STTStreamingConfig(BaseModel):
+    # Live mic: partial decodes of the trailing window, final on a VAD endpoint.
+    partial_interval_ms: int = 500
+    window_s: float = 30.0  # Whisper's context; longer utterances get partials of the tail
+    end_silence_ms: int = 600
+    preroll_ms: int = 300  # audio kept before the VAD fires (its onset lags the speech)
+    max_utterance_s: float = 30.0  # forced final (and buffer bound) without a pause
+
+
+class STTCacheConfig(BaseModel):
+    # Decoded results keyed by audio hash + model/compute type/language/decode params.
+    enabled: bool = True
+    dir: Optional[str] = None  # None = <cas_dir>/stt
+    max_mb: int = 64
+
+
 class STTConfig(BaseModel):
     adapter: str = "faster_whisper"
     profiles: Dict[str, STTProfile] = Field(default_factory=lambda: {
@@ -110,6 +127,14 @@ class STTConfig(BaseModel):
         "final": STTProfile(adapter="faster_whisper", model="medium"),
     })
     active_profile: str = "fast"
+    max_resident: int = 2  # STT models kept loaded for profile switches (LRU)
+    # Used when `vox stt-tune` has no result for a model; device "auto" = GPU if available.
+    device: str = "auto"
+    compute_type: str = "default"
+    cpu_threads: int = 0
+    tuning_file: Optional[str] = "~/.vox/stt_tune.json"  # written by `vox stt-tune`; None = ignore
+    streaming: STTStreamingConfig = Field(default_factory=STTStreamingConfig)
+    cache: STTCacheConfig = Field(default_factory=STTCacheConfig)
     recommended: Dict[str, Any] = Field(default_factory=lambda: {
         "adapters": ["faster_whisper", "whisper_cpp", "sherpa_onnx"],
         "faster_whisper_models": ["tiny", "base", "small", "medium"],
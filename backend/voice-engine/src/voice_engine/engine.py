@@ -5,7 +5,7 @@ import json
 import os
 import time
 import traceback
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 
 from ulid import ULID
 
@@ -75,19 +75,70 @@ class VoiceEngine:
         )
 
         # Real Engines
-        from voice_engine.stt.faster_whisper import FasterWhisperAdapter
+        from voice_engine.stt.cache import STTResultCache
+        from voice_engine.stt.pool import STTModelPool
         from voice_engine.tts.f5_tts import F5TTSAdapter
-        
-        self._stt = FasterWhisperAdapter(
-            model_size=self.config.stt.profiles[self._stt_profile].model,
-            device="cuda"
-        )
+
+        # Decoded results are reused for identical audio + settings (replays, reruns)
+
+        cache_cfg = self.config.stt.cache
+        self._stt_cache = STTResultCache(
+            os.path.expanduser(cache_cfg.dir) if cache_cfg.dir else os.path.join(cas_dir, "stt"),
+            max_bytes=cache_cfg.max_mb << 20,
+        ) if cache_cfg.enabled else None
+
+        # STT profiles swap models at runtime (set_stt_profile) through the pool
+        self._stt_pool = STTModelPool(self._make_stt_adapter, max_resident=self.config.stt.max_resident)
+        prof = self.config.stt.profiles[self._stt_profile]
+        self._stt_pool.load(prof.adapter, prof.model)
+        self._trace_stt_warmup()
         self._tts = F5TTSAdapter()
 
+    def _make_stt_adapter(self, adapter: str, model: str):
+        if adapter != "faster_whisper":
+            raise ValueError(f"unsupported STT adapter '{adapter}'")
+        from voice_engine.stt.faster_whisper import FasterWhisperAdapter
+        from voice_engine.stt.tuning import load_tuning
+
+        stt_cfg = self.config.stt
+        tuned = load_tuning(stt_cfg.tuning_file, model) or {}
+        return FasterWhisperAdapter(
+            model_size=model,
+            device=tuned.get("device", stt_cfg.device),
+            compute_type=tuned.get("compute_type", stt_cfg.compute_type),
+            cpu_threads=int(tuned.get("cpu_threads", stt_cfg.cpu_threads)),
+            cache=self._stt_cache,
+        )
+
+    @property
+    def _stt(self):
+        return self._stt_pool.active
+
+    def _trace_stt_warmup(self) -> None:
+        for name, ms in self._stt.warmup_ms.items():
+            self.trace.counter("stt", f"stt_warmup_{name}", ms, profile=self._stt_profile)
+
     async def _emit(self, session_id: str, component: str, typ: str, payload: Optional[Dict[str, Any]] = None) -> None:
         ev = EventEnvelope(session_id=session_id, component=component, type=typ, payload=payload or {})
         await self.bus.publish(ev)
 
+    async def _emit_stt(self, session_id: str, result) -> None:
+        """Publish an STTResult from a stream as stt_partial / stt_final with its timing."""
+        typ = "stt_final" if result.is_final else "stt_partial"
+        payload = {
+            "text": result.text,
+            "profile": self._stt_profile,
+            "start_ms": result.start_time_ms,
+            "end_ms": result.end_time_ms,
+            "audio_ms": (result.end_time_ms or 0) - (result.start_time_ms or 0),
+            "decode_ms": round(result.decode_ms or 0.0, 1),
+            "cached": result.cached,
+        }
+        if result.is_final:
+            payload["confidence"] = result.confidence
+        self.trace.counter("stt", f"{typ}_decode_ms", payload["decode_ms"], profile=self._stt_profile)
+        await self._emit(session_id, "stt", typ, payload)
+
     def _active_llm_profile(self) -> Dict[str, Any]:
         prof = self.config.llm.profiles.get(self._llm_profile) or self.config.llm.profiles.get("fast")
         return prof.model_dump() if prof else {"model": "unknown"}
@@ -202,8 +253,19 @@ class VoiceEngine:
         await self._emit(session_id, "system", "session_end")
         self.trace.span_end("system", "session")
 
-        # Write artifacts: transcripts + trace + config snapshot (+ devctx marker only, not content)
         transcripts = {"user": "wie geht es dir", "assistant": "Mir geht es gut. Was brauchst du?"}
+        manifest_path, trace_hash = self._write_run(session_id, started_at, ended_at, transcripts)
+        await self._emit(session_id, "system", "run_manifest_written", {"path": manifest_path, "trace_sha256": trace_hash})
+
+        # attach-once semantics
+        if self._dev_mode == "once":
+            self._dev_context = ""
+
+        return session_id
+
+    def _write_run(self, session_id: str, started_at: int, ended_at: int, transcripts: Dict[str, str],
+                   stt_results: Optional[list] = None) -> Tuple[str, str]:
+        # Write artifacts: transcripts + trace + config snapshot (+ devctx marker only, not content)
         tr_hash = cas_put(self.cas_dir, json.dumps(transcripts, ensure_ascii=False).encode("utf-8"))
 
         trace_path = os.path.join(self.runs_dir, time.strftime("%Y-%m-%d"), session_id, "trace.json")
@@ -221,6 +283,11 @@ class VoiceEngine:
             "ended_at_unix_ms": ended_at,
             "mode": self.mode,
             "llm": {"backend": self._llm_backend, "profile": self._llm_profile, "profile_cfg": self._active_llm_profile()},
+            "stt": {
+                "profile": self._stt_profile,
+                "warmup_ms": self._stt.warmup_ms,
+                "cache": self._stt_cache_counts(stt_results),
+            },
             "dev_context": {"attached": bool(self._dev_context.strip()) and self._dev_auto_attach, "mode": self._dev_mode},
             "artifacts": {
                 "transcripts_json_sha256": tr_hash,
@@ -228,13 +295,46 @@ class VoiceEngine:
                 "config_json_sha256": cfg_hash,
             },
         }
-        manifest_path = write_run_manifest(self.runs_dir, session_id, manifest)
-        await self._emit(session_id, "system", "run_manifest_written", {"path": manifest_path, "trace_sha256": trace_hash})
+        return write_run_manifest(self.runs_dir, session_id, manifest), trace_hash  # (path, trace hash)
+
+    def _stt_cache_counts(self, stt_results: Optional[list]) -> Optional[Dict[str, Any]]:
+        # Decodes of this run only (None: no cache, or the run decoded nothing)
+        if self._stt_cache is None or not stt_results:
+            return None
+        hits = sum(1 for r in stt_results if r.cached)
+        return {
+            "hits": hits,
+            "misses": len(stt_results) - hits,
+            "hit_rate": round(hits / len(stt_results), 3),
+            "bytes": self._stt_cache.stats()["bytes"],
+        }
 
-        # attach-once semantics
-        if self._dev_mode == "once":
-            self._dev_context = ""
+    async def replay_audio_session(self, path: str) -> str:
+        """Run a recorded utterance through the active STT model (golden replays).
 
+        Repeated replays of the same file with the same STT settings are
+        served from the STT result cache; the manifest records hits/misses.
+        """
+        session_id = str(ULID())
+        started_at = now_unix_ms()
+        self._current_session = session_id
+        await self._emit(session_id, "system", "session_start", {"mode": "replay", "path": path})
+        self.trace.span_begin("stt", "stt")
+        try:
+            with self._stt_pool.borrow() as stt:
+                result = await stt.transcribe_file(path)
+        except Exception as e:
+            self.trace.span_end("stt", "stt")
+            await self._emit(session_id, "stt", "stt_error", {"path": path, "error": str(e)})
+            await self._emit(session_id, "system", "session_end")
+            return session_id
+        self.trace.span_end("stt", "stt")
+        await self._emit_stt(session_id, result)
+        ended_at = now_unix_ms()
+        await self._emit(session_id, "system", "session_end")
+
+        manifest_path, trace_hash = self._write_run(session_id, started_at, ended_at, {"user": result.text}, [result])
+        await self._emit(session_id, "system", "run_manifest_written", {"path": manifest_path, "trace_sha256": trace_hash})
         return session_id
 
     async def _set_llm_backend(self, backend: str) -> None:
@@ -267,7 +367,28 @@ class VoiceEngine:
             return
         if p not in stt_cfg.profiles:
             return
-        self._stt_profile = p
+        # Load in the background; the current model keeps serving until the new one is ready
+        asyncio.ensure_future(self._swap_stt(p))
+
+    async def _swap_stt(self, profile: str) -> None:
+        prof = self.config.stt.profiles[profile]
+        sid = self._current_session or str(ULID())
+        t0 = time.perf_counter()
+        try:
+            await self._stt_pool.switch(prof.adapter, prof.model)
+        except Exception as e:
+            await self._emit(sid, "stt", "stt_profile_error", {"profile": profile, "error": str(e)})
+            return
+        if self._stt_pool.active_key != (prof.adapter, prof.model):
+            return  # superseded by a later switch
+        self._stt_profile = profile
+        self._trace_stt_warmup()
+        await self._emit(sid, "stt", "stt_profile_changed", {
+            "profile": profile,
+            "model": prof.model,
+            "switch_ms": round((time.perf_counter() - t0) * 1000, 1),
+            "resident": [m for _, m in self._stt_pool.resident()],
+        })
 
     async def handle_command(self, cmd: Command) -> None:
         typ = cmd.type
@@ -287,6 +408,10 @@ class VoiceEngine:
             await self.start_sim_session()
             return
 
+        if typ == "replay_audio":
+            await self.replay_audio_session(str(cmd.payload.get("path", "")))
+            return
+
         if typ == "set_llm_backend":
             await self._set_llm_backend(str(cmd.payload.get("backend", "")))
             return
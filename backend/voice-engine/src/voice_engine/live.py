@@ -15,10 +15,14 @@ if TYPE_CHECKING:
 class LiveAudioEngine:
     def __init__(self, engine: VoiceEngine):
         self.engine = engine
+        audio_cfg = engine.config.audio
         self.pipeline = AudioPipeline(
+            sample_rate=audio_cfg.sample_rate_hz,
+            channels=audio_cfg.channels_in,
+            output_rate=16000,  # VAD and STT run at 16 kHz
             on_audio_level=self._on_audio_level
         )
-        self.vad = SileroVAD()
+        self.vad: Optional[SileroVAD] = None  # borrowed from the model registry in run()
         self._current_session_id: Optional[str] = None
 
     def _on_audio_level(self, level: float):
@@ -28,21 +32,24 @@ class LiveAudioEngine:
 
     async def run(self):
         print("[LIVE] WANDA Audio Engine starting...")
+        if self.vad is None:
+            vad_cfg = getattr(self.engine.config, "vad", None)
+            self.vad = SileroVAD(backend=getattr(vad_cfg, "backend", "auto"))
         self.pipeline.start()
-        
+        streaming = self.engine.config.stt.streaming.model_dump()
+
         try:
-            async for chunk in self.pipeline.stream():
-                if self.vad.is_speech(chunk):
+            # The stream holds the active model; a profile switch applies to the next run.
+            with self.engine._stt_pool.borrow() as stt:
+                async for result in stt.transcribe_stream(self.pipeline.stream(), is_speech=self.vad.is_speech,
+                                                          **streaming):
                     if not self._current_session_id:
                         await self._start_session()
-                    
-                    # Here we would collect speech chunks and feed them to STT
-                    # This is the core loop that needs careful implementation 
-                    # for barge-in and real-time feel.
-                else:
-                    if self._current_session_id:
-                        # Speech ended?
-                        pass
+                    await self.engine._emit_stt(self._current_session_id, result)
+                    if result.is_final:
+                        # VAD endpoint: the utterance is done, the next speech starts a new session
+                        await self.engine._emit(self._current_session_id, "system", "session_end")
+                        self._current_session_id = None
         finally:
             self.pipeline.stop()
 
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+Key = Tuple[str, str, str, str]  # (kind, model id, device, compute type)
+
+# _rss_bytes, _Entry and ModelRegistry are copied verbatim from
+# wandavoice.model_registry; tests/test_vendored.py checks they match.
+
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+class _Entry:
+    def __init__(self, model: Any, load_ms: float, rss_after: int):
+        self.model = model
+        self.load_ms = load_ms
+        self.rss_after = rss_after  # process RSS once loaded, not this model's share
+        self.refs = 0
+        self.warmup: Dict[str, float] = {}
+
+
+class ModelRegistry:
+    """Process-wide cache of loaded models, keyed by kind/id/device/compute type.
+
+    ``acquire`` returns the already loaded model or calls ``loader()`` once
+    (concurrent acquires of the same key wait for that load instead of
+    loading a second copy). Every acquire must be paired with a ``release``;
+    the model is dropped when the last borrower releases it.
+
+    Only share stateless objects (weights, inference sessions); per-stream
+    state such as VAD recurrent state stays with the borrower.
+
+    An optional ``warmup(model)`` runs once right after the load, before
+    any borrower gets the model; the timings it returns are kept with the
+    entry (see ``warmup_ms``). ``on_load(message)`` is told about every load.
+
+    Loads of different keys run concurrently, so the memory a single model
+    takes cannot be told apart; entries record the process RSS right after
+    their load instead.
+
+    The backend vendors this class (voice_engine.models).
+    """
+
+    def __init__(self, on_load: Optional[Callable[[str], None]] = None):
+        self._on_load = on_load
+        self._lock = threading.Lock()
+        self._entries: Dict[Key, _Entry] = {}
+        self._loading: Dict[Key, list] = {}  # [lock, waiters]
+
+    def acquire(self, kind: str, model_id: str, loader: Callable[[], Any], device: str = "cpu", compute_type: str = "",
+                warmup: Optional[Callable[[Any], Dict[str, float]]] = None) -> Any:
+        key = (kind, str(model_id), device, compute_type)
+        with self._lock:
+            # one load lock per key while anyone loads or waits for it
+            slot = self._loading.setdefault(key, [threading.Lock(), 0])
+            slot[1] += 1
+        try:
+            with slot[0]:
+                with self._lock:
+                    entry = self._entries.get(key)
+                    if entry is not None:
+                        entry.refs += 1
+                        return entry.model
+                t0 = time.perf_counter()
+                model = loader()
+                entry = _Entry(model, (time.perf_counter() - t0) * 1000, _rss_bytes())
+                entry.refs = 1
+                if warmup is not None:
+                    entry.warmup = warmup(model)
+                with self._lock:
+                    self._entries[key] = entry
+                if self._on_load is not None:
+                    warm = "".join(f", {k} {v:.0f} ms" for k, v in entry.warmup.items())
+                    self._on_load(f"Model {kind}:{model_id} ({device}/{compute_type or '-'}) loaded in "
+                                  f"{entry.load_ms:.0f} ms, process RSS {entry.rss_after / 2**20:.0f} MB{warm}")
+                return model
+        finally:
+            with self._lock:
+                slot[1] -= 1
+                if not slot[1]:
+                    del self._loading[key]
+
+    def release(self, model: Any) -> None:
+        with self._lock:
+            for key, entry in self._entries.items():
+                if entry.model is model:
+                    entry.refs -= 1
+                    if entry.refs <= 0:
+                        del self._entries[key]
+                    return
+
+    def warmup_ms(self, model: Any) -> Dict[str, float]:
+        """Warm-up timings recorded for a loaded model (empty if none ran)."""
+        with self._lock:
+            for entry in self._entries.values():
+                if entry.model is model:
+                    return dict(entry.warmup)
+        return {}
+
+    def report(self) -> List[Dict[str, Any]]:
+        """Load time and process RSS after the load per loaded model (GPU memory is not included)."""
+        with self._lock:
+            return [
+                {
+                    "kind": k[0], "model": k[1], "device": k[2], "compute_type": k[3],
+                    "refs": e.refs, "load_ms": round(e.load_ms, 1), "process_rss_mb": round(e.rss_after / 2**20, 1),
+                    "warmup_ms": {k: round(v, 1) for k, v in e.warmup.items()},
+                }
+                for k, e in self._entries.items()
+            ]
+
+
+registry = ModelRegistry()
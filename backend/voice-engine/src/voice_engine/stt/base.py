@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Optional, AsyncIterator
+from typing import Callable, Optional, AsyncIterator
 
 @dataclass
 class STTResult:
@@ -12,11 +12,18 @@ class STTResult:
     language: Optional[str] = None
     start_time_ms: Optional[int] = None
     end_time_ms: Optional[int] = None
+    decode_ms: Optional[float] = None
+    cached: bool = False  # served from the STT result cache, not decoded
 
 class STTAdapter(ABC):
     @abstractmethod
-    async def transcribe_stream(self, audio_generator: AsyncIterator[bytes]) -> AsyncIterator[STTResult]:
-        """Transcribe an incoming stream of audio bytes."""
+    async def transcribe_stream(self, audio_generator: AsyncIterator[bytes],
+                                is_speech: Optional[Callable[[bytes], bool]] = None) -> AsyncIterator[STTResult]:
+        """Transcribe an incoming stream of audio bytes.
+
+        Yields partials (``is_final=False``) while audio arrives and a final
+        per utterance; ``is_speech`` (a VAD) marks utterance endpoints.
+        """
         pass
 
     @abstractmethod
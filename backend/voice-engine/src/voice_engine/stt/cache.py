@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+# Vendored from wandavoice.stt_cache; tests/test_vendored.py checks the copy.
+
+
+class STTResultCache:
+    """Decoded STT results keyed by audio content plus decode settings.
+
+    The key is a SHA-256 over the audio (samples, bytes or a file) and the
+    model, device, compute type, language and decode parameters, so audio
+    that comes back (reruns, golden replays) skips the decode. Live
+    microphone audio never repeats; do not look it up. Entries are small
+    JSON files under ``cache_dir``, written as atomic renames, so processes
+    may share the directory. Once they exceed ``max_bytes`` the least
+    recently used (by mtime, touched on every hit) are evicted down to 90%
+    of the budget.
+
+    The backend vendors this class (voice_engine.stt.cache).
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 64 << 20):
+        self.cache_dir = cache_dir
+        self.max_bytes = max(0, int(max_bytes))
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        self._size = sum(os.path.getsize(p) for p in self._entries())
+
+    def _entries(self):
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(".json"):
+                    yield os.path.join(root, name)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key + ".json")
+
+    @staticmethod
+    def key(audio, **settings: Any) -> str:
+        """``audio``: bytes or a numpy array; ``settings``: everything the decode depends on."""
+        if isinstance(audio, np.ndarray):
+            audio = np.ascontiguousarray(audio)
+        h = hashlib.sha256(memoryview(audio).cast("B"))
+        h.update(json.dumps(settings, sort_keys=True, default=str).encode("utf-8"))
+        return h.hexdigest()
+
+    @staticmethod
+    def file_key(path: str, **settings: Any) -> str:
+        """``key`` of the file's bytes, hashed in 1 MiB blocks instead of read whole."""
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        h.update(json.dumps(settings, sort_keys=True, default=str).encode("utf-8"))
+        return h.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                value = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        path = self._path(key)
+        data = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        with self._lock:
+            self._size += len(data)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        for p in self._entries():
+            try:
+                st = os.stat(p)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        entries.sort()
+        self._size = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 9 // 10
+        for _, size, p in entries:
+            if self._size <= target:
+                break
+            try:
+                os.remove(p)
+            except OSError:
+                continue
+            self._size -= size
+            self.evictions += 1
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters since this instance was created, hit rate and cache size."""
+        c = self.counts()
+        lookups = c["hits"] + c["misses"]
+        c["hit_rate"] = round(c["hits"] / lookups, 3) if lookups else 0.0
+        c["bytes"] = self._size
+        return c
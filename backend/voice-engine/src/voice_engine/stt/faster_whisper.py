@@ -1,46 +1,158 @@
 from __future__ import annotations
 
 import asyncio
-from typing import AsyncIterator, Optional
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Optional
 import numpy as np
 from faster_whisper import WhisperModel
 
+from voice_engine.audio.buffer import PCMBuffer
+from voice_engine.models import registry
 from voice_engine.stt.base import STTAdapter, STTResult
+from voice_engine.stt.cache import STTResultCache
+
+def _warmup_clip(sample_rate: int = 16000, seconds: float = 2.0) -> np.ndarray:
+    # Harmonic tone with a syllable-rate envelope over faint noise (deterministic)
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    voiced = sum(np.sin(2 * np.pi * 140 * k * t) / k for k in range(1, 6))
+    envelope = 0.5 * (1 - np.cos(2 * np.pi * 4 * t))
+    noise = np.random.default_rng(0).standard_normal(len(t))
+    return (0.1 * voiced * envelope + 0.003 * noise).astype(np.float32)
+
 
 class FasterWhisperAdapter(STTAdapter):
-    def __init__(self, model_size: str = "large-v3-turbo", device: str = "cuda", compute_type: str = "float16"):
-        # RTX 3070 has 8GB VRAM, float16 is perfect for large-v3-turbo
-        self.model = WhisperModel(model_size, device=device, compute_type=compute_type)
-
-    async def transcribe_stream(self, audio_generator: AsyncIterator[bytes]) -> AsyncIterator[STTResult]:
-        # This is a simplified chunk-based implementation.
-        # Real-time streaming with Faster Whisper usually requires a rolling buffer or VAD-based slicing.
-        # For the MVP, we assume the engine slices audio by VAD.
-        
-        audio_data = b""
+    def __init__(self, model_size: str = "large-v3-turbo", device: str = "auto", compute_type: str = "default",
+                 warmup: bool = True, cpu_threads: int = 0, cache: Optional[STTResultCache] = None):
+        # Device/compute type come from `vox stt-tune` or the stt config; "default"
+        # keeps the weights' own type (float16 on the GPU, converted on CPU).
+        self.model_size, self.device, self.compute_type = model_size, device, compute_type
+        self.cache = cache
+        self.model = registry.acquire(
+            "whisper", model_size,
+            loader=lambda: WhisperModel(model_size, device=device, compute_type=compute_type, cpu_threads=cpu_threads),
+            device=device, compute_type=compute_type,
+            warmup=self._warm_up if warmup else None,
+        )
+        self.warmup_ms: Dict[str, float] = registry.warmup_ms(self.model)
+
+    @staticmethod
+    def _warm_decode(model, clip: np.ndarray) -> None:
+        for beam_size in (5, 1):  # file and streaming decode paths
+            segments, _ = model.transcribe(clip, beam_size=beam_size, language="de", max_new_tokens=16)
+            for _ in segments:
+                pass
+
+    def _warm_up(self, model) -> Dict[str, float]:
+        # CTranslate2 initializes kernels and allocator caches on the first
+        # decode; pay for it at load time and keep cold vs warm for telemetry.
+        clip = _warmup_clip()
+        t0 = time.perf_counter()
+        self._warm_decode(model, clip)
+        cold_ms = (time.perf_counter() - t0) * 1000
+        t0 = time.perf_counter()
+        self._warm_decode(model, clip)
+        return {"cold_ms": cold_ms, "warm_ms": (time.perf_counter() - t0) * 1000}
+
+    def close(self) -> None:
+        if self.model is not None:
+            registry.release(self.model)
+            self.model = None
+
+    async def transcribe_stream(self, audio_generator: AsyncIterator[bytes],
+                                is_speech: Optional[Callable[[bytes], bool]] = None, sample_rate: int = 16000,
+                                partial_interval_ms: int = 500, window_s: float = 30.0,
+                                end_silence_ms: int = 600, preroll_ms: int = 300,
+                                max_utterance_s: float = 30.0) -> AsyncIterator[STTResult]:
+        # 16 kHz mono int16 chunks. Every ``partial_interval_ms`` of new speech the
+        # trailing ``window_s`` is decoded into a partial; ``end_silence_ms`` of
+        # non-speech after speech (per ``is_speech``) finalizes the utterance and
+        # starts the next one. Without a VAD (or without a pause) an utterance is
+        # finalized every ``max_utterance_s``, which also bounds the buffer, and
+        # when the generator ends. Times are ms since stream start.
+        buf = PCMBuffer(int(sample_rate * max(window_s, max_utterance_s)))
+        ms = lambda n: n * 1000 // sample_rate
+        preroll = sample_rate * preroll_ms // 1000
+        max_samples = int(sample_rate * max_utterance_s)
+        received = 0  # samples since stream start; buf ends here
+        in_speech = is_speech is None
+        silence = since_partial = 0
+        last_partial, partial_ms = "", 0.0
         async for chunk in audio_generator:
-            audio_data += chunk
-            # In a real implementation, we would do partial transcriptions here.
-            # Faster Whisper doesn't natively support "partial" results in a simple way without re-running.
-            
-        # Final transcription for the accumulated audio
-        result = await self._transcribe_bytes(audio_data)
-        if result:
-            yield result
+            n = len(chunk) // 2
+            if len(buf) + n > max_samples:
+                # forced cut: the next utterance continues right after this one
+                yield await self._decode(buf.view(), ms(received - len(buf)), is_final=True, sample_rate=sample_rate)
+                buf.clear()
+                silence, since_partial, last_partial = 0, 0, ""
+            buf.append_pcm16(chunk)
+            received += n
+            if is_speech is not None:
+                if is_speech(chunk):
+                    in_speech, silence = True, 0
+                elif in_speech:
+                    silence += n
+                else:
+                    buf.keep_last(preroll)
+                    continue
+            if is_speech is not None and silence * 1000 >= end_silence_ms * sample_rate:
+                # keep ``preroll`` of the trailing silence, decode the rest
+                audio = buf.view()[:len(buf) - silence + preroll]
+                yield await self._decode(audio, ms(received - len(buf)), is_final=True, sample_rate=sample_rate)
+                buf.clear()
+                in_speech, silence, since_partial, last_partial = False, 0, 0, ""
+                continue
+            since_partial += n
+            # Partials never take more than about half of real time: the
+            # interval stretches to twice the last partial's decode time.
+            if ms(since_partial) >= max(partial_interval_ms, 2 * partial_ms):
+                since_partial = 0
+                window = buf.tail(int(sample_rate * window_s))
+                result = await self._decode(window, ms(received - len(window)), is_final=False, sample_rate=sample_rate)
+                partial_ms = result.decode_ms
+                if result.text and result.text != last_partial:
+                    last_partial = result.text
+                    yield result
+        if len(buf) and in_speech:
+            yield await self._decode(buf.view(), ms(received - len(buf)), is_final=True, sample_rate=sample_rate)
 
     async def transcribe_file(self, file_path: str) -> STTResult:
-        segments, info = await asyncio.to_thread(self.model.transcribe, file_path, beam_size=5, language="de")
-        full_text = "".join([s.text for s in segments]).strip()
-        return STTResult(text=full_text, confidence=info.language_probability, is_final=True, language=info.language)
-
-    async def _transcribe_bytes(self, audio_bytes: bytes) -> Optional[STTResult]:
-        if not audio_bytes:
-            return None
-            
-        # Convert bytes to float32 numpy array (assuming 16kHz mono)
-        audio_np = np.frombuffer(audio_bytes, dtype=np.int16).astype(np.float32) / 32768.0
-        
-        segments, info = await asyncio.to_thread(self.model.transcribe, audio_np, beam_size=1, language="de")
-        full_text = "".join([s.text for s in segments]).strip()
-        
-        return STTResult(text=full_text, confidence=info.language_probability, is_final=True, language=info.language)
+        t0 = time.perf_counter()
+        r = await asyncio.to_thread(self._transcribe_path, file_path)
+        return STTResult(text=r["text"], confidence=r["confidence"], is_final=True, language=r["language"],
+                         decode_ms=(time.perf_counter() - t0) * 1000, cached=r["cached"])
+
+    @staticmethod
+    def _join(segments, info) -> Dict[str, Any]:
+        # Runs in the worker thread; segments are generated lazily, so the
+        # decode happens while they are joined here.
+        return {"text": "".join(s.text for s in segments).strip(),
+                "confidence": info.language_probability, "language": info.language}
+
+    def _transcribe_path(self, file_path: str) -> Dict[str, Any]:
+        # Files come back (golden replays), so they go through the cache.
+        params = dict(beam_size=5, language="de")
+        key = None
+        if self.cache is not None:
+            key = self.cache.file_key(file_path, model=self.model_size, device=self.device,
+                                      compute_type=self.compute_type, **params)
+            hit = self.cache.get(key)
+            if hit is not None:
+                return dict(hit, cached=True)
+        result = self._join(*self.model.transcribe(file_path, **params))
+        if key is not None:
+            self.cache.put(key, result)
+        return dict(result, cached=False)
+
+    def _transcribe_np(self, audio: np.ndarray) -> Dict[str, Any]:
+        # Live stream audio never repeats: no cache lookups, no hashing.
+        params = dict(beam_size=1, language="de", condition_on_previous_text=False)
+        return self._join(*self.model.transcribe(audio, **params))
+
+    async def _decode(self, audio: np.ndarray, start_ms: int, is_final: bool, sample_rate: int = 16000) -> STTResult:
+        t0 = time.perf_counter()
+        r = await asyncio.to_thread(self._transcribe_np, audio)
+        return STTResult(
+            text=r["text"], confidence=r["confidence"], is_final=is_final, language=r["language"],
+            start_time_ms=start_ms, end_time_ms=start_ms + len(audio) * 1000 // sample_rate,
+            decode_ms=(time.perf_counter() - t0) * 1000,
+        )
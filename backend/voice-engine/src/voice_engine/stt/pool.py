@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+Key = Tuple[str, str]  # (adapter, model)
+
+
+class STTModelPool:
+    """Resident STT adapters, one active, swapped at runtime without a restart.
+
+    ``switch`` loads a missing adapter in a worker thread, so the event loop
+    (and the capture path) keeps running, and activates it once loaded; if
+    switches overlap the last one requested wins. Decodes hold the adapter
+    via ``borrow()``: one in flight during a swap finishes on the old model.
+    At most ``max_resident`` adapters stay loaded; the least recently active
+    one is closed when it has no decode in flight.
+    """
+
+    def __init__(self, factory: Callable[[str, str], Any], max_resident: int = 2) -> None:
+        self._factory = factory
+        self.max_resident = max(1, int(max_resident))
+        self._adapters: "OrderedDict[Key, Any]" = OrderedDict()  # least recently active first
+        self._loading: Dict[Key, asyncio.Future] = {}
+        self._busy: Dict[int, int] = {}
+        self._retiring: Dict[int, Any] = {}
+        self.active_key: Optional[Key] = None
+        self._wanted: Optional[Key] = None
+
+    def load(self, adapter: str, model: str) -> Any:
+        """Synchronous initial load (engine construction)."""
+        key = (adapter, model)
+        if key not in self._adapters:
+            self._adapters[key] = self._factory(*key)
+        self._wanted = key
+        self._activate(key)
+        return self._adapters[key]
+
+    async def switch(self, adapter: str, model: str) -> Any:
+        key = (adapter, model)
+        self._wanted = key
+        if key not in self._adapters:
+            task = self._loading.get(key)
+            if task is None:
+                task = self._loading[key] = asyncio.ensure_future(asyncio.to_thread(self._factory, *key))
+            try:
+                loaded = await asyncio.shield(task)
+            finally:
+                self._loading.pop(key, None)
+            if key not in self._adapters:
+                self._adapters[key] = loaded
+                self._adapters.move_to_end(key, last=False)
+        if self._wanted == key:
+            self._activate(key)
+        else:
+            self._evict()
+        return self._adapters.get(key)
+
+    def _activate(self, key: Key) -> None:
+        self.active_key = key
+        self._adapters.move_to_end(key)
+        self._evict()
+
+    def _evict(self) -> None:
+        while len(self._adapters) > self.max_resident:
+            key = next(k for k in self._adapters if k != self.active_key)
+            adapter = self._adapters.pop(key)
+            if self._busy.get(id(adapter)):
+                self._retiring[id(adapter)] = adapter
+            else:
+                self._close(adapter)
+
+    @staticmethod
+    def _close(adapter: Any) -> None:
+        close = getattr(adapter, "close", None)
+        if close is not None:
+            close()
+
+    @contextmanager
+    def borrow(self) -> Iterator[Any]:
+        adapter = self.active
+        self._busy[id(adapter)] = self._busy.get(id(adapter), 0) + 1
+        try:
+            yield adapter
+        finally:
+            self._busy[id(adapter)] -= 1
+            if not self._busy[id(adapter)]:
+                del self._busy[id(adapter)]
+                retired = self._retiring.pop(id(adapter), None)
+                if retired is not None:
+                    self._close(retired)
+
+    @property
+    def active(self) -> Any:
+        if self.active_key is None:
+            raise RuntimeError("no STT model loaded")
+        return self._adapters[self.active_key]
+
+    def resident(self) -> List[Key]:
+        return list(self._adapters)
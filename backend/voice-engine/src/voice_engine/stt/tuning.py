@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Dict, Optional
+
+
+def load_tuning(path: Optional[str], model: str) -> Optional[Dict[str, Any]]:
+    """Device, compute type and CPU threads saved by `vox stt-tune` for ``model``, if any."""
+    if not path:
+        return None
+    try:
+        with open(os.path.expanduser(path), encoding="utf-8") as f:
+            return json.load(f).get("models", {}).get(model)
+    except (OSError, ValueError):
+        return None
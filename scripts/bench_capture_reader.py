@@ -0,0 +1,123 @@
+"""Benchmark: sleep-polling pipe reader vs. the poll()-driven CaptureHub reader.
+
+A writer thread emulates pw-record by writing 20 ms blocks of 16 kHz float32
+audio into a pipe. Each reader turns the stream into 512-sample VAD frames;
+for every frame we measure the delay between the write that completed it
+and its delivery to the consumer, plus reader wakeups per second.
+
+    PYTHONPATH=src python scripts/bench_capture_reader.py --seconds 5
+"""
+import argparse
+import fcntl
+import os
+import threading
+import time
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from wandavoice.capture import CaptureHub
+
+SR = 16000
+BLOCK = 320  # 20 ms, a typical PipeWire quantum at 16 kHz
+FRAME = 512
+
+
+def writer(fd, seconds, stamps):
+    """Write BLOCK-sized chunks on a 20 ms clock; stamps[i] = time sample block i landed."""
+    block = np.zeros(BLOCK, dtype=np.float32).tobytes()
+    t_next = time.perf_counter()
+    for _ in range(int(seconds * SR / BLOCK)):
+        t_next += BLOCK / SR
+        delay = t_next - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        os.write(fd, block)
+        stamps.append(time.perf_counter())
+    os.close(fd)
+
+
+def frame_delays(delivered, stamps):
+    """delivered: (n_samples_so_far, t) per delivery -> per-frame delay in ms."""
+    delays = []
+    frame_end = FRAME
+    for n, t in delivered:
+        while frame_end <= n:
+            landed = stamps[(frame_end - 1) // BLOCK]
+            delays.append((t - landed) * 1000)
+            frame_end += FRAME
+    return np.array(delays)
+
+
+def legacy(seconds):
+    r, w = os.pipe()
+    fl = fcntl.fcntl(r, fcntl.F_GETFL)
+    fcntl.fcntl(r, fcntl.F_SETFL, fl | os.O_NONBLOCK)
+    stamps = []
+    threading.Thread(target=writer, args=(w, seconds, stamps), daemon=True).start()
+
+    wakeups = 0
+    total = 0
+    vad_buffer = np.array([], dtype=np.float32)
+    delivered = []
+    t0 = time.perf_counter()
+    while True:
+        wakeups += 1
+        try:
+            raw = os.read(r, 4096)
+        except BlockingIOError:
+            time.sleep(0.01)
+            continue
+        if not raw:
+            break
+        vad_buffer = np.concatenate([vad_buffer, np.frombuffer(raw, dtype=np.float32)])
+        while len(vad_buffer) >= FRAME:
+            vad_buffer = vad_buffer[FRAME:]
+            total += FRAME
+            delivered.append((total, time.perf_counter()))
+    os.close(r)
+    return wakeups / (time.perf_counter() - t0), frame_delays(delivered, stamps)
+
+
+def hub(seconds):
+    r, w = os.pipe()
+    stamps = []
+    h = CaptureHub(samplerate=SR, capacity_s=2.0)
+    proc = MagicMock(**{"poll.return_value": None, "stdout.fileno.return_value": r})
+    h._spawn = MagicMock(return_value=proc)
+    h.start()
+    consumer = h.attach()
+    threading.Thread(target=writer, args=(w, seconds, stamps), daemon=True).start()
+
+    reads = 0
+    total = 0
+    delivered = []
+    t0 = time.perf_counter()
+    while True:
+        chunk = consumer.read(timeout=0.5)
+        reads += 1
+        if chunk is None:
+            break
+        if len(chunk):
+            total += len(chunk)
+            delivered.append((total, time.perf_counter()))
+    elapsed = time.perf_counter() - t0
+    h.stop()
+    os.close(r)
+    return (h.wakeups + reads) / elapsed, frame_delays(delivered, stamps)
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--seconds", type=float, default=5.0)
+    args = p.parse_args()
+
+    print(f"{args.seconds:.0f}s stream, {BLOCK}-sample writes, {FRAME}-sample VAD frames")
+    print(f"{'reader':<8} {'wakeups/s':>10} {'delay mean':>11} {'p95':>7} {'max':>7} {'jitter sd':>10}  (ms)")
+    for name, fn in (("legacy", legacy), ("hub", hub)):
+        wps, d = fn(args.seconds)
+        print(f"{name:<8} {wps:>10.1f} {d.mean():>11.2f} {np.percentile(d, 95):>7.2f} {d.max():>7.2f} {d.std():>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Benchmark: file ingest to 16 kHz mono, streaming polyphase vs. whole-file librosa.
+
+Writes N minutes of synthetic stereo audio at --rate to a temp WAV, then
+decodes, downmixes and resamples it to 16 kHz with
+
+  stream   wandavoice.ingest.iter_audio_blocks (30 s blocks)
+  whole    soundfile.read of the whole file + StreamingResampler in one go
+  librosa  soundfile.read of the whole file + librosa.resample (the old path)
+
+and reports throughput (audio seconds per wall second) and the traced peak
+of numpy/Python allocations. The librosa row is skipped if it is not
+installed.
+
+    PYTHONPATH=src python scripts/bench_resample.py --minutes 10 --rate 48000
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import soundfile as sf
+
+from wandavoice.ingest import iter_audio_blocks, resample
+
+SR = 16000
+
+
+def stream(path):
+    return sum(len(b) for b in iter_audio_blocks(path, samplerate=SR))
+
+
+def whole(path):
+    data, fs = sf.read(path, dtype="float32", always_2d=True)
+    return len(resample(data.mean(axis=1), fs, SR))
+
+
+def whole_librosa(path):
+    import librosa
+
+    data, fs = sf.read(path, dtype="float32", always_2d=True)
+    return len(librosa.resample(data[:, 0], orig_sr=fs, target_sr=SR))
+
+
+def measure(fn, path, audio_s):
+    t0 = time.perf_counter()
+    fn(path)
+    wall = time.perf_counter() - t0
+
+    tracemalloc.start()
+    fn(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return audio_s / wall, peak / 2**20
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--minutes", type=float, default=10.0)
+    p.add_argument("--rate", type=int, default=48000)
+    p.add_argument("--repeat", type=int, default=3)
+    args = p.parse_args()
+
+    audio_s = args.minutes * 60
+    variants = [("stream", stream), ("whole", whole)]
+    try:
+        import librosa  # noqa: F401
+        variants.append(("librosa", whole_librosa))
+    except ImportError:
+        print("librosa not installed, skipping the librosa row")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.wav")
+        rng = np.random.default_rng(0)
+        with sf.SoundFile(path, "w", samplerate=args.rate, channels=2, subtype="PCM_16") as f:
+            for _ in range(int(args.minutes)):
+                f.write(0.1 * rng.standard_normal((args.rate * 60, 2)).astype(np.float32))
+            f.write(0.1 * rng.standard_normal((int(args.rate * 60 * (args.minutes % 1)), 2)).astype(np.float32))
+
+        print(f"{args.minutes:g} min stereo at {args.rate} Hz -> {SR} Hz mono")
+        print(f"{'variant':<10} {'x realtime':>12} {'peak MB':>10}")
+        for name, fn in variants:
+            speed, peak = max(measure(fn, path, audio_s) for _ in range(args.repeat))
+            print(f"{name:<10} {speed:>12.0f} {peak:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
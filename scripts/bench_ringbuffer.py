@@ -0,0 +1,115 @@
+"""Microbenchmark: capture-loop buffering, np.concatenate vs. RingBuffer.
+
+Replays N seconds of synthetic 16 kHz audio in 4 KB reads (1024 floats)
+through the pre-roll / VAD framing / speech accumulation logic that
+AudioRecorder.record_phrase uses, with the VAD stubbed out so only the
+buffering cost is measured.
+
+    PYTHONPATH=src python scripts/bench_ringbuffer.py --seconds 30
+"""
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from wandavoice.ringbuffer import RingBuffer
+
+SR = 16000
+READ = 1024
+FRAME = 512
+PRE_ROLL = 2 * SR
+
+
+def legacy(chunks, trace_step=None):
+    """The pre-RingBuffer loop: concatenate on every read, slice per frame."""
+    pre_roll = np.array([], dtype=np.float32)
+    vad_buffer = np.array([], dtype=np.float32)
+    speech = []
+    triggered = False
+    for i, raw in enumerate(chunks):
+        chunk = np.frombuffer(raw, dtype=np.float32).copy()
+        if not triggered:
+            pre_roll = np.concatenate([pre_roll, chunk])
+            if len(pre_roll) > PRE_ROLL:
+                pre_roll = pre_roll[-PRE_ROLL:]
+        vad_buffer = np.concatenate([vad_buffer, chunk])
+        while len(vad_buffer) >= FRAME:
+            frame = vad_buffer[:FRAME]
+            vad_buffer = vad_buffer[FRAME:]
+            if triggered:
+                speech.append(frame)
+            elif i == len(chunks) // 4:
+                triggered = True
+                speech.append(pre_roll)
+                speech.append(frame)
+        if trace_step:
+            trace_step()
+    return np.concatenate(speech)
+
+
+def ring(chunks, trace_step=None):
+    """The RingBuffer loop: one preallocated ring, absolute positions, views."""
+    rb = RingBuffer(PRE_ROLL + len(chunks) * READ + FRAME + READ)
+    vad_pos = 0
+    speech_start = 0
+    triggered = False
+    for i, raw in enumerate(chunks):
+        rb.write(np.frombuffer(raw, dtype=np.float32))
+        while rb.write_pos - vad_pos >= FRAME:
+            frame = rb.view(vad_pos, vad_pos + FRAME)
+            if not triggered and i == len(chunks) // 4:
+                triggered = True
+                speech_start = max(rb.oldest_pos, vad_pos - PRE_ROLL)
+            vad_pos += FRAME
+        if trace_step:
+            trace_step()
+    return rb.view(speech_start, vad_pos).copy()
+
+
+def measure(fn, chunks, seconds):
+    t0 = time.process_time()
+    fn(chunks)
+    cpu_ms = (time.process_time() - t0) * 1000
+
+    # Bytes allocated per read: traced peak above the pre-read level. The
+    # first read is skipped so one-off setup (the ring itself) is excluded.
+    allocated = 0
+
+    def step():
+        nonlocal allocated
+        cur, peak = tracemalloc.get_traced_memory()
+        if step.warm:
+            allocated += peak - step.last
+        step.warm = True
+        step.last = cur
+        tracemalloc.reset_peak()
+
+    tracemalloc.start()
+    step.warm = False
+    step.last = tracemalloc.get_traced_memory()[0]
+    fn(chunks, trace_step=step)
+    tracemalloc.stop()
+
+    return cpu_ms / seconds, allocated / 1024 / seconds
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--seconds", type=float, default=30.0)
+    p.add_argument("--repeat", type=int, default=5)
+    args = p.parse_args()
+
+    rng = np.random.default_rng(0)
+    n_reads = int(args.seconds * SR / READ)
+    chunks = [rng.standard_normal(READ).astype(np.float32).tobytes() for _ in range(n_reads)]
+
+    print(f"{args.seconds:.0f}s of audio, {n_reads} reads of {READ * 4} bytes")
+    print(f"{'variant':<10} {'CPU ms / audio s':>18} {'alloc KB / audio s':>20}")
+    for name, fn in (("legacy", legacy), ("ring", ring)):
+        best_cpu, alloc = min(measure(fn, chunks, args.seconds) for _ in range(args.repeat))
+        print(f"{name:<10} {best_cpu:>18.3f} {alloc:>20.1f}")
+
+
+if __name__ == "__main__":
+    main()
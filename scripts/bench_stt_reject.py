@@ -0,0 +1,98 @@
+"""Benchmark: STT hallucination handling on non-speech fixtures, NOISE set vs. rejection policy.
+
+Decodes synthetic non-speech clips (silence, white/pink noise, mains hum,
+keyboard-like clicks, a voice-like tone) through STTEngine twice:
+
+  legacy   voice.stt.reject off (faster-whisper defaults, full temperature
+           ladder) + the old dictate NOISE set applied to the full text
+  policy   the configured voice.stt.reject policy
+
+and reports decode milliseconds per clip and how many clips would have
+been injected as text (every injection here is bogus). Speech files passed
+with --speech are decoded too, to check the policy keeps real text.
+
+    PYTHONPATH=src python scripts/bench_stt_reject.py --model small --speech tests/data/sample.wav
+"""
+import argparse
+import time
+
+import numpy as np
+
+from wandavoice.config import Config
+from wandavoice.ingest import read_audio_file
+from wandavoice.stt import STTEngine, warmup_clip
+
+SR = 16000
+
+# The filter dictate used before the rejection policy
+NOISE = {"1", "2", "3", "vielen dank", "untertitel", "oh", "ja", ".", "!", "?",
+         "danke", "danke schoen", "tschuess", "auf wiedersehen", "vielen dank.",
+         "vielen dank fuer das zuschauen.", "untertitel: stephanie wolf"}
+
+
+def fixtures(seconds: float = 4.0):
+    rng = np.random.default_rng(0)
+    n = int(seconds * SR)
+    t = np.arange(n) / SR
+    white = rng.standard_normal(n)
+    pink = np.cumsum(white)
+    pink = pink - np.convolve(pink, np.ones(400) / 400, mode="same")
+    clicks = np.zeros(n)
+    for pos in rng.integers(0, n - 200, size=int(seconds * 6)):
+        clicks[pos:pos + 200] += np.exp(-np.arange(200) / 20) * rng.choice([-1, 1])
+    voice_like = np.resize(warmup_clip(SR), n)
+    return {
+        "silence": np.zeros(n),
+        "white -30dB": 0.03 * white,
+        "pink -25dB": 0.056 * pink / np.abs(pink).max(),
+        "hum 50Hz": 0.05 * np.sin(2 * np.pi * 50 * t) + 0.02 * np.sin(2 * np.pi * 150 * t),
+        "clicks": 0.3 * clicks,
+        "voice-like tone": voice_like,
+    }
+
+
+def run(engine, audio, legacy):
+    t0 = time.perf_counter()
+    result = engine.transcribe_result(audio.astype(np.float32))
+    ms = (time.perf_counter() - t0) * 1000
+    text = result.text
+    if legacy and len(text) < 40 and text.lower().strip(".!?, ") in NOISE:
+        text = ""
+    return ms, text
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--model", default=None, help="Whisper model (default: voice.stt.model)")
+    p.add_argument("--speech", nargs="*", default=[], help="Speech files that must still transcribe")
+    p.add_argument("--repeat", type=int, default=2)
+    args = p.parse_args()
+
+    cfg = Config()
+    cfg.set("voice.stt.warmup", True)
+    policy = cfg.STT_REJECT
+    engines = {}
+    for name, reject in (("legacy", None), ("policy", policy)):
+        cfg.set("voice.stt.reject", reject)
+        engines[name] = STTEngine(cfg, model_size=args.model)
+
+    clips = fixtures()
+    speech = {path: read_audio_file(path) for path in args.speech}
+    print(f"{'clip':<18} {'legacy ms':>10} {'policy ms':>10}  legacy text | policy text")
+    totals = {"legacy": [0.0, 0], "policy": [0.0, 0]}
+    for label, audio in list(clips.items()) + list(speech.items()):
+        row = {}
+        for name, engine in engines.items():
+            best = min((run(engine, audio, name == "legacy") for _ in range(args.repeat)), key=lambda r: r[0])
+            row[name] = best
+            if label in clips:
+                totals[name][0] += best[0]
+                totals[name][1] += bool(best[1])
+        print(f"{label[-18:]:<18} {row['legacy'][0]:>10.0f} {row['policy'][0]:>10.0f}  "
+              f"{row['legacy'][1][:30]!r} | {row['policy'][1][:30]!r}")
+    print(f"\nnon-speech fixtures ({len(clips)}): wasted decode ms legacy {totals['legacy'][0]:.0f} / "
+          f"policy {totals['policy'][0]:.0f}, bogus injections legacy {totals['legacy'][1]} / policy {totals['policy'][1]}")
+
+
+if __name__ == "__main__":
+    main()
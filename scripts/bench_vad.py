@@ -0,0 +1,75 @@
+"""Benchmark: Silero VAD per-window inference, ONNX Runtime vs. torch.
+
+Feeds N 512-sample windows of synthetic speech-like audio through each
+engine one at a time (as the capture loop does) and reports windows per
+second, per-window latency percentiles and bytes allocated per window.
+
+    PYTHONPATH=src python scripts/bench_vad.py --windows 5000
+"""
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from wandavoice.vad import OnnxSileroVAD, TorchSileroVAD, find_silero_onnx
+
+SR = 16000
+WINDOW = 512
+
+
+def make_audio(n_windows):
+    rng = np.random.default_rng(0)
+    t = np.arange(n_windows * WINDOW) / SR
+    voiced = np.sin(2 * np.pi * 2 * t) > 0  # 250 ms on / off
+    audio = 0.3 * np.sin(2 * np.pi * 180 * t) * voiced + 0.01 * rng.standard_normal(len(t))
+    return audio.astype(np.float32)
+
+
+def run(engine, audio):
+    n = len(audio) // WINDOW
+    for i in range(50):  # warm-up
+        engine.speech_prob(audio[i * WINDOW:(i + 1) * WINDOW])
+    engine.reset()
+
+    lat = np.empty(n)
+    t_start = time.perf_counter()
+    for i in range(n):
+        t0 = time.perf_counter()
+        engine.speech_prob(audio[i * WINDOW:(i + 1) * WINDOW])
+        lat[i] = (time.perf_counter() - t0) * 1000
+    total = time.perf_counter() - t_start
+
+    engine.reset()
+    tracemalloc.start()
+    for i in range(min(n, 500)):
+        engine.speech_prob(audio[i * WINDOW:(i + 1) * WINDOW])
+    traced = tracemalloc.take_snapshot().statistics("filename")
+    tracemalloc.stop()
+    per_window = sum(s.size for s in traced) / min(n, 500)
+    return n / total, lat, per_window
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--windows", type=int, default=5000)
+    args = p.parse_args()
+    audio = make_audio(args.windows)
+
+    engines = [("onnx", lambda: OnnxSileroVAD(find_silero_onnx()))]
+    engines.append(("torch", TorchSileroVAD))
+
+    print(f"{args.windows} windows of {WINDOW} samples ({args.windows * WINDOW / SR:.0f}s audio)")
+    print(f"{'engine':<7} {'windows/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'B/window':>9}")
+    for name, factory in engines:
+        try:
+            engine = factory()
+        except Exception as e:
+            print(f"{name:<7} unavailable: {e}")
+            continue
+        wps, lat, alloc = run(engine, audio)
+        print(f"{name:<7} {wps:>10.0f} {np.percentile(lat, 50):>8.3f} {np.percentile(lat, 99):>8.3f} {lat.max():>8.3f} {alloc:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Benchmark: Silero alone vs. energy/WebRTC cascade in front of Silero.
+
+Synthetic fixtures (no recordings ship with the repo): digital silence,
+room noise at two levels, keyboard-like clicks, a fan hum, and voiced
+"speech" (glottal pulse train through vowel formants, syllable envelope)
+over noise at 20 and 10 dB SNR. For each fixture and engine we report the
+CPU time per audio second, the share of windows that reached Silero, and
+whether the trigger decisions (prob >= threshold, as AudioRecorder uses
+them) match Silero alone: window agreement, missed/extra onsets and the
+onset delay.
+
+    PYTHONPATH=src python scripts/bench_vad_cascade.py
+"""
+import argparse
+import time
+
+import numpy as np
+
+from wandavoice.vad import CascadedVAD, OnnxSileroVAD, find_silero_onnx
+
+SR = 16000
+WINDOW = 512
+VOWELS = [(730, 1090, 2440), (270, 2290, 3010), (300, 870, 2240), (530, 1840, 2480), (570, 840, 2410)]
+
+
+def noise(n, level, rng, pink=True):
+    x = rng.standard_normal(n)
+    if pink:
+        spec = np.fft.rfft(x)
+        spec /= np.sqrt(np.arange(1, len(spec) + 1))
+        x = np.fft.irfft(spec, n)
+    return level * x / (np.sqrt(np.mean(x ** 2)) + 1e-12)
+
+
+def formant_filter(x, formants, bw=100.0):
+    f = np.fft.rfftfreq(len(x), 1 / SR)
+    h = np.zeros_like(f)
+    for fc in formants:
+        h += 1.0 / (1.0 + ((f - fc) / bw) ** 2)
+    return np.fft.irfft(np.fft.rfft(x) * h, len(x))
+
+
+def speech(seconds, rng):
+    """Syllables of 150-350 ms with pauses; returns audio and per-sample speech labels."""
+    n = int(seconds * SR)
+    out = np.zeros(n)
+    labels = np.zeros(n, dtype=bool)
+    pos = int(0.8 * SR)
+    while pos < n - SR // 2:
+        syl = int(rng.uniform(0.15, 0.35) * SR)
+        f0 = rng.uniform(100, 180) * (1 + 0.1 * np.sin(np.linspace(0, np.pi, syl)))
+        pulses = (np.diff(np.floor(np.cumsum(f0) / SR), prepend=0) > 0).astype(float)
+        seg = formant_filter(pulses, VOWELS[rng.integers(len(VOWELS))])
+        seg *= np.hanning(syl)
+        out[pos:pos + syl] = seg / (np.abs(seg).max() + 1e-12)
+        labels[pos:pos + syl] = True
+        pos += syl + int(rng.choice([0.05, 0.08, 0.6, 1.2]) * SR)
+    return out, labels
+
+
+def window_labels(labels):
+    w = len(labels) // WINDOW
+    return labels[:w * WINDOW].reshape(w, WINDOW).mean(axis=1) >= 0.5
+
+
+def fixtures(seconds):
+    rng = np.random.default_rng(1)
+    n = int(seconds * SR)
+    t = np.arange(n) / SR
+    clicks = np.zeros(n)
+    for p in rng.integers(0, n - 200, int(seconds * 4)):
+        clicks[p:p + 200] += np.exp(-np.arange(200) / 20) * rng.standard_normal(200) * 0.3
+    sp, lab = speech(seconds, rng)
+    sp_rms = np.sqrt(np.mean(sp[lab] ** 2))
+    none = np.zeros(n, dtype=bool)
+    return {
+        "silence": (np.zeros(n), none),
+        "room -60dB": (noise(n, 1e-3, rng), none),
+        "room -45dB": (noise(n, 5.6e-3, rng), none),
+        "keyboard": (clicks + noise(n, 1e-3, rng), none),
+        "fan hum": (0.02 * np.sin(2 * np.pi * 100 * t) + noise(n, 5e-3, rng, pink=False), none),
+        "speech 20dB": (0.2 * sp + noise(n, 0.2 * sp_rms / 10, rng), lab),
+        "speech 10dB": (0.2 * sp + noise(n, 0.2 * sp_rms / 3.16, rng), lab),
+    }
+
+
+def run(engine, audio):
+    engine.reset()
+    windows = len(audio) // WINDOW
+    probs = np.empty(windows)
+    t0 = time.process_time()
+    for i in range(windows):
+        probs[i] = engine.speech_prob(audio[i * WINDOW:(i + 1) * WINDOW])
+    return probs, (time.process_time() - t0) * 1000 / (len(audio) / SR)
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--seconds", type=float, default=20.0)
+    p.add_argument("--threshold", type=float, default=0.55)  # voice.audio.vad_threshold
+    p.add_argument("--mode", type=int, default=2)  # voice.audio.vad_mode
+    args = p.parse_args()
+
+    path = find_silero_onnx()
+    silero = OnnxSileroVAD(path)
+    cascade = CascadedVAD(OnnxSileroVAD(path), mode=args.mode)
+
+    print("CPU = process time per second of audio; accuracy/recall/false = window")
+    print(f"decisions (prob >= {args.threshold}) against the fixture's speech labels.")
+    print(f"{'':<13} {'CPU ms/s':>17} {'to':>7} {'accuracy':>15} {'speech recall':>15} {'false triggers':>15}")
+    print(f"{'fixture':<13} {'silero':>8} {'cascade':>8} {'silero':>7} {'silero':>7} {'cascade':>7} {'silero':>7} {'cascade':>7} {'silero':>7} {'cascade':>7}")
+    for name, (audio, labels) in fixtures(args.seconds).items():
+        audio = audio.astype(np.float32)
+        truth = window_labels(labels)
+        ref, ref_cpu = run(silero, audio)
+        calls0 = cascade.inner_calls
+        got, cas_cpu = run(cascade, audio)
+        share = (cascade.inner_calls - calls0) / len(got)
+
+        row = f"{name:<13} {ref_cpu:>8.2f} {cas_cpu:>8.2f} {share:>7.0%}"
+        for stat in ("acc", "recall", "false"):
+            for probs in (ref, got):
+                d = probs[:len(truth)] >= args.threshold
+                if stat == "acc":
+                    v = f"{np.mean(d == truth):.1%}"
+                elif stat == "recall":
+                    v = f"{np.mean(d[truth]):.1%}" if truth.any() else "-"
+                else:
+                    v = str(int(np.sum(d & ~truth)))
+                row += f" {v:>7}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
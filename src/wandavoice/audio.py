@@ -2,13 +2,15 @@ import sys
 import threading
 import queue
 import time
-import torch
 import numpy as np
-import subprocess
-import fcntl
-import os
 from typing import Optional
 
+from wandavoice.capture import CaptureHub, CaptureConsumer
+from wandavoice.ringbuffer import RingBuffer
+from wandavoice.streaming_stt import StreamingTranscriber
+from wandavoice.vad import load_vad
+
+
 class AudioRecorder:
     def __init__(self, config, level_callback=None):
         self.config = config
@@ -16,64 +18,111 @@ class AudioRecorder:
         self.vad_chunk_size = 512  # Silero VAD requires 512 samples at 16kHz
         self.vad_threshold = float(config.get("voice.audio.vad_threshold", 0.3))
         self.level_callback = level_callback
-        self.muted = False # State for UI mute
-
-        print(f"Audio Backend: PipeWire (pw-record) -> Native 16000Hz")
-
-        print("Loading Silero VAD v5...", end="", flush=True)
-        self.vad_model, _ = torch.hub.load(
-            repo_or_dir="snakers4/silero-vad", model="silero_vad", trust_repo=True
+        # One long-lived pw-record shared by all recording modes (see capture.py)
+        self._hub = CaptureHub(samplerate=self.target_samplerate)
+        self.lookback_ms = config.LOOKBACK_MS
+        self.last_capture_offset_ms = 0.0
+
+        print(f"Audio Backend: PipeWire (pw-record, persistent) -> Native 16000Hz")
+
+        print("Loading Silero VAD...", end="", flush=True)
+        self.vad = load_vad(
+            config.get("voice.audio.vad_backend", "auto"),
+            model_path=config.get("voice.audio.vad_onnx_path"),
+            base_dir=getattr(config, "base_dir", None),
+            samplerate=self.target_samplerate,
+            cascade=bool(config.get("voice.audio.vad_cascade", True)),
+            mode=int(config.get("voice.audio.vad_mode", 2)),
+            offline=bool(config.get("voice.models.offline", True)),
         )
-        print(" Done.")
-
-    def _start_pw_record(self) -> subprocess.Popen:
-        """Starts a pw-record subprocess to stream raw float32 audio at 16000Hz."""
-        cmd = [
-            "pw-record", 
-            "--raw", 
-            "--format", "f32", 
-            "--channels", "1", 
-            "--rate", str(self.target_samplerate), 
-            "-" # stdout
-        ]
-        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
-        
-        # Make stdout non-blocking
-        fd = process.stdout.fileno()
-        fl = fcntl.fcntl(fd, fcntl.F_GETFL)
-        fcntl.fcntl(fd, fcntl.F_SETFL, fl | os.O_NONBLOCK)
-        
-        return process
+        print(f" Done ({self.vad.name}).")
+
+    # ---------- capture hub ----------
+    @property
+    def muted(self) -> bool:
+        return self._hub.muted
+
+    @muted.setter
+    def muted(self, value: bool) -> None:
+        self._hub.muted = bool(value)
+
+    def start_capture(self) -> None:
+        """Start (or restart) the always-on pw-record hub ahead of the first recording."""
+        if not self._hub.running:
+            self._hub.start()
+
+    def close(self) -> None:
+        self._hub.stop()
+        self.vad.close()
+
+    def _attach(self, lookback_ms: float = 0.0, pressed_at: Optional[float] = None) -> CaptureConsumer:
+        """Attach to the hub, reaching back ``lookback_ms`` before ``pressed_at``.
+
+        ``pressed_at`` is the time.monotonic() of the hotkey press; the time
+        spent since (debounce, UI) is added to the look-back so the recording
+        starts relative to the press, not to this call. The effective start
+        of the first delivered sample relative to the press is stored in
+        ``last_capture_offset_ms`` (negative = audio from before the press).
+        """
+        self.start_capture()
+        now = time.monotonic()
+        reference = pressed_at if pressed_at is not None else now
+        lookback_s = max(0.0, lookback_ms) / 1000.0 + max(0.0, now - reference)
+        consumer = self._hub.attach(lookback_samples=int(lookback_s * self.target_samplerate))
+        self.vad.reset()  # every recording starts with fresh recurrent state
+        backlog_s = (self._hub.ring.write_pos - consumer.pos) / self.target_samplerate
+        self.last_capture_offset_ms = (now - backlog_s - reference) * 1000.0
+        return consumer
+
+    def _speech_prob(self, frame: np.ndarray) -> float:
+        """Silero speech probability for one 512-sample frame (a ring view is fine)."""
+        return self.vad.speech_prob(frame)
+
+    @staticmethod
+    def _tail(chunks, start: int) -> Optional[np.ndarray]:
+        """Samples from ``start`` on out of a list of chunks, touching only the tail."""
+        if not chunks:
+            return None
+        chunks = list(chunks)  # snapshot; the capture loop keeps appending
+        pos = sum(len(c) for c in chunks)
+        i = len(chunks)
+        while i > 0 and pos > start:
+            i -= 1
+            pos -= len(chunks[i])
+        tail = chunks[i:]
+        if not tail:
+            return None
+        return np.concatenate(tail)[max(0, start - pos):]
 
-    def _read_nonblocking(self, process: subprocess.Popen, block_size_bytes: int) -> bytes:
-        data = b""
-        try:
-            raw = process.stdout.read(block_size_bytes)
-            if raw:
-                if self.muted:
-                    data = b"\x00" * len(raw)
-                else:
-                    data = raw
-        except IOError:
-            pass # EAGAIN
-        return data
+    @staticmethod
+    def _rms(chunk: np.ndarray) -> float:
+        # dot() avoids the temporary array that chunk**2 would allocate
+        return float(np.sqrt(np.dot(chunk, chunk) / len(chunk)))
 
     def _start_streaming_stt(self, get_audio_fn, stt_engine, transcript_callback):
+        """Live partials every 0.5 s via StreamingTranscriber.
+
+        ``get_audio_fn(start)`` returns the utterance audio from sample
+        ``start`` to now (or None before speech), so each step only touches
+        the bounded decode window, never the whole utterance.
+        """
         self._stop_streaming = False
         def stream_worker():
-            last_len = 0
+            streamer = StreamingTranscriber(stt_engine, samplerate=self.target_samplerate)
+            last_end = 0
             while not self._stop_streaming:
                 time.sleep(0.5)
-                audio_16k = get_audio_fn()
+                start = streamer.buffer_start
+                audio_16k = get_audio_fn(start)
                 if audio_16k is None or len(audio_16k) == 0:
                     continue
                 
-                current_len = len(audio_16k)
-                if current_len > last_len + (self.target_samplerate * 0.5):
-                    text = stt_engine.transcribe(audio_16k)
+                end = start + len(audio_16k)
+                if end > last_end + (self.target_samplerate * 0.5):
+                    text = streamer.update(audio_16k)
                     if text and transcript_callback:
                         transcript_callback(text)
-                    last_len = current_len
+                    last_end = end
 
         t = threading.Thread(target=stream_worker, daemon=True)
         t.start()
@@ -93,13 +142,17 @@ class AudioRecorder:
 
         pre_roll_duration_s = 2.0
         pre_roll_max_samples = int(pre_roll_duration_s * self.target_samplerate)
-        pre_roll_buffer = np.array([], dtype=np.float32)
+        read_max = CaptureHub.READ_BYTES // 4
+
+        # A single ring backs the pre-roll, the VAD framing and the utterance:
+        # speech is the absolute range [speech_start, vad_pos), so nothing is
+        # reallocated per chunk no matter how long the user talks.
+        ring = RingBuffer(pre_roll_max_samples + max_samples + self.vad_chunk_size + read_max)
+        vad_pos = 0          # next sample to be framed for the VAD
+        speech_start = 0     # start of the utterance incl. pre-roll (valid once triggered)
 
         triggered = False
-        speech_buffer = []
-        vad_buffer = np.array([], dtype=np.float32)
         consecutive_silence = 0
-        total_samples = 0
 
         sys.stdout.write(f"\n\033[94m ● Listening (VAD profile '{vad_profile}', threshold {start_threshold:.2f})...\033[0m\n")
         sys.stdout.flush()
@@ -107,75 +160,53 @@ class AudioRecorder:
         stream_thread = None
         if stt_engine and transcript_callback:
             stream_thread = self._start_streaming_stt(
-                lambda: np.concatenate(speech_buffer) if speech_buffer else None, 
+                lambda start: ring.view(speech_start + start, vad_pos).copy() if triggered else None,
                 stt_engine, 
                 transcript_callback
             )
 
-        process = self._start_pw_record()
-        bytes_to_read = 4096 # 1024 floats
+        consumer = self._attach()
 
         try:
-            while total_samples < max_samples:
+            while not triggered or vad_pos - speech_start < max_samples:
                 if cancel_token and cancel_token.is_cancelled():
                     sys.stdout.write("\033[90m [Cancelled]\033[0m\n")
                     break
 
-                raw_data = self._read_nonblocking(process, bytes_to_read)
-                if not raw_data:
-                    if process.poll() is not None:
-                        break
-                    time.sleep(0.01)
-                    continue
-
-                valid_bytes = (len(raw_data) // 4) * 4
-                if valid_bytes == 0:
+                # The ring only has room for one read beyond the utterance;
+                # a backlog (up to the hub's capacity) is taken in slices.
+                chunk = consumer.read(max_samples=read_max)
+                if chunk is None:
+                    break
+                if len(chunk) == 0:
                     continue
-                    
-                chunk = np.frombuffer(raw_data[:valid_bytes], dtype=np.float32).copy()
-                
-                if not triggered:
-                    pre_roll_buffer = np.concatenate([pre_roll_buffer, chunk])
-                    if len(pre_roll_buffer) > pre_roll_max_samples:
-                        pre_roll_buffer = pre_roll_buffer[-pre_roll_max_samples:]
-                else:
-                    total_samples += len(chunk)
-
-                vad_buffer = np.concatenate([vad_buffer, chunk])
+                ring.write(chunk)
                 
                 if self.level_callback:
-                    rms = np.sqrt(np.mean(chunk**2))
-                    self.level_callback(rms)
+                    self.level_callback(self._rms(chunk))
 
-                while len(vad_buffer) >= self.vad_chunk_size:
-                    vad_chunk = vad_buffer[:self.vad_chunk_size]
-                    vad_buffer = vad_buffer[self.vad_chunk_size:]
-                    
-                    chunk_tensor = torch.from_numpy(vad_chunk)
-                    prob = self.vad_model(chunk_tensor, self.target_samplerate).item()
+                while ring.write_pos - vad_pos >= self.vad_chunk_size:
+                    vad_chunk = ring.view(vad_pos, vad_pos + self.vad_chunk_size)
+                    prob = self._speech_prob(vad_chunk)
 
                     if not triggered:
                         if prob >= start_threshold:
+                            speech_start = max(ring.oldest_pos, vad_pos - pre_roll_max_samples)
                             triggered = True
                             sys.stdout.write("\033[92m ● Recording...\033[0m ")
                             sys.stdout.flush()
-                            if len(pre_roll_buffer) > 0:
-                                speech_buffer.append(pre_roll_buffer)
-                                total_samples += len(pre_roll_buffer)
-                            speech_buffer.append(vad_chunk)
-                            total_samples += len(vad_chunk)
                     else:
-                        speech_buffer.append(vad_chunk)
                         if prob <= stop_threshold:
                             consecutive_silence += 1
                         else:
                             consecutive_silence = 0
+                    vad_pos += self.vad_chunk_size
 
                 if triggered and consecutive_silence >= silence_frames_needed:
                     sys.stdout.write(" Done.\n")
                     break
 
-            if total_samples >= max_samples and triggered:
+            if triggered and vad_pos - speech_start >= max_samples:
                 sys.stdout.write(" [30s cap]\n")
 
         except KeyboardInterrupt:
@@ -183,16 +214,6 @@ class AudioRecorder:
         except Exception as e:
             sys.stdout.write("\n")
             print(f"Capture Error: {e}")
-        finally:
-            process.terminate()
-            try:
-                process.wait(timeout=0.2)
-            except subprocess.TimeoutExpired:
-                process.kill()
-            try:
-                process.wait(timeout=0.2)
-            except subprocess.TimeoutExpired:
-                process.kill()
 
         if stream_thread:
             self._stop_streaming = True
@@ -204,90 +225,85 @@ class AudioRecorder:
         if cancel_token and cancel_token.is_cancelled():
             return None
 
-        if not speech_buffer:
+        if not triggered:
             return None
             
-        return np.concatenate(speech_buffer)
+        return ring.view(speech_start, vad_pos).copy()
 
 
-    def record_stream_segments(self, stop_queue: queue.Queue, on_segment) -> None:
+    def record_stream_segments(self, stop_queue: queue.Queue, on_segment, pressed_at: Optional[float] = None) -> None:
         """
         Streaming dictation with VAD-based segmentation.
 
         Architecture:
-          - Reader thread: reads pw-record, runs Silero VAD, enqueues complete speech segments
+          - Reader thread: reads the capture hub, runs Silero VAD, enqueues complete speech segments
           - Main thread: dequeues segments, calls on_segment(np.ndarray) for each one
-            (on_segment should transcribe + inject)
+            (e.g. DictationPipeline.submit, which transcribes + injects off-thread)
 
         Stops when stop_queue receives an item. Any remaining audio at stop
-        is flushed as a final segment before returning.
+        is flushed as a final segment before returning. Capture reaches back
+        ``voice.audio.lookback_ms`` before ``pressed_at`` (see _attach).
         """
         SILENCE_FRAMES = 12  # ~384ms silence at 16kHz/512-sample chunks = end of segment
+        MAX_SEGMENT_SAMPLES = 30 * self.target_samplerate  # Whisper window; force a cut beyond this
 
         segment_queue: queue.Queue = queue.Queue()
         stop_reader = threading.Event()
 
+        read_max = CaptureHub.READ_BYTES // 4
+        consumer = self._attach(self.lookback_ms, pressed_at)
+
         def _reader():
-            speech_buffer = []
-            vad_buf = np.array([], dtype=np.float32)
-            triggered = False
+            # Segments are absolute ranges [seg_start, vad_pos) in the ring;
+            # only the finished segment is copied out for the consumer.
+            ring = RingBuffer(MAX_SEGMENT_SAMPLES + 2 * self.vad_chunk_size + read_max)
+            vad_pos = 0
+            seg_start = None
             silent_frames = 0
 
-            process = self._start_pw_record()
             try:
                 while not stop_reader.is_set():
-                    raw = self._read_nonblocking(process, 4096)
-                    if not raw:
-                        if process.poll() is not None:
-                            break
-                        time.sleep(0.005)
-                        continue
-
-                    valid = (len(raw) // 4) * 4
-                    if not valid:
+                    chunk = consumer.read(max_samples=read_max)
+                    if chunk is None:
+                        break
+                    if len(chunk) == 0:
                         continue
 
-                    chunk = np.frombuffer(raw[:valid], dtype=np.float32).copy()
+                    ring.write(chunk)
                     if self.level_callback:
-                        self.level_callback(float(np.sqrt(np.mean(chunk ** 2))))
+                        self.level_callback(self._rms(chunk))
 
-                    vad_buf = np.concatenate([vad_buf, chunk])
+                    while ring.write_pos - vad_pos >= self.vad_chunk_size:
+                        vad_chunk = ring.view(vad_pos, vad_pos + self.vad_chunk_size)
+                        prob = self._speech_prob(vad_chunk)
+                        frame_start = vad_pos
+                        vad_pos += self.vad_chunk_size
 
-                    while len(vad_buf) >= self.vad_chunk_size:
-                        vad_chunk = vad_buf[:self.vad_chunk_size]
-                        vad_buf = vad_buf[self.vad_chunk_size:]
-                        prob = self.vad_model(
-                            torch.from_numpy(vad_chunk), self.target_samplerate
-                        ).item()
-
-                        if not triggered:
+                        if seg_start is None:
                             if prob >= self.vad_threshold:
-                                triggered = True
-                                speech_buffer = [vad_chunk]
+                                seg_start = frame_start
                                 silent_frames = 0
                         else:
-                            speech_buffer.append(vad_chunk)
                             if prob <= self.vad_threshold * 0.5:
                                 silent_frames += 1
                                 if silent_frames >= SILENCE_FRAMES:
-                                    segment_queue.put(np.concatenate(speech_buffer))
-                                    speech_buffer = []
-                                    triggered = False
+                                    segment_queue.put(ring.view(seg_start, vad_pos).copy())
+                                    seg_start = None
                                     silent_frames = 0
                             else:
                                 silent_frames = 0
 
+                        if seg_start is not None and vad_pos - seg_start >= MAX_SEGMENT_SAMPLES:
+                            # Continuous speech: hand off what we have and keep recording.
+                            segment_queue.put(ring.view(seg_start, vad_pos).copy())
+                            seg_start = vad_pos
+
             except Exception as e:
                 sys.stdout.write(f"\n[Reader Error] {e}\n")
             finally:
-                process.terminate()
-                try:
-                    process.wait(timeout=0.5)
-                except subprocess.TimeoutExpired:
-                    process.kill()
                 # Flush any remaining speech
-                if speech_buffer:
-                    segment_queue.put(np.concatenate(speech_buffer))
+                if seg_start is not None and vad_pos > seg_start:
+                    segment_queue.put(ring.view(seg_start, vad_pos).copy())
                 segment_queue.put(None)  # sentinel
 
         reader = threading.Thread(target=_reader, daemon=True, name="stream-reader")
@@ -318,7 +334,7 @@ class AudioRecorder:
             self.level_callback(0.0)
         sys.stdout.write("\033[90m ⏹ Stopped.\033[0m\n")
 
-    def record_toggle(self, stop_queue: queue.Queue, stt_engine=None, transcript_callback=None) -> Optional[np.ndarray]:
+    def record_toggle(self, stop_queue: queue.Queue, stt_engine=None, transcript_callback=None, pressed_at: Optional[float] = None) -> Optional[np.ndarray]:
         chunks = []
 
         sys.stdout.write("\033[91m ● Recording — press [Right Ctrl] again to stop...\033[0m\n")
@@ -327,13 +343,12 @@ class AudioRecorder:
         stream_thread = None
         if stt_engine and transcript_callback:
             stream_thread = self._start_streaming_stt(
-                lambda: np.concatenate(chunks) if chunks else None, 
+                lambda start: self._tail(chunks, start), 
                 stt_engine, 
                 transcript_callback
             )
 
-        process = self._start_pw_record()
-        bytes_to_read = 4096
+        consumer = self._attach(self.lookback_ms, pressed_at)
 
         try:
             while True:
@@ -343,29 +358,16 @@ class AudioRecorder:
                 except queue.Empty:
                     pass
 
-                raw_data = self._read_nonblocking(process, bytes_to_read)
-                if not raw_data:
-                    if process.poll() is not None:
-                        break
-                    time.sleep(0.01)
-                    continue
-
-                valid_bytes = (len(raw_data) // 4) * 4
-                if valid_bytes > 0:
-                    chunk = np.frombuffer(raw_data[:valid_bytes], dtype=np.float32).copy()
-                    chunks.append(chunk)
+                chunk = consumer.read()
+                if chunk is None:
+                    break
+                if len(chunk) > 0:
+                    chunks.append(chunk.copy())
                     if self.level_callback:
-                        rms = np.sqrt(np.mean(chunk**2))
-                        self.level_callback(rms)
+                        self.level_callback(self._rms(chunk))
 
         except Exception as e:
             print(f"\nToggle Capture Error: {e}")
-        finally:
-            process.terminate()
-            try:
-                process.wait(timeout=0.2)
-            except subprocess.TimeoutExpired:
-                process.kill()
 
         sys.stdout.write("\033[90m ⏹ Stopped.\033[0m\n")
 
@@ -381,39 +383,25 @@ class AudioRecorder:
             
         return np.concatenate(chunks)
 
-    def record_ptt(self, ptt_event: threading.Event) -> Optional[np.ndarray]:
+    def record_ptt(self, ptt_event: threading.Event, pressed_at: Optional[float] = None) -> Optional[np.ndarray]:
         chunks = []
 
         sys.stdout.write("\033[92m ● Recording (PTT)...\033[0m")
         sys.stdout.flush()
 
-        process = self._start_pw_record()
-        bytes_to_read = 4096
+        consumer = self._attach(self.lookback_ms, pressed_at)
 
         try:
             while ptt_event.is_set():
-                raw_data = self._read_nonblocking(process, bytes_to_read)
-                if not raw_data:
-                    if process.poll() is not None:
-                        break
-                    time.sleep(0.01)
-                    continue
-
-                valid_bytes = (len(raw_data) // 4) * 4
-                if valid_bytes > 0:
-                    chunk = np.frombuffer(raw_data[:valid_bytes], dtype=np.float32).copy()
-                    chunks.append(chunk)
+                chunk = consumer.read()
+                if chunk is None:
+                    break
+                if len(chunk) > 0:
+                    chunks.append(chunk.copy())
                     if self.level_callback:
-                        rms = np.sqrt(np.mean(chunk**2))
-                        self.level_callback(rms)
+                        self.level_callback(self._rms(chunk))
         except Exception as e:
             print(f"\nPTT Capture Error: {e}")
-        finally:
-            process.terminate()
-            try:
-                process.wait(timeout=0.2)
-            except subprocess.TimeoutExpired:
-                process.kill()
 
         sys.stdout.write(" Released.\n")
         
@@ -428,24 +416,17 @@ class AudioRecorder:
     def record_fixed(self, duration_s: int = 5) -> np.ndarray:
         print(f"\033[93m!!! STARTING {duration_s}s capture !!!\033[0m")
         
-        process = self._start_pw_record()
+        consumer = self._attach()
         total_samples = int(duration_s * self.target_samplerate)
-        bytes_to_read = total_samples * 4
-        
-        raw_data = b""
-        import fcntl
-        # restore blocking IO just for this
-        fd = process.stdout.fileno()
-        fl = fcntl.fcntl(fd, fcntl.F_GETFL)
-        fcntl.fcntl(fd, fcntl.F_SETFL, fl & ~os.O_NONBLOCK)
-        
-        while len(raw_data) < bytes_to_read:
-            chunk = process.stdout.read(min(4096, bytes_to_read - len(raw_data)))
-            if not chunk:
+        result = np.zeros(total_samples, dtype=np.float32)
+        filled = 0
+
+        while filled < total_samples:
+            chunk = consumer.read(timeout=0.5)
+            if chunk is None:
                 break
-            raw_data += chunk
-            
-        process.terminate()
-        
-        result = np.frombuffer(raw_data, dtype=np.float32)
-        return result
+            n = min(len(chunk), total_samples - filled)
+            result[filled:filled + n] = chunk[:n]
+            filled += n
+
+        return result[:filled]
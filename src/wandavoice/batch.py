@@ -0,0 +1,160 @@
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+AUDIO_EXTS = {".wav", ".flac", ".ogg", ".opus", ".mp3", ".m4a", ".aac", ".webm"}
+FORMATS = ("txt", "jsonl")
+
+
+def expand_inputs(inputs: Iterable[str]) -> List[str]:
+    """Audio files named by ``inputs``: files, directories (recursive) and glob patterns."""
+    found = []
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _, names in os.walk(item):
+                found.extend(os.path.join(root, n) for n in names if os.path.splitext(n)[1].lower() in AUDIO_EXTS)
+        elif glob.has_magic(item):
+            found.extend(p for p in glob.glob(item, recursive=True)
+                         if os.path.isfile(p) and os.path.splitext(p)[1].lower() in AUDIO_EXTS)
+        elif os.path.isfile(item):
+            found.append(item)
+    return sorted({os.path.abspath(p) for p in found})
+
+
+def output_base(path: str, out_dir: Optional[str] = None, root: Optional[str] = None) -> str:
+    """Output path without extension: next to the audio, or under ``out_dir`` mirroring the tree below ``root``."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    if not out_dir:
+        return os.path.join(os.path.dirname(path), stem)
+    rel = os.path.relpath(os.path.dirname(path), root) if root else ""
+    return os.path.normpath(os.path.join(out_dir, rel, stem))
+
+
+def is_done(path: str, base: str, formats: Sequence[str]) -> bool:
+    """All outputs exist and are newer than the audio (outputs are only ever written whole)."""
+    src_mtime = os.path.getmtime(path)
+    return all(os.path.exists(f"{base}.{fmt}") and os.path.getmtime(f"{base}.{fmt}") >= src_mtime for fmt in formats)
+
+
+def write_atomic(path: str, data: str) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp.{os.getpid()}"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def write_outputs(base: str, formats: Sequence[str], segments: List[tuple]) -> None:
+    if "jsonl" in formats:
+        write_atomic(f"{base}.jsonl", "".join(
+            json.dumps({"start": round(s, 3), "end": round(e, 3), "text": t}, ensure_ascii=False) + "\n"
+            for s, e, t in segments
+        ))
+    if "txt" in formats:
+        write_atomic(f"{base}.txt", "\n".join(t for _, _, t in segments if t) + "\n")
+
+
+# ---------- worker process ----------
+_pipeline = None
+
+
+def whisper_pipeline(base_dir: str, model: str, compute_type: Optional[str] = None, cpu_threads: int = 0):
+    """Load one Whisper model (per worker process) wrapped in a batched pipeline."""
+    from faster_whisper import BatchedInferencePipeline
+    from wandavoice.config import Config
+    from wandavoice.stt import STTEngine
+
+    cfg = Config(base_dir=base_dir)
+    cfg.set("voice.stt.warmup", False)  # throughput job: no first-utterance latency to protect
+    engine = STTEngine(cfg, model_size=model, compute_type=compute_type, cpu_threads=cpu_threads)
+    return BatchedInferencePipeline(model=engine.model)
+
+
+def _init_worker(factory: Callable[..., Any], kwargs: Dict[str, Any]) -> None:
+    global _pipeline
+    _pipeline = factory(**kwargs)
+
+
+def _run_one(path: str, base: str, formats: Sequence[str], options: Dict[str, Any]) -> Dict[str, Any]:
+    from wandavoice.longform import LongFormTranscriber
+
+    t0 = time.perf_counter()
+    try:
+        lf = LongFormTranscriber(pipeline=_pipeline, **options)
+        segments = list(lf.transcribe(path))
+        write_outputs(base, formats, segments)
+    except Exception as e:
+        return {"path": path, "error": f"{type(e).__name__}: {e}", "wall_s": time.perf_counter() - t0}
+    return {"path": path, "audio_s": lf.audio_s, "wall_s": time.perf_counter() - t0,
+            "segments": len(segments), "pid": os.getpid()}
+
+
+# ---------- driver ----------
+def transcribe_batch(files: Sequence[str], factory: Callable[..., Any], factory_kwargs: Dict[str, Any],
+                     workers: int = 2, formats: Sequence[str] = FORMATS, out_dir: Optional[str] = None,
+                     force: bool = False, options: Optional[Dict[str, Any]] = None,
+                     on_result: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """Transcribe ``files`` on a pool of ``workers`` processes, each with its own model.
+
+    Files whose outputs are already complete are skipped unless ``force``.
+    Files that would write the same outputs (``a.wav`` and ``a.mp3`` in one
+    directory) fail up front instead of overwriting each other, and if a
+    worker process dies every file still in the pool fails with it.
+    Returns totals incl. throughput in audio-hours per wall-hour.
+    """
+    t0 = time.perf_counter()
+    root = os.path.commonpath([os.path.dirname(p) for p in files]) if files else None
+    todo = [(p, output_base(p, out_dir, root)) for p in files]
+
+    results: List[Dict[str, Any]] = []
+
+    def report(result: Dict[str, Any]) -> None:
+        results.append(result)
+        if on_result is not None:
+            on_result(result)
+
+    by_base: Dict[str, List[str]] = {}
+    for p, base in todo:
+        by_base.setdefault(base, []).append(p)
+    for base, paths in by_base.items():
+        if len(paths) > 1:
+            for p in paths:
+                report({"path": p, "error": f"output {base}.* is shared with "
+                                            + ", ".join(q for q in paths if q != p), "wall_s": 0.0})
+    todo = [(p, base) for p, base in todo if len(by_base[base]) == 1]
+
+    skipped = {p for p, base in todo if not force and is_done(p, base, formats)}
+    todo = [(p, base) for p, base in todo if p not in skipped]
+
+    if todo:
+        # spawn: workers must not inherit the parent's threads or CUDA state
+        with ProcessPoolExecutor(max_workers=max(1, min(workers, len(todo))), mp_context=get_context("spawn"),
+                                 initializer=_init_worker, initargs=(factory, factory_kwargs)) as pool:
+            futures = {pool.submit(_run_one, p, base, tuple(formats), options or {}): p for p, base in todo}
+            for fut in as_completed(futures):
+                try:
+                    result = fut.result()
+                except BrokenProcessPool as e:
+                    # a worker exited (e.g. sys.exit while loading the model): the pool is gone
+                    result = {"path": futures[fut], "error": f"worker process died: {e}", "wall_s": 0.0}
+                report(result)
+
+    wall_s = time.perf_counter() - t0
+    done = [r for r in results if "error" not in r]
+    audio_s = sum(r["audio_s"] for r in done)
+    return {
+        "files": len(files),
+        "done": len(done),
+        "skipped": len(skipped),
+        "failed": [r for r in results if "error" in r],
+        "audio_s": audio_s,
+        "wall_s": wall_s,
+        "audio_h_per_wall_h": audio_s / wall_s if wall_s else 0.0,
+    }
@@ -0,0 +1,186 @@
+import atexit
+import fcntl
+import os
+import select
+import subprocess
+import sys
+import threading
+from typing import Optional
+
+import numpy as np
+
+from wandavoice.ringbuffer import RingBuffer
+
+
+class CaptureHub:
+    """Always-on microphone capture shared by every recording mode.
+
+    One long-lived ``pw-record`` process streams float32 samples into a shared
+    RingBuffer. Recording modes attach as consumers with their own read
+    cursor, so starting a recording costs no subprocess spawn or PipeWire
+    negotiation: the first sample is whatever the mic delivers next.
+
+    The ring only ever advances by whole VAD frames, and consumers are woken
+    through a condition variable the moment a frame lands.
+    """
+
+    FRAME_SAMPLES = 512  # Silero VAD window at 16 kHz
+    READ_BYTES = 4 * FRAME_SAMPLES * 4  # up to 4 whole VAD frames per read
+    POLL_TIMEOUT_MS = 100  # only bounds how fast stop() is noticed
+
+    def __init__(self, samplerate: int = 16000, capacity_s: float = 60.0):
+        self.samplerate = samplerate
+        self.frame_samples = self.FRAME_SAMPLES
+        self.ring = RingBuffer(int(capacity_s * samplerate))
+        self.muted = False
+        self._cond = threading.Condition()
+        self._process: Optional[subprocess.Popen] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._running = False
+        self._silence = np.zeros(self.READ_BYTES // 4, dtype=np.float32)
+        # Reader statistics (see scripts/bench_capture_reader.py)
+        self.wakeups = 0
+        self.frames_delivered = 0
+        atexit.register(self.stop)
+
+    # ---------- lifecycle ----------
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def start(self) -> None:
+        """Spawn pw-record and the reader thread. No-op if already running."""
+        with self._cond:
+            if self._running:
+                return
+            self._stop.clear()
+            self._process = self._spawn()
+            self._running = True
+        self._thread = threading.Thread(target=self._run, args=(self._process,), daemon=True, name="capture-hub")
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+        self._thread = None
+
+    def _spawn(self) -> subprocess.Popen:
+        """Starts a pw-record subprocess to stream raw float32 audio at the hub rate."""
+        cmd = [
+            "pw-record",
+            "--raw",
+            "--format", "f32",
+            "--channels", "1",
+            "--rate", str(self.samplerate),
+            "-" # stdout
+        ]
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+        # Non-blocking fd: readiness comes from poll(), reads never stall
+        fd = process.stdout.fileno()
+        fl = fcntl.fcntl(fd, fcntl.F_GETFL)
+        fcntl.fcntl(fd, fcntl.F_SETFL, fl | os.O_NONBLOCK)
+
+        return process
+
+    def _read_into(self, fd: int, buf: memoryview) -> int:
+        """Read what is available into ``buf``; 0 means EOF."""
+        try:
+            return os.readv(fd, [buf])
+        except BlockingIOError:
+            return -1  # spurious wakeup
+
+    def _run(self, process: subprocess.Popen) -> None:
+        # Readiness-driven: block in poll() until pw-record has written, read
+        # straight into a preallocated frame-aligned buffer and publish only
+        # whole VAD frames. No sleeps, no per-read allocations.
+        fd = process.stdout.fileno()
+        poller = select.poll()
+        poller.register(fd, select.POLLIN | select.POLLHUP | select.POLLERR)
+        frame_bytes = self.frame_samples * 4
+        buf = bytearray(self.READ_BYTES)
+        view = memoryview(buf)
+        frames = np.frombuffer(buf, dtype=np.float32)
+        fill = 0
+        try:
+            while not self._stop.is_set():
+                events = poller.poll(self.POLL_TIMEOUT_MS)
+                self.wakeups += 1
+                if not events:
+                    if process.poll() is not None:
+                        break
+                    continue
+
+                n = self._read_into(fd, view[fill:])
+                if n == 0:
+                    break  # EOF: pw-record exited
+                if n < 0:
+                    continue
+                fill += n
+
+                whole = (fill // frame_bytes) * frame_bytes
+                if whole:
+                    self._ingest(frames[:whole // 4])
+                    self.frames_delivered += whole // frame_bytes
+                    # Keep the partial frame at the front for the next read.
+                    view[:fill - whole] = view[whole:fill]
+                    fill -= whole
+        except Exception as e:
+            sys.stdout.write(f"\n[Capture Error] {e}\n")
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=0.5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+            with self._cond:
+                self._running = False
+                self._cond.notify_all()
+
+    def _ingest(self, samples: np.ndarray) -> None:
+        with self._cond:
+            self.ring.write(self._silence[:len(samples)] if self.muted else samples)
+            self._cond.notify_all()
+
+    # ---------- consumers ----------
+    def attach(self, lookback_samples: int = 0) -> "CaptureConsumer":
+        """New consumer whose cursor starts ``lookback_samples`` before the next
+        captured sample (clamped to what the ring still holds)."""
+        with self._cond:
+            pos = max(self.ring.oldest_pos, self.ring.write_pos - max(0, int(lookback_samples)))
+            return CaptureConsumer(self, pos)
+
+
+class CaptureConsumer:
+    """Read cursor into a CaptureHub ring."""
+
+    def __init__(self, hub: CaptureHub, pos: int):
+        self.hub = hub
+        self.pos = pos
+
+    def read(self, timeout: float = 0.05, max_samples: Optional[int] = None) -> Optional[np.ndarray]:
+        """Samples captured since the last read, as a zero-copy ring view.
+
+        Returns an empty array if nothing arrived within ``timeout`` and None
+        once the hub has stopped and everything has been read. At most
+        ``max_samples`` are returned per call; the rest of the backlog stays
+        for the next read. The view is only valid until the ring wraps
+        (``capacity_s``), so copy anything that must outlive the current
+        iteration.
+        """
+        hub = self.hub
+        ring = hub.ring
+        with hub._cond:
+            if ring.write_pos <= self.pos:
+                if not hub._running:
+                    return None
+                hub._cond.wait(timeout)
+            if ring.write_pos <= self.pos:
+                return None if not hub._running else ring.view(self.pos, self.pos)
+            # A consumer that fell a full ring behind skips to the oldest sample.
+            start = max(self.pos, ring.oldest_pos)
+            end = ring.write_pos if max_samples is None else min(ring.write_pos, start + max_samples)
+            self.pos = end
+        return ring.view(start, end)
@@ -31,7 +31,8 @@ DEFAULT_CONFIG: Dict[str, Any] = {
             "sample_rate": 16000,
             "frame_ms": 30,
             "vad_enabled": True,
-            "vad_mode": 2,  # 0-3 (webrtcvad)
+            "vad_mode": 2,  # 0-3 (webrtcvad), first stage of the VAD cascade
+            "vad_cascade": True,  # energy + WebRTC gate, Silero only on possible speech
             "silence_ms": 900,
             # Fine-tuning for "pause-and-continue" dictation:
             # After silence_ms is reached, keep listening for another grace window.
@@ -45,12 +46,62 @@ DEFAULT_CONFIG: Dict[str, Any] = {
             "fixed_record_s": 8,  # used when VAD is off
             "max_record_s": 20,
             "vad_threshold": 0.55,  # Silero VAD start threshold (speech: 0.8+, noise: 0.1-0.4)
+            # Hotkey recordings reach back this far into the always-on capture ring,
+            # so the first syllable spoken while pressing the key is kept.
+            "lookback_ms": 400,
+            "vad_backend": "auto",  # auto|onnx|torch (auto = ONNX Runtime, torch as fallback)
+            "vad_onnx_path": None,  # default: faster-whisper's bundled Silero export
         },
         "stt": {
             "provider": "faster_whisper",
             "model": "small",  # tiny|base|small|medium
             "compute_type": "int8",
             "lang": "auto",  # de|en|auto
+            # lang auto: the first detection with min_confidence is reused for the session; decodes
+            # averaging below min_logprob with it trigger a re-detection.
+            "lang_cache": {"min_confidence": 0.8, "min_logprob": -1.0},
+            # Concurrent Whisper decodes (WhisperModel num_workers); dictation
+            # transcribes this many segments in parallel.
+            "workers": 2,
+            # Decode a synthetic clip at load so the first utterance is not the cold decode.
+            "warmup": True,
+            # Switchable at runtime (MCC set_stt_profile); compute_type None = compute_type above.
+            "profiles": {
+                "fast": {"model": "small", "compute_type": "int8"},
+                "final": {"model": "large-v3-turbo", "compute_type": None},
+            },
+            "max_resident": 2,  # Whisper models kept loaded by the STT model pool (LRU)
+            # Live partials on the 'fast' profile, finals on 'final', decoding concurrently.
+            "two_tier": False,
+            # `vox transcribe`: files at least this long take the streamed, batched long-form path.
+            "longform_min_s": 120,
+            "batch_size": 8,
+            # Directory/glob transcription: worker processes (one model each) and CPU threads per model.
+            "batch_workers": 2,
+            "cpu_threads": 0,  # 0 = CTranslate2 default
+            # `vox stt-tune` result (device, compute type, CPU threads per model); default <base_dir>/stt_tune.json.
+            # Used whenever no compute type is given explicitly (profiles, --model).
+            "tune_file": None,
+            "use_tuning": True,
+            # Results of final decodes keyed by audio hash + model/compute type/language/decode options,
+            # for `vox transcribe` reruns and daemon file transcription; dir None = <base_dir>/cache/stt.
+            "cache": {"enabled": True, "dir": None, "max_mb": 64},
+            # Hallucination rejection by segment scores (see stt.RejectionPolicy); None = keep everything.
+            "reject": {
+                "no_speech_prob": 0.6,
+                "avg_logprob": -1.0,
+                "compression_ratio": 2.4,
+                "keep_logprob": -0.3,  # confident text survives a high no_speech_prob
+                "max_fallbacks": 2,  # temperature retries per window (faster-whisper default: 5)
+            },
+        },
+        "models": {
+            # Load Whisper/Silero strictly from <base_dir>/models (see `vox models prefetch`);
+            # never resolve or download anything over the network at startup.
+            "offline": True,
+        },
+        "daemon": {
+            "socket": None,  # default: <base_dir>/vox.sock (see `vox daemon`)
         },
         "routing": {
             "target": "cli:gemini",  # insert|stdout|cli:gemini|cli:ollama
@@ -199,6 +250,11 @@ class Config:
     def AUDIT_FILE(self) -> str:
         return os.path.join(self.base_dir, "audit.jsonl")
 
+    @property
+    def DAEMON_SOCKET(self) -> str:
+        path = self.data["voice"].get("daemon", {}).get("socket")
+        return os.path.expanduser(path) if path else os.path.join(self.base_dir, "vox.sock")
+
     def ensure_dirs(self) -> None:
         Path(self.base_dir).mkdir(parents=True, exist_ok=True)
 
@@ -264,6 +320,10 @@ class Config:
     def SPEECH_RESUME_MS(self) -> int:
         return int(self.data["voice"]["audio"]["speech_resume_ms", 90])
 
+    @property
+    def LOOKBACK_MS(self) -> int:
+        return int(self.data["voice"]["audio"].get("lookback_ms", 400))
+
     @property
     def MAX_RECORD_S(self) -> int:
         return int(self.data["voice"]["audio"]["max_record_s", 20])
@@ -290,6 +350,40 @@ class Config:
     def LANG(self) -> str:
         return str(self.data["voice"]["stt"].get("lang", "auto"))
 
+    @property
+    def MODELS_OFFLINE(self) -> bool:
+        return bool(self.data["voice"].get("models", {}).get("offline", True))
+
+    @property
+    def STT_WORKERS(self) -> int:
+        return max(1, int(self.data["voice"]["stt"].get("workers", 1)))
+
+    @property
+    def STT_MAX_RESIDENT(self) -> int:
+        return max(1, int(self.data["voice"]["stt"].get("max_resident", 2)))
+
+    @property
+    def STT_TWO_TIER(self) -> bool:
+        return bool(self.data["voice"]["stt"].get("two_tier", False))
+
+    @property
+    def STT_WARMUP(self) -> bool:
+        return bool(self.data["voice"]["stt"].get("warmup", True))
+
+    @property
+    def STT_TUNE_FILE(self) -> str:
+        path = self.data["voice"]["stt"].get("tune_file")
+        return os.path.expanduser(path) if path else os.path.join(self.base_dir, "stt_tune.json")
+
+    @property
+    def STT_USE_TUNING(self) -> bool:
+        return bool(self.data["voice"]["stt"].get("use_tuning", True))
+
+    @property
+    def STT_REJECT(self) -> Optional[Dict[str, Any]]:
+        opts = self.data["voice"]["stt"].get("reject", {})
+        return dict(opts) if isinstance(opts, dict) else None
+
     # ---------- routing ----------
     @property
     def TARGET(self) -> str:
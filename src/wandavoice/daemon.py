@@ -0,0 +1,233 @@
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from wandavoice.startup import StartupOrchestrator
+from wandavoice.utils import print_status
+
+
+class DaemonError(RuntimeError):
+    def __init__(self, message: str, code: str = "error"):
+        super().__init__(message)
+        self.code = code
+
+
+def request(socket_path: str, op: str, timeout: Optional[float] = None,
+            connect_timeout: float = 0.5, **params) -> Optional[Dict[str, Any]]:
+    """Send one request to a running daemon.
+
+    Returns the response dict, or None when no daemon is listening on
+    ``socket_path`` (callers then do the work in-process). A failed request
+    raises DaemonError.
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(connect_timeout)
+    try:
+        sock.connect(socket_path)
+    except (FileNotFoundError, ConnectionRefusedError, socket.timeout):
+        sock.close()
+        return None
+    sock.settimeout(timeout)
+    with sock, sock.makefile("rwb") as f:
+        f.write(json.dumps(dict(params, op=op)).encode("utf-8") + b"\n")
+        f.flush()
+        line = f.readline()
+    if not line:
+        raise DaemonError("daemon closed the connection")
+    resp = json.loads(line)
+    if not resp.get("ok"):
+        raise DaemonError(resp.get("error", "unknown error"), resp.get("code", "error"))
+    return resp
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    # One JSON object per line in both directions; a connection may carry
+    # several requests.
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            resp = self.server.vox.dispatch(line)
+            self.wfile.write(json.dumps(resp).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class VoxDaemon:
+    """Keeps STT, LLM and TTS resident and serves them on a Unix socket.
+
+    Operations: ``ping``, ``transcribe`` (``path`` of an audio file on this
+    machine), ``speak`` (``text``), ``turn`` (``text``, a full assistant
+    turn) and ``shutdown``. Engines load concurrently in the background;
+    the socket accepts requests right away and a request waits only for the
+    engine it needs. STT requests from several clients are serialized by the
+    STT scheduler, turns and speech by a lock (one session, one speaker).
+    """
+
+    def __init__(self, cfg, socket_path: Optional[str] = None):
+        self.cfg = cfg
+        self.socket_path = socket_path or cfg.DAEMON_SOCKET
+        self.boot = StartupOrchestrator()
+        self.requests = 0
+        self._t0 = time.monotonic()
+        self._output_lock = threading.Lock()
+        self._turn_ctx = None
+        self._server: Optional[socketserver.ThreadingUnixStreamServer] = None
+
+    # ---------- engines ----------
+    def _default_factories(self) -> Dict[str, Callable[[], Any]]:
+        cfg = self.cfg
+
+        def stt():
+            from wandavoice.stt import STTEngine
+            from wandavoice.stt_cache import cache_from_config
+            from wandavoice.stt_scheduler import STTScheduler
+            return STTScheduler(STTEngine(cfg, cache=cache_from_config(cfg)))
+
+        def llm():
+            from wandavoice.llm import GeminiLLM
+            return GeminiLLM(cfg)
+
+        def tts():
+            from wandavoice.tts import TTSEngine
+            return TTSEngine(cfg)
+
+        return {"stt": stt, "llm": llm, "tts": tts}
+
+    def load(self, factories: Optional[Dict[str, Callable[[], Any]]] = None) -> None:
+        for name, factory in (factories or self._default_factories()).items():
+            self.boot.start(name, factory)
+
+    def _turn_context(self):
+        if self._turn_ctx is None:
+            from wandavoice.audit import AuditLogger
+            from wandavoice.permissions import PermissionManager
+            from wandavoice.router import Router
+            from wandavoice.session import SessionManager
+            from wandavoice.skills.manager import SkillManager
+            from wandavoice.ui import VoxOrb
+
+            audit_log = AuditLogger(self.cfg)
+            perm_mgr = PermissionManager(self.cfg)
+            managers = {
+                "audit": audit_log,
+                "permissions": perm_mgr,
+                "skills": SkillManager(self.cfg),
+                "router": Router(self.cfg, permissions=perm_mgr, audit=audit_log),
+            }
+            orb_ui = VoxOrb(self.cfg)
+            orb_ui.enabled = False
+            self._turn_ctx = (SessionManager(self.cfg), orb_ui, managers)
+        return self._turn_ctx
+
+    # ---------- operations ----------
+    def dispatch(self, line: bytes) -> Dict[str, Any]:
+        t0 = time.perf_counter()
+        try:
+            req = json.loads(line)
+            handler = getattr(self, f"_op_{req.get('op')}", None)
+            if handler is None:
+                raise DaemonError(f"unknown op {req.get('op')!r}", "bad_request")
+            resp = handler(req)
+            resp["ok"] = True
+        except DaemonError as e:
+            resp = {"ok": False, "error": str(e), "code": e.code}
+        except Exception as e:
+            resp = {"ok": False, "error": f"{type(e).__name__}: {e}", "code": "error"}
+        self.requests += 1
+        resp["ms"] = round((time.perf_counter() - t0) * 1000, 1)
+        return resp
+
+    def _op_ping(self, req):
+        from wandavoice.model_registry import registry
+
+        return {
+            "pid": os.getpid(),
+            "uptime_s": round(time.monotonic() - self._t0, 1),
+            "requests": self.requests,
+            "model": self.cfg.WHISPER_MODEL_SIZE,
+            "ready": sorted(n for n in self.boot.timeline if self.boot.result(n) is not None),
+            "models": registry.report(),
+        }
+
+    def _op_transcribe(self, req):
+        model = req.get("model")
+        if model and model != self.cfg.WHISPER_MODEL_SIZE:
+            raise DaemonError(f"daemon serves STT model '{self.cfg.WHISPER_MODEL_SIZE}', not '{model}'", "model_mismatch")
+        path = req.get("path")
+        if not path or not os.path.exists(path):
+            raise DaemonError(f"file not found: {path}", "not_found")
+
+        import soundfile as sf
+        from wandavoice.ingest import read_audio_file
+
+        duration = sf.info(path).duration
+        if duration >= float(self.cfg.get("voice.stt.longform_min_s", 120)):
+            # Streamed, batched decoding with per-segment output is a client-side path.
+            raise DaemonError(f"{duration:.0f} s file: long-form transcription runs in the client", "long_file")
+        data = read_audio_file(path)
+        stt = self.boot.get("stt")
+        stt.lang_cache.reset()  # lang auto: every file is detected on its own
+        t0 = time.perf_counter()
+        text = stt.transcribe(data)
+        return {
+            "text": text or "",
+            "audio_s": round(len(data) / 16000, 2),
+            "stt_ms": round((time.perf_counter() - t0) * 1000, 1),
+        }
+
+    def _op_speak(self, req):
+        tts = self.boot.get("tts")
+        with self._output_lock:
+            tts.speak(req.get("text", ""))
+            tts.wait()
+        return {}
+
+    def _op_turn(self, req):
+        from wandavoice.main import process_turn
+
+        text = req.get("text", "").strip()
+        if not text:
+            raise DaemonError("empty text", "bad_request")
+        llm, tts = self.boot.get("llm"), self.boot.get("tts")
+        with self._output_lock:
+            session, orb_ui, managers = self._turn_context()
+            say, show = process_turn(text, session, llm, tts, orb_ui, self.cfg, managers)
+        return {"say": say, "show": show}
+
+    def _op_shutdown(self, req):
+        threading.Thread(target=self.stop, daemon=True).start()
+        return {}
+
+    # ---------- server ----------
+    def bind(self) -> None:
+        if request(self.socket_path, "ping") is not None:
+            raise DaemonError(f"a VOX daemon is already listening on {self.socket_path}", "busy")
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)  # stale socket from a crashed daemon
+        os.makedirs(os.path.dirname(self.socket_path) or ".", exist_ok=True)
+        old_umask = os.umask(0o177)  # socket is owner-only from the start
+        try:
+            self._server = socketserver.ThreadingUnixStreamServer(self.socket_path, _Handler)
+        finally:
+            os.umask(old_umask)
+        self._server.daemon_threads = True
+        self._server.vox = self
+
+    def serve_forever(self) -> None:
+        if self._server is None:
+            self.bind()
+        print_status(f"VOX daemon listening on {self.socket_path} (pid {os.getpid()})")
+        try:
+            self._server.serve_forever(poll_interval=0.2)
+        finally:
+            self._server.server_close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
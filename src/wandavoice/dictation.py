@@ -0,0 +1,142 @@
+import collections
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from wandavoice.utils import print_status
+
+
+class DictationPipeline:
+    """Transcribes dictation segments on a worker pool, injects them in order.
+
+    ``submit`` returns immediately, so the VAD reader never waits for Whisper
+    or for text injection. Results are injected strictly in segment order
+    regardless of which worker finishes first. When segments back up (at
+    least ``merge_backlog`` waiting), a worker takes the adjacent queued
+    segments as one decode of up to ``max_merge_s`` seconds: one Whisper
+    call instead of several, and more context for the model.
+
+    Metrics: ``queue_depth`` (segments waiting for a worker),
+    ``max_queue_depth``, ``merged`` (segments folded into another decode)
+    and ``lags_ms`` (submit -> injection, per segment).
+    """
+
+    GAP_S = 0.1  # silence between merged segments so words do not fuse
+
+    def __init__(
+        self,
+        transcribe: Callable[[np.ndarray], str],
+        inject: Callable[[str], None],
+        workers: int = 2,
+        samplerate: int = 16000,
+        merge_backlog: int = 2,
+        max_merge_s: float = 30.0,
+    ):
+        self.transcribe = transcribe
+        self.inject = inject
+        self.samplerate = samplerate
+        self.merge_backlog = merge_backlog
+        self.max_merge = int(max_merge_s * samplerate)
+        self._gap = np.zeros(int(self.GAP_S * samplerate), dtype=np.float32)
+
+        self._pending: collections.deque = collections.deque()  # (seq, audio, submitted_at)
+        self._cond = threading.Condition()
+        self._inject_lock = threading.Lock()
+        self._results: Dict[int, Tuple[int, str, List[float]]] = {}  # first seq -> (count, text, submit times)
+        self._seq = 0
+        self._next_inject = 0
+        self._closed = False
+
+        self.max_queue_depth = 0
+        self.merged = 0
+        self.lags_ms: List[float] = []
+
+        self._workers = [
+            threading.Thread(target=self._work, daemon=True, name=f"dictation-{i}")
+            for i in range(max(1, workers))
+        ]
+        for t in self._workers:
+            t.start()
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._pending)
+
+    def submit(self, audio: np.ndarray) -> None:
+        with self._cond:
+            self._pending.append((self._seq, audio, time.perf_counter()))
+            self._seq += 1
+            self.max_queue_depth = max(self.max_queue_depth, len(self._pending))
+            self._cond.notify()
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Finish all submitted segments (transcribe + inject), then stop the workers."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        for t in self._workers:
+            t.join(timeout)
+
+    def stats(self) -> Dict[str, float]:
+        lags = np.array(self.lags_ms) if self.lags_ms else np.zeros(1)
+        return {
+            "segments": len(self.lags_ms),
+            "merged": self.merged,
+            "max_queue_depth": self.max_queue_depth,
+            "lag_p50_ms": float(np.percentile(lags, 50)),
+            "lag_max_ms": float(lags.max()),
+        }
+
+    def _take(self):
+        with self._cond:
+            while not self._pending:
+                if self._closed:
+                    return None
+                self._cond.wait()
+            seq, audio, t = self._pending.popleft()
+            parts, times = [audio], [t]
+            if len(self._pending) + 1 >= self.merge_backlog:
+                size = len(audio)
+                while self._pending and size + len(self._gap) + len(self._pending[0][1]) <= self.max_merge:
+                    _, nxt, t_nxt = self._pending.popleft()
+                    parts += [self._gap, nxt]
+                    times.append(t_nxt)
+                    size += len(self._gap) + len(nxt)
+                self.merged += len(times) - 1
+            return seq, parts, times
+
+    def _work(self) -> None:
+        while True:
+            batch = self._take()
+            if batch is None:
+                return
+            seq, parts, times = batch
+            audio = parts[0] if len(parts) == 1 else np.concatenate(parts)
+            try:
+                text = self.transcribe(audio) or ""
+            except Exception as e:
+                print_status(f"Dictation STT error: {e}")
+                text = ""
+            with self._cond:
+                self._results[seq] = (len(times), text, times)
+            self._flush()
+
+    def _flush(self) -> None:
+        # Whoever holds the lock injects every result that is next in line.
+        with self._inject_lock:
+            while True:
+                with self._cond:
+                    ready = self._results.pop(self._next_inject, None)
+                    if ready is None:
+                        return
+                    count, text, times = ready
+                    self._next_inject += count
+                if text.strip():
+                    try:
+                        self.inject(text)
+                    except Exception as e:
+                        print_status(f"Dictation inject error: {e}")
+                now = time.perf_counter()
+                self.lags_ms.extend((now - t) * 1000 for t in times)
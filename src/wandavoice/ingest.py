@@ -0,0 +1,123 @@
+"""Streaming file ingest: block-wise decode, channel downmix and resampling.
+
+Memory stays bounded by the block size whatever the file length, and
+nothing heavier than numpy and soundfile is imported.
+"""
+from math import gcd
+from typing import Iterator
+
+import numpy as np
+
+
+class StreamingResampler:
+    """Polyphase windowed-sinc resampler for audio arriving in blocks.
+
+    The rate ratio is reduced to ``up/down``; each output sample is a
+    ``2 * half_width``-tap dot product with one of ``up`` precomputed
+    (Kaiser-windowed sinc) phases, so nothing is ever upsampled. ``process``
+    returns the output that is complete so far (it lags the input by
+    ``half_width`` samples); ``flush`` returns the tail at end of stream.
+    Blocks of any size give the same output as one big block, and the total
+    length is ``ceil(n_in * target_sr / orig_sr)``.
+
+    The backend vendors this class (voice_engine.audio.resample).
+    """
+
+    def __init__(self, orig_sr: int, target_sr: int, zeros: int = 16, rolloff: float = 0.94, beta: float = 8.6):
+        g = gcd(int(orig_sr), int(target_sr))
+        self.up, self.down = int(target_sr) // g, int(orig_sr) // g
+        fc = 0.5 * rolloff * min(1.0, self.up / self.down)  # cutoff, cycles per input sample
+        self.half_width = int(np.ceil(zeros / (2 * fc)))
+        # taps[p, j]: weight of input i + j - h + 1 for an output at i + p/up
+        k = np.arange(-self.half_width + 1, self.half_width + 1)
+        u = k[None, :] - np.arange(self.up)[:, None] / self.up
+        window = np.i0(beta * np.sqrt(np.clip(1.0 - (u / self.half_width) ** 2, 0.0, None))) / np.i0(beta)
+        self.taps = (2 * fc * np.sinc(2 * fc * u) * window).astype(np.float32)
+        self.reset()
+
+    def reset(self) -> None:
+        h = self.half_width
+        self._buf = np.zeros(h - 1, dtype=np.float32)  # retained input, zero history before the start
+        self._buf_start = -(h - 1)  # input index of _buf[0]
+        self._n_in = 0
+        self._n_out = 0
+
+    @property
+    def passthrough(self) -> bool:
+        return self.up == self.down
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        block = np.asarray(block, dtype=np.float32).reshape(-1)
+        if self.passthrough:
+            return block
+        self._n_in += len(block)
+        self._buf = np.concatenate([self._buf, block])
+        return self._emit(None)
+
+    def flush(self) -> np.ndarray:
+        if self.passthrough:
+            return np.zeros(0, dtype=np.float32)
+        self._buf = np.concatenate([self._buf, np.zeros(self.half_width, dtype=np.float32)])
+        out = self._emit(-(-self._n_in * self.up // self.down))
+        self.reset()
+        return out
+
+    def _emit(self, total) -> np.ndarray:
+        h, up, down = self.half_width, self.up, self.down
+        avail = self._buf_start + len(self._buf) - h  # outputs need inputs up to i + h
+        end = (avail * up - 1) // down + 1 if avail > 0 else 0
+        if total is not None:
+            end = min(end, total)
+        n0 = self._n_out
+        out = np.empty(max(0, end - n0), dtype=np.float32)
+        if len(out):
+            windows = np.lib.stride_tricks.sliding_window_view(self._buf, 2 * h)
+            chunk = up * max(1, 8192 // up)  # bounds the gathered rows to ~8k x taps
+            for c0 in range(n0, end, chunk):
+                n = np.arange(c0, min(c0 + chunk, end))
+                starts = n * down // up - h + 1 - self._buf_start
+                for r in range(min(up, len(n))):
+                    # outputs r, r + up, ... of this chunk share one phase
+                    out[c0 - n0 + r:c0 - n0 + len(n):up] = windows[starts[r::up]] @ self.taps[(n[r] * down) % up]
+            self._n_out = end
+        # drop input no longer needed by any later output
+        keep = self._n_out * down // up - h + 1 - self._buf_start
+        if keep > 0:
+            self._buf = self._buf[keep:]
+            self._buf_start += keep
+        return out
+
+
+def resample(audio: np.ndarray, orig_sr: int, target_sr: int) -> np.ndarray:
+    rs = StreamingResampler(orig_sr, target_sr)
+    return np.concatenate([rs.process(audio), rs.flush()])
+
+
+def downmix(block: np.ndarray) -> np.ndarray:
+    """(frames, channels) -> mono float32."""
+    if block.ndim == 1:
+        return block.astype(np.float32, copy=False)
+    if block.shape[1] == 1:
+        return block[:, 0]
+    return block.mean(axis=1, dtype=np.float32)
+
+
+def iter_audio_blocks(path: str, block_s: float = 30.0, samplerate: int = 16000) -> Iterator[np.ndarray]:
+    """Mono float32 blocks of an audio file at ``samplerate``, read incrementally."""
+    import soundfile as sf
+
+    with sf.SoundFile(path) as f:
+        rs = StreamingResampler(f.samplerate, samplerate)
+        prev = None  # held back one block so the resampler tail joins the last one
+        for block in f.blocks(blocksize=int(block_s * f.samplerate), dtype="float32", always_2d=True):
+            if prev is not None:
+                yield prev
+            prev = np.ascontiguousarray(rs.process(downmix(block)))
+        if prev is not None:
+            yield np.concatenate([prev, rs.flush()])
+
+
+def read_audio_file(path: str, samplerate: int = 16000) -> np.ndarray:
+    """Mono float32 samples of an audio file at ``samplerate``."""
+    blocks = list(iter_audio_blocks(path, samplerate=samplerate))
+    return np.concatenate(blocks) if blocks else np.zeros(0, dtype=np.float32)
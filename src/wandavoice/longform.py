@@ -0,0 +1,94 @@
+import resource
+import time
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from wandavoice.ingest import iter_audio_blocks
+
+Segment = Tuple[float, float, str]  # (start_s, end_s, text), absolute file time
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def quiet_cut(audio: np.ndarray, samplerate: int = 16000, search_s: float = 5.0, frame_s: float = 0.1) -> int:
+    """Sample index in the last ``search_s`` of ``audio`` where a 100 ms frame is quietest."""
+    frame = int(frame_s * samplerate)
+    start = max(0, len(audio) - int(search_s * samplerate))
+    n = (len(audio) - start) // frame
+    if n < 2:
+        return len(audio)
+    frames = audio[start:start + n * frame].reshape(n, frame)
+    energy = np.einsum("ij,ij->i", frames, frames)
+    return start + int(np.argmin(energy)) * frame + frame // 2
+
+
+class LongFormTranscriber:
+    """Hour-long files in bounded memory with batched Whisper decoding.
+
+    The file is read in blocks and collected into windows of ``window_s``,
+    each cut at the quietest point near its end (the rest carries over into
+    the next window), so no word is split between windows. Each window goes
+    to faster-whisper's BatchedInferencePipeline, which VAD-splits it into
+    speech chunks of up to 30 s and decodes ``batch_size`` chunks at a time.
+    Segments are yielded as soon as their batch finishes.
+
+    After (or during) ``transcribe``, ``audio_s``, ``wall_s``, ``rtf`` and
+    ``peak_rss_mb`` describe the run.
+    """
+
+    def __init__(self, model=None, batch_size: int = 8, window_s: float = 240.0, samplerate: int = 16000,
+                 language: Optional[str] = None, beam_size: int = 5, initial_prompt: Optional[str] = None,
+                 pipeline=None):
+        if pipeline is None:
+            from faster_whisper import BatchedInferencePipeline
+            pipeline = BatchedInferencePipeline(model=model)
+        self.pipeline = pipeline
+        self.batch_size = batch_size
+        self.window = int(window_s * samplerate)
+        self.samplerate = samplerate
+        self.options = dict(language=language, beam_size=beam_size, initial_prompt=initial_prompt)
+        self.audio_s = 0.0
+        self.wall_s = 0.0
+        self.windows = 0
+
+    @property
+    def rtf(self) -> float:
+        return self.wall_s / self.audio_s if self.audio_s else 0.0
+
+    @property
+    def peak_rss_mb(self) -> float:
+        return peak_rss_mb()
+
+    def transcribe(self, path: str) -> Iterator[Segment]:
+        t0 = time.perf_counter()
+        pending: List[np.ndarray] = []
+        pending_len = 0
+        offset = 0  # file sample where the pending audio starts
+        try:
+            for block in iter_audio_blocks(path, samplerate=self.samplerate):
+                self.audio_s += len(block) / self.samplerate
+                pending.append(block)
+                pending_len += len(block)
+                if pending_len < self.window:
+                    continue
+                audio = np.concatenate(pending)
+                cut = quiet_cut(audio, self.samplerate)
+                yield from self._decode(audio[:cut], offset)
+                offset += cut
+                pending, pending_len = [audio[cut:]], len(audio) - cut
+                self.wall_s = time.perf_counter() - t0
+            if pending_len:
+                yield from self._decode(np.concatenate(pending), offset)
+        finally:
+            self.wall_s = time.perf_counter() - t0
+
+    def _decode(self, audio: np.ndarray, offset: int) -> Iterator[Segment]:
+        self.windows += 1
+        offset_s = offset / self.samplerate
+        segments, _ = self.pipeline.transcribe(audio, batch_size=self.batch_size, vad_filter=True, **self.options)
+        for seg in segments:
+            yield offset_s + seg.start, offset_s + seg.end, seg.text.strip()
@@ -4,23 +4,22 @@ import os
 import threading
 import queue
 import time
-import soundfile as sf
 import subprocess
 
 # os.environ["GDK_BACKEND"] = "x11" # Removed global X11 override to support GTK4 Layer Shell
 # os.environ["QT_QPA_PLATFORM"] = "xcb" # If we ever use Qt
 os.environ["HF_TOKEN"] = os.getenv("WANDA_HF_TOKEN", "")
 
+# Heavy subsystems (numpy, faster_whisper, torch via TTS, soundfile,
+# websockets) are imported inside the commands that use them, so light
+# commands like `vox kill` stay fast. tests/test_import_time.py guards this.
 from wandavoice.config import Config
-from wandavoice.audio import AudioRecorder
-from wandavoice.stt import STTEngine
+from wandavoice.startup import StartupOrchestrator
 from wandavoice.llm import GeminiLLM
-from wandavoice.tts import TTSEngine
 from wandavoice.session import SessionManager
 from wandavoice.utils import print_status, print_user, print_say, print_show
 from wandavoice.ui import VoxOrb, MissionControl
 from wandavoice.insert import insert_text
-from wandavoice import mcc_server
 
 # New professional components
 from wandavoice.router import Router, RuntimeOptions
@@ -128,7 +127,37 @@ def mcc():
         print("Goodbye.")
 
 
-def handle_mcc_command(cmd, cfg, recorder=None, tts_engine=None, orb_ui=None):
+def _start_recorder(cfg, orb_ui):
+    from wandavoice.audio import AudioRecorder
+    recorder = AudioRecorder(cfg, level_callback=orb_ui.set_audio_level)
+    recorder.start_capture()  # mic stays live between turns
+    return recorder
+
+
+def _print_model_report():
+    from wandavoice.model_registry import registry
+    for m in registry.report():
+        print_status(
+            f"[DEBUG] Model {m['kind']}:{m['model']} ({m['device']}/{m['compute_type'] or '-'}) "
+            f"refs={m['refs']} load={m['load_ms']:.0f}ms rss_after={m['process_rss_mb']:.0f}MB"
+            + "".join(f" {k}={v:.0f}ms" for k, v in m["warmup_ms"].items())
+        )
+
+
+def _daemon_call(cfg, op, **params):
+    """Run ``op`` on the resident daemon; None if none is running (or it can't serve it)."""
+    from wandavoice import daemon
+    try:
+        return daemon.request(cfg.DAEMON_SOCKET, op, **params)
+    except daemon.DaemonError as e:
+        if e.code not in ("model_mismatch", "long_file"):
+            raise click.ClickException(f"VOX daemon: {e}")
+        print_status(f"{e}; loading locally")
+        return None
+
+
+def handle_mcc_command(cmd, cfg, recorder=None, tts_engine=None, orb_ui=None, stt=None):
+    from wandavoice import mcc_server
     try:
         ctype = cmd.get("type")
         payload = cmd.get("payload", {})
@@ -143,11 +172,32 @@ def handle_mcc_command(cmd, cfg, recorder=None, tts_engine=None, orb_ui=None):
                 
         elif ctype == "set_stt_profile":
             prof = payload.get("profile")
-            print_status(f"[MCC] Applied STT Profile: {prof}")
-            if prof == "fast":
-                cfg.update_from_args(model="small")
-            elif prof == "final":
-                cfg.update_from_args(model="large-v3-turbo")
+            if stt is not None:
+                # Loads in the background; decodes keep using the current model until it is ready.
+                fut = stt.set_profile(prof)
+                model = stt.profile_key(prof)[0]
+                print_status(f"[MCC] STT Profile: {prof} ({model}{'' if fut.done() else ', loading'})")
+
+                def on_ready(f, prof=prof, model=model):
+                    if f.exception() is None:
+                        cfg.update_from_args(model=model)
+                        mcc_server.broadcast("stt_profile", {"profile": prof, "model": model})
+
+                fut.add_done_callback(on_ready)
+            else:
+                print_status(f"[MCC] Applied STT Profile: {prof}")
+                model = (cfg.get("voice.stt.profiles", {}).get(prof) or {}).get("model")
+                if model:
+                    cfg.update_from_args(model=model)
+
+        elif ctype == "set_stt_language":
+            lang = payload.get("lang", "auto")
+            cfg.set("voice.stt.lang", lang)
+            cache = getattr(stt, "lang_cache", None) if stt is not None else None
+            if cache is not None:
+                cache.reset()  # 'auto' detects afresh on the next utterance
+            print_status(f"[MCC] STT Language -> {lang}")
+            mcc_server.broadcast("stt_language", {"lang": lang})
 
         elif ctype == "set_tts_voice":
             v = payload.get("voice", "")
@@ -235,8 +285,17 @@ def start(ctx, no_aura, no_console):
 @click.option("--target", help="Override target (e.g., 'insert', 'cli:gemini').")
 @click.option("--no-aura", is_flag=True, help="Disable GTK4 Aura")
 @click.option("--no-console", is_flag=True, help="Disable tkinter Console/Pill")
-def voice(text, model, tts, reset, debug, no_hotkey, target, no_aura, no_console):
+@click.option("--no-daemon", is_flag=True, help="Never hand --text to a running `vox daemon`.")
+@click.option("--two-tier", is_flag=True, default=None, help="Partials on the 'fast' STT profile, finals on 'final'.")
+def voice(text, model, tts, reset, debug, no_hotkey, target, no_aura, no_console, no_daemon, two_tier):
     """Start VOX Voice (Assistant mode or Insert mode)"""
+    if text and not (no_daemon or reset or target or tts):
+        resp = _daemon_call(Config(), "turn", text=text)
+        if resp is not None:
+            if resp["show"]: print_show(resp["show"])
+            print_say(resp["say"])
+            return
+
     from wandavoice.process_manager import acquire_lock, release_lock
     if not acquire_lock():
         print("\033[91m[!] Another VOX engine is already running.\033[0m")
@@ -255,6 +314,8 @@ def voice(text, model, tts, reset, debug, no_hotkey, target, no_aura, no_console
     # Does NOT persist to disk (we write to .data directly, bypassing save()).
     if target == "insert":
         cfg.data["voice"]["permissions"]["window_inject"] = "allow"
+    if two_tier:
+        cfg.set("voice.stt.two_tier", True)
 
     if debug:
         print_status("[DEBUG] Debug logging enabled.")
@@ -273,12 +334,36 @@ def voice(text, model, tts, reset, debug, no_hotkey, target, no_aura, no_console
 
     orb_ui.set_state("loading")
 
+    # Engines load concurrently; the capture path goes live once audio + STT
+    # are ready, LLM and TTS keep warming in the background.
+    from wandavoice.stt_lang import LanguageCache
+    from wandavoice.stt_pool import STTModelPool, profile_key
+    from wandavoice.stt_scheduler import STTScheduler
+    from wandavoice.tts import TTSEngine
+
+    boot = StartupOrchestrator()
+    boot.start("audio", lambda: _start_recorder(cfg, orb_ui))
+    # The final (or only) model sits in a pool, so MCC can swap it at runtime.
+    # Two-tier: the 'fast' profile model loads alongside it and serves partials.
+    two_tier = cfg.STT_TWO_TIER
+    lang_cache = LanguageCache.from_config(cfg)  # lang auto: partials and finals share one detection
+    boot.start("stt", lambda: STTModelPool(cfg, max_resident=cfg.STT_MAX_RESIDENT,
+                                           profile="final" if two_tier else None, lang_cache=lang_cache))
+    if two_tier:
+        from wandavoice.stt import STTEngine
+        boot.start("stt_fast", lambda: STTEngine(cfg, *profile_key(cfg, "fast"), lang_cache=lang_cache))
+    boot.start("llm", lambda: GeminiLLM(cfg))
+    boot.start("tts", lambda: TTSEngine(cfg))
+
     try:
-        recorder = AudioRecorder(cfg, level_callback=orb_ui.set_audio_level)
-        stt = STTEngine(cfg)
-        llm = GeminiLLM(cfg)
-        tts_engine = TTSEngine(cfg)
-        
+        recorder = boot.get("audio")
+        if two_tier:
+            from wandavoice.stt_tiers import TwoTierSTT
+            stt = TwoTierSTT(boot.get("stt_fast"), boot.get("stt"))
+            model = f"{stt.fast.engine.model_size} (partials) + {stt.final.engine.model_size}"
+        else:
+            stt = STTScheduler(boot.get("stt"))  # live partials + finals share the active model
+
         # Initialize Managers
         audit_log = AuditLogger(cfg)
         perm_mgr = PermissionManager(cfg)
@@ -292,7 +377,13 @@ def voice(text, model, tts, reset, debug, no_hotkey, target, no_aura, no_console
             "router": router
         }
         
-        print_status(f"VOX Online | STT: {model} | TTS: {cfg.TTS_MODE} | Target: {cfg.TARGET}")
+        print_status(f"VOX Online | STT: {model} | TTS: {cfg.TTS_MODE} | Target: {cfg.TARGET} ({boot.elapsed_ms():.0f} ms)")
+        if debug:
+            print_status("[DEBUG] Startup timeline (audio + STT ready):\n" + boot.format_timeline())
+            boot.on_all_done(lambda: (
+                print_status("[DEBUG] Startup timeline (all engines):\n" + boot.format_timeline()),
+                _print_model_report(),
+            ))
     except Exception as e:
         print(f"\033[91mInit Error:\033[0m {e}")
         if debug: import traceback; traceback.print_exc()
@@ -303,7 +394,7 @@ def voice(text, model, tts, reset, debug, no_hotkey, target, no_aura, no_console
     if orb_ui.enabled:
         from wandavoice.mcc_server import start_mcc_server
         print_status("Starting Web MCC Backend...")
-        start_mcc_server(cmd_callback=lambda c: handle_mcc_command(c, cfg, recorder=recorder, tts_engine=tts_engine, orb_ui=orb_ui))
+        start_mcc_server(cmd_callback=lambda c: handle_mcc_command(c, cfg, recorder=recorder, tts_engine=boot.result("tts"), orb_ui=orb_ui, stt=stt))
         
         # Priority: GTK4 Layer Shell Orb
         use_gtk = cfg.get("voice.ui.use_gtk4", True) and not no_aura
@@ -337,7 +428,7 @@ def voice(text, model, tts, reset, debug, no_hotkey, target, no_aura, no_console
     orb_ui.set_state("idle")
 
     if text:
-        process_turn(text, session, llm, tts_engine, orb_ui, cfg, managers)
+        process_turn(text, session, boot.get("llm"), boot.get("tts"), orb_ui, cfg, managers)
         release_lock()
         return
 
@@ -345,6 +436,13 @@ def voice(text, model, tts, reset, debug, no_hotkey, target, no_aura, no_console
     key_queue: queue.Queue = queue.Queue()
     shutdown = threading.Event()
     toggle_mode = False
+    first_turn = True  # cold/warm warm-up decode times go into the first report
+    lang_detect_ms = 0.0  # language detection time already reported
+    last_partial = [""]  # latest live partial of the current utterance
+
+    def on_partial(text):
+        last_partial[0] = text
+        orb_ui.set_transcript(text)
 
     if hotkey_enabled:
         ok = start_evdev_listener(key_queue, shutdown)
@@ -363,11 +461,13 @@ def voice(text, model, tts, reset, debug, no_hotkey, target, no_aura, no_console
         while True:
             try:
                 orb_ui.set_state("idle")
-                tts_engine.stop()
+                if boot.result("tts"):
+                    boot.result("tts").stop()
 
                 if toggle_mode:
                     print_status("Press [Right Ctrl] to start recording...")
                     key_queue.get()
+                    pressed_at = time.monotonic()  # recording reaches back from here
                     time.sleep(0.1)  # Debounce delay
                     while not key_queue.empty():
                         try:
@@ -376,10 +476,12 @@ def voice(text, model, tts, reset, debug, no_hotkey, target, no_aura, no_console
                             pass
 
                     orb_ui.set_state("listening")
+                    last_partial[0] = ""
                     audio_data = recorder.record_toggle(
                         key_queue, 
                         stt_engine=stt, 
-                        transcript_callback=orb_ui.set_transcript
+                        transcript_callback=on_partial,
+                        pressed_at=pressed_at
                     )
                 else:
                     orb_ui.set_state("listening")
@@ -389,9 +491,10 @@ def voice(text, model, tts, reset, debug, no_hotkey, target, no_aura, no_console
                     # Optional: in the future we can determine vad_profile dynamically
                     vad_profile = cfg.get("voice.audio.vad_profile", "chat")
                     
+                    last_partial[0] = ""
                     audio_data = recorder.record_phrase(
                         stt_engine=stt, 
-                        transcript_callback=orb_ui.set_transcript,
+                        transcript_callback=on_partial,
                         cancel_token=cancel_token,
                         vad_profile=vad_profile
                     )
@@ -405,9 +508,27 @@ def voice(text, model, tts, reset, debug, no_hotkey, target, no_aura, no_console
                 # 1. STT Phase with Telemetry
                 from wandavoice.utils import LatencyTracker
                 lt = LatencyTracker()
+                if toggle_mode:
+                    lt.annotate("Capture_Offset", recorder.last_capture_offset_ms)
                 lt.start("STT_Finalize")
                 user_text = stt.transcribe(audio_data)
                 lt.stop("STT_Finalize")
+                lt.annotate("STT_Queue_Wait", stt.last_wait_ms.get("final", 0.0))
+                if cfg.LANGUAGE is None:
+                    lt.annotate("STT_Lang_Detect", lang_cache.detect_ms_total - lang_detect_ms)
+                    lt.annotate("STT_Lang_Hit", lang_cache.hit_rate * 100, unit="%")
+                    lang_detect_ms = lang_cache.detect_ms_total
+                    if debug:
+                        print_status(f"[DEBUG] {lang_cache.format_stats()}")
+                if first_turn:
+                    for label, ms in stt.warmup_ms.items():
+                        lt.annotate(label, ms)
+                    first_turn = False
+                if two_tier and user_text:
+                    stt.record_final(last_partial[0], user_text)
+                    lt.annotate("STT_Partial", stt.last_partial_ms)
+                    if debug:
+                        print_status(f"[DEBUG] {stt.format_stats()}")
 
                 if not user_text or not user_text.strip():
                     print_status("(nothing understood — try speaking more clearly)")
@@ -423,7 +544,8 @@ def voice(text, model, tts, reset, debug, no_hotkey, target, no_aura, no_console
                     orb_ui.set_state("idle")
                     continue
 
-                process_turn(user_text, session, llm, tts_engine, orb_ui, cfg, managers, lt=lt)
+                # Usually long ready; only the very first turn may wait for them
+                process_turn(user_text, session, boot.get("llm"), boot.get("tts"), orb_ui, cfg, managers, lt=lt)
 
             except KeyboardInterrupt:
                 shutdown.set()
@@ -495,10 +617,20 @@ def dictate(model, debug, no_aura, no_console):
 
     orb_ui.set_state("loading")
 
+    from wandavoice.dictation import DictationPipeline
+    from wandavoice.stt import STTEngine
+    from wandavoice.stt_scheduler import STTScheduler
+
+    boot = StartupOrchestrator()
+    boot.start("audio", lambda: _start_recorder(cfg, orb_ui))
+    boot.start("stt", lambda: STTScheduler(STTEngine(cfg), workers=cfg.STT_WORKERS))
     try:
-        recorder = AudioRecorder(cfg, level_callback=orb_ui.set_audio_level)
-        stt = STTEngine(cfg)
-        print_status(f"VOX Dictation Mode | STT: {model}")
+        recorder = boot.get("audio")
+        stt = boot.get("stt")
+        print_status(f"VOX Dictation Mode | STT: {model} ({boot.elapsed_ms():.0f} ms)")
+        if debug:
+            print_status("[DEBUG] Startup timeline:\n" + boot.format_timeline())
+            _print_model_report()
     except Exception as e:
         print(f"\033[91mInit Error:\033[0m {e}")
         release_lock()
@@ -516,19 +648,12 @@ def dictate(model, debug, no_aura, no_console):
         release_lock()
         sys.exit(1)
 
-    # Hallucination filter set (common Whisper silence artifacts)
-    NOISE = {"1", "2", "3", "vielen dank", "untertitel", "oh", "ja", ".", "!", "?",
-             "danke", "danke schoen", "tschuess", "auf wiedersehen", "vielen dank.",
-             "vielen dank fuer das zuschauen.", "untertitel: stephanie wolf"}
-
-    def _is_noise(text: str) -> bool:
-        return len(text) < 40 and text.lower().strip(".!?, ") in NOISE
-
     try:
         while not shutdown.is_set():
             try:
                 orb_ui.set_state("idle")
                 key_queue.get()  # block until Right Ctrl press
+                pressed_at = time.monotonic()  # dictation reaches back from here
                 time.sleep(0.1)  # Debounce: drain any duplicate key events
                 while not key_queue.empty():
                     try:
@@ -539,18 +664,22 @@ def dictate(model, debug, no_aura, no_console):
                 orb_ui.set_state("listening")
                 first_inject = [True]  # mutable flag for first-segment delay
 
-                def on_segment(audio_segment):
-                    """Called by record_stream_segments for each VAD-delimited speech chunk."""
+                def transcribe_segment(audio_segment):
                     orb_ui.set_state("thinking")
-                    text = stt.transcribe(audio_segment)
+                    # Silence/noise hallucinations are dropped by the STT rejection policy
+                    result = stt.transcribe_result(audio_segment, priority="segment")
                     orb_ui.set_state("listening")
-
-                    if not text or not text.strip():
-                        return
-                    if _is_noise(text):
-                        print_status(f"Noise filtered: {repr(text)}")
-                        return
-
+                    for seg in result.rejected:
+                        print_status(f"Noise filtered ({seg.rejected}): {seg.text.strip()!r}")
+                    if debug:
+                        print_status(
+                            f"[DEBUG] STT queue wait: {stt.last_wait_ms.get('segment', 0.0):.0f}ms, "
+                            f"decode {result.decode_ms:.0f}ms"
+                        )
+                    return result.text
+
+                def inject_segment(text):
+                    """Called by the pipeline in segment order."""
                     # First injection: wait 0.5s to ensure Right Ctrl modifier
                     # is fully released by the Wayland compositor before wtype runs
                     if first_inject[0]:
@@ -563,8 +692,20 @@ def dictate(model, debug, no_aura, no_console):
                     orb_ui.set_transcript(text)
                     print_status(f"\u2192 {text.strip()}")
 
-                # Progressive streaming: segments injected as user speaks
-                recorder.record_stream_segments(key_queue, on_segment)
+                # Progressive streaming: segments are transcribed concurrently
+                # and injected in order while the user keeps speaking
+                pipeline = DictationPipeline(transcribe_segment, inject_segment, workers=cfg.STT_WORKERS)
+                try:
+                    recorder.record_stream_segments(key_queue, pipeline.submit, pressed_at=pressed_at)
+                finally:
+                    pipeline.close()
+                if debug:
+                    print_status(f"[DEBUG] Capture offset: {recorder.last_capture_offset_ms:+.0f} ms vs. hotkey")
+                    st = pipeline.stats()
+                    print_status(
+                        f"[DEBUG] Dictation: {st['segments']} segments, {st['merged']} merged, "
+                        f"max queue {st['max_queue_depth']}, lag p50 {st['lag_p50_ms']:.0f}ms / max {st['lag_max_ms']:.0f}ms"
+                    )
 
                 orb_ui.set_response("[Dictation complete]")
                 orb_ui.set_state("idle")
@@ -582,41 +723,60 @@ def dictate(model, debug, no_aura, no_console):
         release_lock()
 
 @cli.command("transcribe")
-@click.argument("audio_file")
+@click.argument("inputs", nargs=-1, required=True)
 @click.option("--respond", is_flag=True, help="Send transcript to Gemini and speak response.")
 @click.option("--model", default="large-v3-turbo", help="Whisper model.")
-def transcribe_cmd(audio_file, respond, model):
-    """Transcribe an audio file."""
+@click.option("--no-daemon", is_flag=True, help="Load models in this process even if `vox daemon` is running.")
+@click.option("--batch-size", type=int, default=None, help="Chunks decoded per batch on long files (default: voice.stt.batch_size).")
+@click.option("--workers", type=int, default=None, help="Processes for directories/globs, one model each (default: voice.stt.batch_workers).")
+@click.option("--cpu-threads", type=int, default=None, help="CPU threads per worker model (default: voice.stt.cpu_threads).")
+@click.option("--out-dir", default=None, help="Write transcripts here instead of next to the audio.")
+@click.option("--format", "formats", multiple=True, type=click.Choice(["txt", "jsonl"]), help="Output formats (default: txt and jsonl).")
+@click.option("--force", is_flag=True, help="Redo files that already have complete outputs.")
+def transcribe_cmd(inputs, respond, model, no_daemon, batch_size, workers, cpu_threads, out_dir, formats, force):
+    """Transcribe an audio file, or directories/globs of them into txt/JSONL files."""
     cfg = Config()
     cfg.update_from_args(model=model)
 
-    if not os.path.exists(audio_file):
-        print(f"File not found: {audio_file}")
-        sys.exit(1)
-
-    data, fs = sf.read(audio_file)
-    if data.ndim > 1: data = data[:, 0]
-
-    import numpy as np
-    if data.dtype != np.float32: data = data.astype(np.float32)
-    if fs != 16000:
-        try:
-            import librosa
-            data = librosa.resample(data, orig_sr=fs, target_sr=16000)
-        except ImportError:
-            print("librosa not available for resampling — audio may be at wrong rate")
+    audio_file = inputs[0]
+    if len(inputs) > 1 or os.path.isdir(audio_file) or not os.path.exists(audio_file):
+        _transcribe_many(cfg, inputs, model, batch_size, workers, cpu_threads, out_dir, formats, force)
+        return
 
-    print_status("Transcribing...")
-    stt = STTEngine(cfg)
-    text = stt.transcribe(data)
+    if not no_daemon:
+        resp = _daemon_call(cfg, "transcribe", path=os.path.abspath(audio_file), model=model)
+        if resp is not None:
+            if not resp["text"]:
+                print_status("(nothing transcribed)")
+                return
+            print_user(resp["text"])
+            if respond:
+                turn = _daemon_call(cfg, "turn", text=resp["text"])
+                if turn is not None:
+                    if turn["show"]: print_show(turn["show"])
+                    print_say(turn["say"])
+            return
+
+    import soundfile as sf
+    from wandavoice.ingest import read_audio_file
+    from wandavoice.stt import STTEngine
+    from wandavoice.stt_cache import cache_from_config
+
+    stt = STTEngine(cfg, cache=cache_from_config(cfg))
+    if sf.info(audio_file).duration >= float(cfg.get("voice.stt.longform_min_s", 120)):
+        text = _transcribe_long(cfg, stt, audio_file, batch_size or int(cfg.get("voice.stt.batch_size", 8)))
+    else:
+        print_status("Transcribing...")
+        text = stt.transcribe(read_audio_file(audio_file))
+        if text:
+            print_user(text)
 
     if not text:
         print_status("(nothing transcribed)")
         return
 
-    print_user(text)
-
     if respond:
+        from wandavoice.tts import TTSEngine
         session = SessionManager(cfg)
         llm = GeminiLLM(cfg)
         tts_engine = TTSEngine(cfg)
@@ -639,19 +799,251 @@ def transcribe_cmd(audio_file, respond, model):
         process_turn(text, session, llm, tts_engine, orb_ui, cfg, managers)
 
 
+def _transcribe_many(cfg, inputs, model, batch_size, workers, cpu_threads, out_dir, formats, force):
+    """Directory/glob mode: a process pool with one Whisper model per worker, resumable outputs."""
+    from wandavoice import batch
+    from wandavoice.stt import INITIAL_PROMPT
+
+    files = batch.expand_inputs(inputs)
+    if not files:
+        print(f"No audio files found in: {' '.join(inputs)}")
+        sys.exit(1)
+    workers = workers or int(cfg.get("voice.stt.batch_workers", 2))
+    print_status(f"Transcribing {len(files)} file(s) on {min(workers, len(files))} worker(s)...")
+
+    def on_result(r):
+        if "error" in r:
+            print(f"  [!] {r['path']}: {r['error']}")
+        else:
+            print(f"  [ok] {r['path']} ({_hms(r['audio_s'])} audio in {r['wall_s']:.1f} s)", flush=True)
+
+    summary = batch.transcribe_batch(
+        files,
+        factory=batch.whisper_pipeline,
+        factory_kwargs=dict(
+            base_dir=cfg.base_dir, model=model,
+            cpu_threads=cpu_threads if cpu_threads is not None else int(cfg.get("voice.stt.cpu_threads", 0)),
+        ),
+        workers=workers,
+        formats=formats or batch.FORMATS,
+        out_dir=out_dir,
+        force=force,
+        options=dict(batch_size=batch_size or int(cfg.get("voice.stt.batch_size", 8)), language=cfg.LANGUAGE,
+                     initial_prompt=INITIAL_PROMPT),
+        on_result=on_result,
+    )
+    print_status(
+        f"{summary['done']} done, {summary['skipped']} skipped (already complete), {len(summary['failed'])} failed | "
+        f"{summary['audio_s'] / 3600:.2f} audio-h in {summary['wall_s'] / 3600:.3f} wall-h = "
+        f"{summary['audio_h_per_wall_h']:.1f} audio-h/wall-h"
+    )
+    if summary["failed"]:
+        sys.exit(1)
+
+
+def _hms(seconds: float) -> str:
+    m, sec = divmod(seconds, 60)
+    h, m = divmod(int(m), 60)
+    return f"{h:d}:{m:02d}:{sec:04.1f}"
+
+
+def _transcribe_long(cfg, stt, audio_file, batch_size):
+    """Batched long-form decode; prints segments as they finish, then RTF and peak RSS."""
+    from wandavoice.longform import LongFormTranscriber
+    from wandavoice.stt import INITIAL_PROMPT
+
+    print_status(f"Long-form transcription (batch size {batch_size})...")
+    lf = LongFormTranscriber(stt.model, batch_size=batch_size, language=cfg.LANGUAGE, initial_prompt=INITIAL_PROMPT)
+    parts = []
+    for start, end, text in lf.transcribe(audio_file):
+        print(f"[{_hms(start)} -> {_hms(end)}] {text}", flush=True)
+        parts.append(text)
+    print_status(
+        f"Audio {_hms(lf.audio_s)} in {_hms(lf.wall_s)} wall, RTF {lf.rtf:.3f}, "
+        f"peak RSS {lf.peak_rss_mb:.0f} MB"
+    )
+    return " ".join(parts).strip()
+
+
 @cli.command()
 @click.argument("output_file", default="tests/data/sample.wav")
 def record_test(output_file):
     """Record a 5-second test audio file for STT benchmarking."""
+    import soundfile as sf
+    from wandavoice.audio import AudioRecorder
     cfg = Config()
     recorder = AudioRecorder(cfg)
 
     os.makedirs(os.path.dirname(output_file), exist_ok=True)
     audio = recorder.record_fixed(duration_s=5)
+    recorder.close()
     sf.write(output_file, audio, cfg.SAMPLE_RATE)
     print(f"Saved test audio to {output_file}")
 
 
+@cli.command("stt-tune")
+@click.option("--model", default=None, help="Whisper model to tune (default: voice.stt.model).")
+@click.option("--clip", default="tests/data/sample.wav", help="Speech clip to benchmark on (see `vox record-test`).")
+@click.option("--reference", default=None, help="Correct transcript of the clip (default: the CPU float32 transcript).")
+@click.option("--max-wer", type=float, default=0.1, help="Accuracy floor: highest word error rate vs. the reference.")
+@click.option("--device", "devices", multiple=True, help="Devices to try (default: cpu, plus cuda if available).")
+@click.option("--compute-type", "compute_types", multiple=True, help="Compute types to try (default: int8, int8_float32, float32 on CPU).")
+@click.option("--threads", default=None, help="Comma-separated CPU thread counts (default: cores/4, cores/2, cores).")
+@click.option("--repeats", type=int, default=3, help="Timed decodes per candidate (median is used).")
+@click.option("--dry-run", is_flag=True, help="Only report, do not save the result.")
+def stt_tune(model, clip, reference, max_wer, devices, compute_types, threads, repeats, dry_run):
+    """Benchmark STT devices, compute types and thread counts; save the fastest accurate one.
+
+    The result is read at startup by vox (STTEngine) and the voice engine
+    backend whenever no compute type is set explicitly.
+    """
+    from wandavoice import stt_tune as tune
+    from wandavoice.ingest import read_audio_file
+
+    cfg = Config()
+    model = model or cfg.WHISPER_MODEL_SIZE
+    if not os.path.exists(clip):
+        raise click.ClickException(f"Clip not found: {clip} (record one with `vox record-test`)")
+    audio = read_audio_file(clip)
+    cands = tune.candidates(devices or None, compute_types or None,
+                            [int(t) for t in threads.split(",")] if threads else None)
+    if not cands:
+        raise click.ClickException("No supported device/compute type combination to try.")
+
+    print_status(f"Tuning '{model}' on {clip} ({len(audio) / 16000:.1f} s), {len(cands)} candidates...")
+    tuner = tune.STTAutotuner(tune.whisper_loader(cfg, model), audio, language=cfg.LANGUAGE,
+                              reference=reference, max_wer=max_wer, repeats=repeats)
+
+    def on_result(r):
+        name = f"{r['device']}/{r['compute_type']}/{r['cpu_threads'] or '-'}t"
+        if "error" in r:
+            print_status(f"  {name:<24} failed: {r['error']}")
+        else:
+            print_status(f"  {name:<24} {r['ms']:7.0f} ms  RTF {r['rtf']:.3f}  WER {r['wer']:.0%}"
+                         f"{'' if r['ok'] else '  (below accuracy floor)'}")
+
+    try:
+        best = tuner.run(cands, on_result=on_result)
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+    if best is None:
+        raise click.ClickException(f"No candidate reached the accuracy floor (WER <= {max_wer:.0%}).")
+
+    settings = {k: best[k] for k in ("device", "compute_type", "cpu_threads")}
+    settings.update(ms=round(best["ms"], 1), rtf=round(best["rtf"], 4), wer=round(best["wer"], 4),
+                    clip=os.path.abspath(clip), tuned_at=time.strftime("%Y-%m-%dT%H:%M:%S"))
+    print_status(f"Fastest: {settings['device']}/{settings['compute_type']} with "
+                 f"{settings['cpu_threads'] or 'default'} CPU threads (RTF {settings['rtf']:.3f})")
+    if not dry_run:
+        tune.save_tuning(cfg.STT_TUNE_FILE, model, settings)
+        print_status(f"Saved to {cfg.STT_TUNE_FILE}")
+
+
+@cli.group()
+def daemon():
+    """Resident VOX daemon: models stay loaded between commands."""
+    pass
+
+
+@daemon.command("start")
+@click.option("--model", default="large-v3-turbo", help="Whisper model to keep loaded.")
+@click.option("--tts", help="TTS engine (orpheus, seraphina, none).")
+@click.option("--debug", is_flag=True, help="Print the engine load timeline.")
+def daemon_start(model, tts, debug):
+    """Run the daemon in the foreground (Ctrl+C / `vox daemon stop` to end).
+
+    While it runs, `vox transcribe` and `vox voice --text` are thin clients
+    of its Unix socket.
+    """
+    import signal
+    from wandavoice.daemon import DaemonError, VoxDaemon
+
+    cfg = Config()
+    cfg.update_from_args(model=model, tts=tts)
+    vox = VoxDaemon(cfg)
+    try:
+        vox.bind()
+    except DaemonError as e:
+        raise click.ClickException(str(e))
+    vox.load()
+    vox.boot.on_all_done(lambda: (
+        print_status(f"VOX daemon ready ({vox.boot.elapsed_ms():.0f} ms)" + (
+            "\n" + vox.boot.format_timeline() if debug else "")),
+        _print_model_report() if debug else None,
+    ))
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=vox.stop, daemon=True).start())
+    try:
+        vox.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    print_status("VOX daemon stopped.")
+
+
+@daemon.command("status")
+def daemon_status():
+    """Show whether the daemon is up and what it has loaded."""
+    cfg = Config()
+    resp = _daemon_call(cfg, "ping")
+    if resp is None:
+        print_status(f"No VOX daemon on {cfg.DAEMON_SOCKET}.")
+        sys.exit(1)
+    print_status(
+        f"VOX daemon pid {resp['pid']}, up {resp['uptime_s']:.0f}s, {resp['requests']} requests, "
+        f"STT '{resp['model']}', ready: {', '.join(resp['ready']) or '-'}"
+    )
+    for m in resp["models"]:
+        print_status(f"  {m['kind']}:{m['model']} ({m['device']}/{m['compute_type'] or '-'}) rss_after={m['process_rss_mb']:.0f}MB")
+
+
+@daemon.command("stop")
+def daemon_stop():
+    """Ask a running daemon to exit."""
+    cfg = Config()
+    if _daemon_call(cfg, "shutdown") is None:
+        print_status("No VOX daemon running.")
+    else:
+        print_status("VOX daemon stopping.")
+
+
+@cli.group()
+def models():
+    """Manage the local model store (offline model loading)."""
+    pass
+
+
+@models.command("prefetch")
+@click.option("--model", "model_names", multiple=True, help="Whisper model(s) to fetch (default: configured model).")
+@click.option("--revision", default=None, help="Pin a Hugging Face revision (commit hash).")
+def models_prefetch(model_names, revision):
+    """Download models into the store and record their checksums."""
+    from wandavoice.model_store import ModelStore
+    cfg = Config()
+    store = ModelStore(cfg.base_dir)
+
+    entry = store.prefetch_silero()
+    print_status(f"silero_vad: {len(entry['files'])} file(s) -> {store.silero_path()}")
+    for name in model_names or (cfg.WHISPER_MODEL_SIZE,):
+        print_status(f"Fetching Whisper '{name}'...")
+        entry = store.prefetch_whisper(name, revision=revision)
+        size_mb = sum(f["size"] for f in entry["files"].values()) / 2**20
+        print_status(f"whisper/{name}: {len(entry['files'])} files, {size_mb:.0f} MB -> {store.whisper_dir(name)}")
+
+
+@models.command("verify")
+def models_verify():
+    """Recompute checksums of all stored models."""
+    from wandavoice.model_store import ModelStore
+    cfg = Config()
+    result = ModelStore(cfg.base_dir).verify()
+    if not result:
+        print_status("Model store is empty. Run 'vox models prefetch'.")
+        sys.exit(1)
+    for name, problems in result.items():
+        print_status(f"{name}: {'OK' if not problems else ', '.join(problems)}")
+    if any(result.values()):
+        sys.exit(1)
+
+
 @cli.command()
 @click.option("--force", is_flag=True, help="Kill EVERYTHING including the dashboard/web UI.")
 def kill(force):
@@ -721,6 +1113,7 @@ def process_turn(user_text, session, llm, tts_engine, orb_ui, cfg, managers, lt=
     """
     Main Orchestrator: Decision -> Action/Generation -> Output.
     managers: dict containing 'router', 'skills', 'audit', 'permissions'
+    Returns the (say, show) texts of the turn.
     """
     from wandavoice.utils import LatencyTracker, print_debug, print_say, print_show
     if lt is None:
@@ -751,7 +1144,7 @@ def process_turn(user_text, session, llm, tts_engine, orb_ui, cfg, managers, lt=
         print(lt.format_report())
         orb_ui.set_response(f"[Inserted: {user_text[:50]}...]")
         orb_ui.set_state("idle")
-        return
+        return f"[Inserted into active window]: {user_text[:60]}", ""
 
     if decision.fallback_to_stdout:
         print_status("\u26a0  Insert mode blocked by permission — routing to Gemini instead.")
@@ -774,7 +1167,7 @@ def process_turn(user_text, session, llm, tts_engine, orb_ui, cfg, managers, lt=
         tts_engine.speak(feedback)
         tts_engine.wait()
         print(lt.format_report())
-        return
+        return feedback, result
 
     # 3. Default: LLM Streaming Generation
     orb_ui.set_state("thinking")
@@ -833,7 +1226,6 @@ def process_turn(user_text, session, llm, tts_engine, orb_ui, cfg, managers, lt=
     
     # 4. Final Skill Execution (Intent-based)
     if "SKILL:" in full_response:
-        import re
         skill_match = re.search(r"SKILL:\s*(\w+)\((.*?)\)", full_response, re.DOTALL | re.IGNORECASE)
         if skill_match:
             name = skill_match.group(1).strip()
@@ -862,6 +1254,7 @@ def process_turn(user_text, session, llm, tts_engine, orb_ui, cfg, managers, lt=
     print(lt.format_report())
     from wandavoice import mcc_server
     mcc_server.broadcast("latency_stats", lt.get_summary())
+    return say, show
 
 
 def main():
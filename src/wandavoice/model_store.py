@@ -0,0 +1,159 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+from typing import Dict, List, Optional
+
+
+class ModelStoreError(RuntimeError):
+    pass
+
+
+def _sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class ModelStore:
+    """Pinned on-disk models with checksums (``<base_dir>/models``).
+
+    ``vox models prefetch`` is the only code path that downloads anything.
+    At runtime ``resolve_*`` return local paths after a cheap existence and
+    size check against ``manifest.json``; ``verify`` recomputes the SHA-256
+    of every file. Nothing here imports torch or faster_whisper at module
+    level.
+    """
+
+    MANIFEST = "manifest.json"
+
+    def __init__(self, base_dir: str):
+        self.root = os.path.join(base_dir, "models")
+        self.manifest_path = os.path.join(self.root, self.MANIFEST)
+
+    # ---------- layout ----------
+    def whisper_dir(self, model: str) -> str:
+        return os.path.join(self.root, "whisper", model.replace("/", "--"))
+
+    def silero_path(self) -> str:
+        return os.path.join(self.root, "silero_vad.onnx")
+
+    def _load_manifest(self) -> Dict[str, dict]:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self, manifest: Dict[str, dict]) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        tmp = self.manifest_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.manifest_path)
+
+    # ---------- runtime ----------
+    def _resolve(self, name: str, path: str, hint: str) -> str:
+        entry = self._load_manifest().get(name)
+        if entry is None or not os.path.exists(path):
+            raise ModelStoreError(f"Model '{name}' is not in the local store ({path}). Run: {hint}")
+        for rel, meta in entry["files"].items():
+            f = os.path.join(self.root, rel)
+            if not os.path.exists(f) or os.path.getsize(f) != meta["size"]:
+                raise ModelStoreError(f"Model '{name}' is incomplete ({rel}). Run: {hint}")
+        return path
+
+    def resolve_whisper(self, model: str) -> str:
+        """Local path of ``model``: the prefetched copy, else faster-whisper's download cache.
+
+        Installs from before the store have their weights only in the
+        cache under ``models/whisper`` (``download_root``); those keep
+        working offline until ``vox models prefetch`` records a pinned copy.
+        """
+        name = f"whisper/{model}"
+        hint = f"vox models prefetch --model {model}"
+        if name not in self._load_manifest():
+            cached = self.cached_whisper(model)
+            if cached is not None:
+                return cached
+        return self._resolve(name, self.whisper_dir(model), hint)
+
+    def cached_whisper(self, model: str) -> Optional[str]:
+        """Snapshot of ``model`` in the Hugging Face cache under ``models/whisper``, if complete."""
+        if "/" in model:
+            repo = model
+        else:
+            from faster_whisper.utils import _MODELS
+
+            repo = _MODELS.get(model)
+            if repo is None:
+                return None
+        snapshots = os.path.join(self.root, "whisper", "models--" + repo.replace("/", "--"), "snapshots")
+        try:
+            revisions = sorted(os.listdir(snapshots), key=lambda r: os.path.getmtime(os.path.join(snapshots, r)))
+        except OSError:
+            return None
+        for rev in reversed(revisions):  # newest first
+            path = os.path.join(snapshots, rev)
+            if os.path.exists(os.path.join(path, "model.bin")):
+                return path
+        return None
+
+    def resolve_silero(self) -> str:
+        return self._resolve("silero_vad", self.silero_path(), "vox models prefetch")
+
+    # ---------- prefetch / verify ----------
+    def _record(self, name: str, path: str, source: str) -> dict:
+        files = [path] if os.path.isfile(path) else [
+            os.path.join(d, f) for d, _, fs in os.walk(path) for f in fs
+        ]
+        entry = {
+            "path": os.path.relpath(path, self.root),
+            "source": source,
+            "fetched_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "files": {
+                os.path.relpath(f, self.root): {"sha256": _sha256(f), "size": os.path.getsize(f)}
+                for f in sorted(files)
+                if not os.path.relpath(f, path).startswith(".cache")  # HF download metadata
+            },
+        }
+        manifest = self._load_manifest()
+        manifest[name] = entry
+        self._save_manifest(manifest)
+        return entry
+
+    def prefetch_whisper(self, model: str, revision: Optional[str] = None) -> dict:
+        """Download a CTranslate2 Whisper model into the store (network)."""
+        from faster_whisper.utils import download_model
+
+        out = self.whisper_dir(model)
+        download_model(model, output_dir=out, revision=revision)
+        return self._record(f"whisper/{model}", out, source=f"huggingface:{model}@{revision or 'main'}")
+
+    def prefetch_silero(self, source: Optional[str] = None) -> dict:
+        """Copy the Silero ONNX export into the store (faster-whisper ships one; no network)."""
+        from wandavoice.vad import find_silero_onnx
+
+        src = source or find_silero_onnx()
+        if not src:
+            raise ModelStoreError("No Silero ONNX export found to copy (is faster-whisper installed?)")
+        os.makedirs(self.root, exist_ok=True)
+        shutil.copyfile(src, self.silero_path())
+        return self._record("silero_vad", self.silero_path(), source=src)
+
+    def verify(self) -> Dict[str, List[str]]:
+        """Recompute checksums; returns problems per model (empty list = OK)."""
+        result: Dict[str, List[str]] = {}
+        for name, entry in self._load_manifest().items():
+            problems = []
+            for rel, meta in entry["files"].items():
+                f = os.path.join(self.root, rel)
+                if not os.path.exists(f):
+                    problems.append(f"missing {rel}")
+                elif _sha256(f) != meta["sha256"]:
+                    problems.append(f"checksum mismatch {rel}")
+            result[name] = problems
+        return result
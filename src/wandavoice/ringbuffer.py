@@ -0,0 +1,72 @@
+import numpy as np
+
+
+class RingBuffer:
+    """Fixed-capacity float32 ring buffer addressed by absolute sample position.
+
+    Every sample is stored twice (at ``i`` and ``i + capacity``), so any window
+    of up to ``capacity`` samples is one contiguous slice and can be handed out
+    as a zero-copy view, even when it wraps around the end of the ring.
+
+    Positions are absolute: ``write_pos`` counts all samples ever written and
+    never wraps. Samples older than ``write_pos - capacity`` are gone.
+    """
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = int(capacity)
+        self._buf = np.zeros(2 * self.capacity, dtype=np.float32)
+        self.write_pos = 0
+
+    @property
+    def oldest_pos(self) -> int:
+        """Absolute position of the oldest sample still held by the ring."""
+        return max(0, self.write_pos - self.capacity)
+
+    def __len__(self) -> int:
+        return self.write_pos - self.oldest_pos
+
+    def write(self, samples: np.ndarray) -> None:
+        """Append samples. Only the newest ``capacity`` samples are retained."""
+        n = len(samples)
+        if n == 0:
+            return
+        if n > self.capacity:
+            self.write_pos += n - self.capacity
+            samples = samples[-self.capacity:]
+            n = self.capacity
+
+        cap = self.capacity
+        start = self.write_pos % cap
+        first = min(n, cap - start)
+        # Primary copy and its mirror half.
+        self._buf[start:start + first] = samples[:first]
+        self._buf[start + cap:start + cap + first] = samples[:first]
+        if first < n:
+            rest = n - first
+            self._buf[:rest] = samples[first:]
+            self._buf[cap:cap + rest] = samples[first:]
+        self.write_pos += n
+
+    def view(self, start: int, end: int) -> np.ndarray:
+        """Zero-copy view of the absolute range [start, end).
+
+        The view aliases ring storage: it stays valid only until the range is
+        overwritten, so copy it before handing it to another thread for long.
+        """
+        if start < self.oldest_pos or end > self.write_pos or start > end:
+            raise IndexError(
+                f"range [{start}, {end}) outside buffered [{self.oldest_pos}, {self.write_pos})"
+            )
+        offset = start % self.capacity
+        return self._buf[offset:offset + (end - start)]
+
+    def latest(self, n: int) -> np.ndarray:
+        """Zero-copy view of the newest ``n`` samples (fewer if not yet written)."""
+        n = min(int(n), len(self))
+        return self.view(self.write_pos - n, self.write_pos)
+
+    def clear(self) -> None:
+        """Forget all buffered samples and restart positions at zero."""
+        self.write_pos = 0
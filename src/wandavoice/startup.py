@@ -0,0 +1,81 @@
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from wandavoice.utils import print_status
+
+
+class StartupOrchestrator:
+    """Constructs independent engines concurrently and records when each was ready.
+
+    ``start(name, factory)`` runs the factory on its own thread right away;
+    ``get(name)`` blocks until that component is ready (re-raising its init
+    error). Callers wait only for what they need next, so e.g. the capture
+    path can go live while the LLM and TTS are still loading.
+    """
+
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self._futures: Dict[str, Future] = {}
+        self.timeline: Dict[str, List[float]] = {}  # name -> [start_ms, end_ms]
+        self.errors: Dict[str, BaseException] = {}
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.t0) * 1000
+
+    def start(self, name: str, factory: Callable[[], Any]) -> None:
+        fut: Future = Future()
+        self._futures[name] = fut
+
+        def run():
+            self.timeline[name] = [self.elapsed_ms(), 0.0]
+            try:
+                result = factory()
+            except BaseException as e:
+                self.timeline[name][1] = self.elapsed_ms()
+                self.errors[name] = e
+                print_status(f"Startup: {name} failed after {self.timeline[name][1]:.0f} ms: {e}")
+                fut.set_exception(e)
+            else:
+                self.timeline[name][1] = self.elapsed_ms()
+                fut.set_result(result)
+
+        threading.Thread(target=run, daemon=True, name=f"init-{name}").start()
+
+    def get(self, name: str, timeout: Optional[float] = None) -> Any:
+        return self._futures[name].result(timeout)
+
+    def result(self, name: str) -> Any:
+        """The component if it is ready and healthy, else None (never blocks)."""
+        fut = self._futures.get(name)
+        if fut is None or not fut.done() or fut.exception() is not None:
+            return None
+        return fut.result()
+
+    def wait(self, names: Iterable[str]) -> Dict[str, Any]:
+        return {n: self.get(n) for n in names}
+
+    def on_all_done(self, callback: Callable[[], None]) -> None:
+        def waiter():
+            for fut in list(self._futures.values()):
+                try:
+                    fut.exception()
+                except BaseException:
+                    pass
+            callback()
+
+        threading.Thread(target=waiter, daemon=True, name="init-report").start()
+
+    def format_timeline(self, width: int = 40) -> str:
+        """Per-component Gantt-style lines, e.g. ``stt    120 - 2310 ms  ####``."""
+        if not self.timeline:
+            return ""
+        end = max(e or self.elapsed_ms() for _, e in self.timeline.values()) or 1.0
+        lines = []
+        for name, (s, e) in sorted(self.timeline.items(), key=lambda kv: kv[1][0]):
+            e = e or self.elapsed_ms()
+            a, b = int(s / end * width), max(int(s / end * width) + 1, int(e / end * width))
+            status = " FAILED" if name in self.errors else ""
+            lines.append(f"  {name:<8} {s:>6.0f} - {e:>6.0f} ms  {' ' * a}{'#' * (b - a)}{status}")
+        return "\n".join(lines)
@@ -0,0 +1,91 @@
+import re
+from typing import List, Tuple
+
+import numpy as np
+
+Word = Tuple[float, float, str]  # (start_s, end_s, text), absolute utterance time
+
+
+def _norm(word: str) -> str:
+    return re.sub(r"[^\w]", "", word.lower())
+
+
+class StreamingTranscriber:
+    """Incremental partial transcription with a committed prefix.
+
+    Only the audio not yet covered by committed text is decoded, and never
+    more than ``max_window_s`` of it. A word is committed once two
+    consecutive hypotheses agree on it (local agreement); the audio up to the
+    end of the last committed word is then dropped from the decode window.
+    Partial latency and CPU therefore depend on the window, not on how long
+    the user has been talking.
+
+    ``stt_engine`` must provide ``transcribe_words(audio, prompt)`` (see
+    STTEngine, STTScheduler); a None result leaves the state unchanged.
+    Feed it the audio from ``buffer_start`` onwards.
+    """
+
+    def __init__(self, stt_engine, samplerate: int = 16000, max_window_s: float = 8.0):
+        self.stt = stt_engine
+        self.samplerate = samplerate
+        self.max_window = int(max_window_s * samplerate)
+        self.buffer_start = 0  # utterance sample where the decode window begins
+        self.committed: List[Word] = []
+        self._hypothesis: List[Word] = []  # uncommitted tail of the last decode
+
+    @property
+    def committed_text(self) -> str:
+        return "".join(w[2] for w in self.committed).strip()
+
+    @property
+    def text(self) -> str:
+        """Committed prefix followed by the current tentative tail."""
+        return "".join(w[2] for w in self.committed + self._hypothesis).strip()
+
+    def update(self, audio: np.ndarray) -> str:
+        """Decode ``audio`` (utterance samples from ``buffer_start`` on) and return the partial."""
+        start = self.buffer_start
+        if len(audio) > self.max_window:
+            # No agreement for a whole window: commit what the last decode
+            # saw in the part we are about to drop, then slide the window.
+            cut = start + len(audio) - self.max_window
+            cut_s = cut / self.samplerate
+            self._commit([w for w in self._hypothesis if w[1] <= cut_s])
+            self._hypothesis = [w for w in self._hypothesis if w[1] > cut_s]
+            self.buffer_start = max(self.buffer_start, cut)
+            audio = audio[self.buffer_start - start:]
+
+        decoded = self.stt.transcribe_words(audio, prompt=self.committed_text[-200:])
+        if decoded is None:  # dropped by the STT scheduler as stale
+            return self.text
+        offset_s = self.buffer_start / self.samplerate
+        words = [(offset_s + s, offset_s + e, t) for s, e, t in decoded]
+        words = self._skip_committed(words)
+
+        agreed = 0
+        for new, old in zip(words, self._hypothesis):
+            if _norm(new[2]) != _norm(old[2]):
+                break
+            agreed += 1
+        self._commit(words[:agreed])
+        self._hypothesis = words[agreed:]
+        return self.text
+
+    def _skip_committed(self, words: List[Word]) -> List[Word]:
+        """Drop leading words that repeat the committed tail (decode overlap)."""
+        if not self.committed:
+            return words
+        last_end = self.committed[-1][1]
+        tail = [_norm(w[2]) for w in self.committed[-5:]]
+        for n in range(min(len(tail), len(words)), 0, -1):
+            head = words[:n]
+            if [_norm(w[2]) for w in head] == tail[-n:] and head[0][0] < last_end:
+                return words[n:]
+        return [w for w in words if w[1] > last_end]
+
+    def _commit(self, words: List[Word]) -> None:
+        if not words:
+            return
+        self.committed.extend(words)
+        # Trim audio already covered by committed text.
+        self.buffer_start = max(self.buffer_start, int(words[-1][1] * self.samplerate))
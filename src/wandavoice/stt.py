@@ -1,79 +1,296 @@
 import os
 import sys
 import logging
-import torch
+import time
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from faster_whisper import WhisperModel
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+from wandavoice.model_registry import registry
+from wandavoice.model_store import ModelStore
+from wandavoice.stt_cache import STTResultCache
+from wandavoice.stt_lang import LanguageCache
+from wandavoice.stt_tune import tuned_settings
 
 # Suppress spammy logs
 logging.getLogger("faster_whisper").setLevel(logging.ERROR)
 
+# Vocabulary hint for names and control words Whisper tends to mishear
+INITIAL_PROMPT = "Wanda. Jannis. AERIS. n8n. Supabase. Krypto. Stop. Stopp. Abbrechen. Neu aufnehmen. Von vorne."
+
+
+# faster-whisper's temperature fallback ladder
+TEMPERATURES = (0.0, 0.2, 0.4, 0.6, 0.8, 1.0)
+
+
+@dataclass
+class STTSegment:
+    start: float
+    end: float
+    text: str
+    avg_logprob: float = 0.0
+    no_speech_prob: float = 0.0
+    compression_ratio: float = 1.0
+    rejected: Optional[str] = None  # reason the policy dropped it, None = kept
+
+
+@dataclass
+class STTResult:
+    segments: List[STTSegment] = field(default_factory=list)
+    decode_ms: float = 0.0
+    language: Optional[str] = None  # language decoded with (None = Whisper detected it itself)
+    cached: bool = False  # served from the STT result cache, not decoded
+
+    @property
+    def text(self) -> str:
+        return " ".join(s.text.strip() for s in self.segments if not s.rejected and s.text.strip())
+
+    @property
+    def rejected(self) -> List[STTSegment]:
+        return [s for s in self.segments if s.rejected]
+
+
+class RejectionPolicy:
+    """Drops hallucinated Whisper segments by the decoder's own scores.
+
+    A segment is rejected as ``empty`` (punctuation only), ``repetitive``
+    (gzip compression ratio above ``compression_ratio``), ``no_speech``
+    (``no_speech_prob`` above the threshold unless the text is decoded
+    with ``keep_logprob`` confidence) or ``low_confidence`` (``avg_logprob``
+    below the threshold even after fallbacks).
+
+    The thresholds also go to faster-whisper, which then skips clearly
+    non-speech windows without retrying them, and the temperature fallback
+    ladder is cut to ``max_fallbacks`` retries so noise does not cost up to
+    six decodes.
+    """
+
+    def __init__(self, no_speech_prob: float = 0.6, avg_logprob: float = -1.0, compression_ratio: float = 2.4,
+                 keep_logprob: float = -0.3, max_fallbacks: int = 2):
+        self.no_speech_prob = no_speech_prob
+        self.avg_logprob = avg_logprob
+        self.compression_ratio = compression_ratio
+        self.keep_logprob = keep_logprob
+        self.max_fallbacks = max(0, int(max_fallbacks))
+
+    @classmethod
+    def from_config(cls, config) -> Optional["RejectionPolicy"]:
+        opts = config.STT_REJECT
+        return cls(**opts) if opts is not None else None
+
+    def decode_options(self) -> Dict[str, Any]:
+        return dict(
+            no_speech_threshold=self.no_speech_prob,
+            log_prob_threshold=self.avg_logprob,
+            compression_ratio_threshold=self.compression_ratio,
+            temperature=TEMPERATURES[:self.max_fallbacks + 1],
+        )
+
+    def reason(self, seg) -> Optional[str]:
+        if not seg.text.strip(" .,!?"):
+            return "empty"
+        if seg.compression_ratio > self.compression_ratio:
+            return "repetitive"
+        if seg.no_speech_prob > self.no_speech_prob and seg.avg_logprob < self.keep_logprob:
+            return "no_speech"
+        if seg.avg_logprob < self.avg_logprob:
+            return "low_confidence"
+        return None
+
+
+def warmup_clip(samplerate: int = 16000, seconds: float = 2.0) -> np.ndarray:
+    """Deterministic voice-like test signal: a harmonic tone with a 4 Hz syllable envelope over faint noise."""
+    t = np.arange(int(samplerate * seconds)) / samplerate
+    voiced = sum(np.sin(2 * np.pi * 140 * k * t) / k for k in range(1, 6))
+    envelope = 0.5 * (1 - np.cos(2 * np.pi * 4 * t))
+    noise = np.random.default_rng(0).standard_normal(len(t))
+    return (0.1 * voiced * envelope + 0.003 * noise).astype(np.float32)
+
 
 class STTEngine:
-    def __init__(self, config):
+    def __init__(self, config, model_size: Optional[str] = None, compute_type: Optional[str] = None,
+                 cpu_threads: int = 0, lang_cache: Optional[LanguageCache] = None,
+                 cache: Optional[STTResultCache] = None):
         self.config = config
-        model_size = config.WHISPER_MODEL_SIZE  # 'large-v3' or 'large-v3-turbo'
+        # Final decodes of repeated audio (`vox transcribe`, daemon); None = always decode
+        self.cache = cache
+        # lang 'auto': detect once per session, shared by every engine of the session
+        self.lang_cache = lang_cache or LanguageCache.from_config(config)
+        # Default: the configured model ('large-v3' or 'large-v3-turbo'); the
+        # STT model pool passes profile models explicitly.
+        model_size = model_size or config.WHISPER_MODEL_SIZE
+        # `vox stt-tune` result for this model, if any: device, compute type, CPU threads.
+        # Applied as a whole, and only when no other compute type is asked for (the
+        # pool passes the tuned one back): a tuned CPU device with e.g. a profile's
+        # float16 is a combination CTranslate2 rejects.
+        tuned = tuned_settings(config, model_size) or {}
+        if compute_type not in (None, tuned.get("compute_type")):
+            tuned = {}
+        compute_type = compute_type or tuned.get("compute_type") or config.COMPUTE_TYPE
+        device = tuned.get("device", "auto")
+        cpu_threads = cpu_threads or int(tuned.get("cpu_threads", 0))
+        self.model_size = model_size
+        self.compute_type = compute_type
+        self.device = device
+        self.policy = RejectionPolicy.from_config(config)  # None = keep every segment
 
-        print(
-            f"Loading Whisper '{model_size}' ({config.COMPUTE_TYPE})...",
-            end="",
-            flush=True,
-        )
         try:
-            # Point to local cache or download
-            model_path = os.path.join(config.base_dir, "models", "whisper", model_size)
-
-            # Note: device="cuda" if you have enough VRAM, otherwise "cpu"
-            # Using 'auto' allows it to use GPU if available
-            self.model = WhisperModel(
-                model_size,
-                device="auto",
-                compute_type=config.COMPUTE_TYPE,
-                download_root=os.path.join(config.base_dir, "models", "whisper"),
+            # Offline (default): load strictly from the local model store,
+            # populated by `vox models prefetch`. Otherwise faster-whisper
+            # resolves/downloads the model by name.
+            if config.MODELS_OFFLINE:
+                model_path = ModelStore(config.base_dir).resolve_whisper(model_size)
+            else:
+                model_path = model_size
+
+            # Borrowed from the process-wide registry: a second STTEngine with
+            # the same model/device/compute type shares the loaded weights.
+            # device='auto' (untuned) uses the GPU if available.
+            self.model = registry.acquire(
+                "whisper", model_size,
+                loader=lambda: WhisperModel(
+                    model_path,
+                    device=device,
+                    compute_type=compute_type,
+                    num_workers=config.STT_WORKERS,
+                    cpu_threads=cpu_threads,  # 0 = CTranslate2 default
+                    download_root=os.path.join(config.base_dir, "models", "whisper"),
+                    local_files_only=config.MODELS_OFFLINE,
+                ),
+                device=device,
+                compute_type=compute_type,
+                warmup=self._warm_up if config.STT_WARMUP else None,
             )
-            print(" Done.")
+            self.warmup_ms = registry.warmup_ms(self.model)
         except Exception as e:
             print(f"\nError loading Whisper: {e}")
             sys.exit(1)
 
-        # Initialize Silero VAD v5
-        print("Loading Silero VAD v5...", end="", flush=True)
-        try:
-            self.vad_model, self.utils = torch.hub.load(
-                repo_or_dir="snakers4/silero-vad",
-                model="silero_vad",
-                force_reload=False,
-                trust_repo=True,
+    def _warm_decode(self, model, clip: np.ndarray) -> None:
+        # The decode paths used at runtime: final (beam 5 behind the VAD filter),
+        # final without VAD, and the greedy word-timestamp partials.
+        for kwargs in (dict(beam_size=5, vad_filter=True), dict(beam_size=5), dict(beam_size=1, word_timestamps=True)):
+            segments, _ = model.transcribe(
+                clip, language=self.config.LANGUAGE, initial_prompt=INITIAL_PROMPT,
+                condition_on_previous_text=False, max_new_tokens=16, **kwargs,
             )
-            (self.get_speech_timestamps, _, self.read_audio, _, _) = self.utils
-            print(" Done.")
-        except Exception as e:
-            print(f"\nError loading Silero VAD: {e}")
-            # Fallback to simple logic if VAD fails
-            self.vad_model = None
+            for _ in segments:
+                pass
 
-    def transcribe(self, audio_data: np.ndarray) -> str:
-        if audio_data is None or len(audio_data) == 0:
-            return ""
+    def _warm_up(self, model) -> Dict[str, float]:
+        """Run the first (slow) decodes at load time instead of on the first utterance.
+
+        CTranslate2 initializes kernels, allocator pools and caches lazily,
+        per worker. The cold pass is timed alone, then every worker gets a
+        decode, then a warm pass is timed as the steady-state reference.
+        """
+        clip = warmup_clip()
+        t0 = time.perf_counter()
+        self._warm_decode(model, clip)
+        cold_ms = (time.perf_counter() - t0) * 1000
+        workers = self.config.STT_WORKERS
+        if workers > 1:
+            with ThreadPoolExecutor(workers) as pool:
+                list(pool.map(lambda _: self._warm_decode(model, clip), range(workers)))
+        t0 = time.perf_counter()
+        self._warm_decode(model, clip)
+        return {"STT_Warmup_Cold": cold_ms, "STT_Warmup_Warm": (time.perf_counter() - t0) * 1000}
 
+    def close(self) -> None:
+        if self.model is not None:
+            registry.release(self.model)
+            self.model = None
+
+    @staticmethod
+    def _to_float32(audio_data: np.ndarray) -> np.ndarray:
         if audio_data.dtype == np.int16:
-            audio_float = audio_data.astype(np.float32) / 32768.0
-        elif audio_data.dtype == np.float64:
-            audio_float = audio_data.astype(np.float32)
-        else:
-            audio_float = audio_data
+            return audio_data.astype(np.float32) / 32768.0
+        if audio_data.dtype == np.float64:
+            return audio_data.astype(np.float32)
+        return audio_data
+
+    def _decode_options(self) -> Dict[str, Any]:
+        return self.policy.decode_options() if self.policy is not None else {}
+
+    def _segment(self, seg) -> STTSegment:
+        out = STTSegment(seg.start, seg.end, seg.text, seg.avg_logprob, seg.no_speech_prob, seg.compression_ratio)
+        if self.policy is not None:
+            out.rejected = self.policy.reason(out)
+        return out
+
+    def _language(self, audio: np.ndarray) -> Optional[str]:
+        return self.config.LANGUAGE or self.lang_cache.language_for(self.model, audio)
+
+    def transcribe_result(self, audio_data: np.ndarray) -> STTResult:
+        """Final decode with per-segment scores; rejected segments are kept, flagged, out of ``text``."""
+        if audio_data is None or len(audio_data) == 0:
+            return STTResult()
+
+        audio_float = self._to_float32(audio_data)
 
         # Optional: Use Silero VAD to trim audio before Whisper (already filtered in recorder, but safer here)
 
+        t0 = time.perf_counter()
+        options = dict(beam_size=5, vad_filter=True, vad_parameters=dict(min_silence_duration_ms=500),
+                       initial_prompt=INITIAL_PROMPT, **self._decode_options())
+        key = None
+        if self.cache is not None:
+            # Requested language ('auto' = whatever detection picks), not the detected one
+            key = self.cache.key(audio_float, model=self.model_size, device=self.device,
+                                 compute_type=self.compute_type, language=self.config.LANGUAGE, **options)
+            hit = self.cache.get(key)
+            if hit is not None:
+                # Scores are cached, not verdicts: the current policy flags the segments
+                result = STTResult([self._segment(STTSegment(*row)) for row in hit["segments"]],
+                                   language=hit["language"], cached=True)
+                result.decode_ms = (time.perf_counter() - t0) * 1000
+                return result
+
+        language = self._language(audio_float)
+        segments, _ = self.model.transcribe(audio_float, language=language, **options)
+        result = STTResult([self._segment(seg) for seg in segments], language=language)
+        result.decode_ms = (time.perf_counter() - t0) * 1000
+        self.lang_cache.observe(language, (s.avg_logprob for s in result.segments))
+        if key is not None:
+            self.cache.put(key, {"language": language, "segments": [
+                [s.start, s.end, s.text, s.avg_logprob, s.no_speech_prob, s.compression_ratio] for s in result.segments
+            ]})
+        return result
+
+    def transcribe(self, audio_data: np.ndarray) -> str:
+        return self.transcribe_result(audio_data).text
+
+    def transcribe_words(self, audio_data: np.ndarray, prompt: str = "", cancel=None) -> List[Tuple[float, float, str]]:
+        """Greedy decode with word timestamps for live partials.
+
+        Returns (start_s, end_s, word) relative to the start of ``audio_data``.
+        ``prompt`` (e.g. already committed text) is appended to the vocabulary
+        hint so the decode continues the sentence instead of restarting it.
+        If ``cancel`` (threading.Event) gets set, decoding stops at the next
+        segment boundary.
+        """
+        if audio_data is None or len(audio_data) == 0:
+            return []
+
+        audio_float = self._to_float32(audio_data)
+        language = self._language(audio_float)
         segments, _ = self.model.transcribe(
             audio_float,
-            beam_size=5,
-            language=self.config.LANGUAGE,
-            vad_filter=True,
-            vad_parameters=dict(min_silence_duration_ms=500),
-            initial_prompt="Wanda. Jannis. AERIS. n8n. Supabase. Krypto. Stop. Stopp. Abbrechen. Neu aufnehmen. Von vorne."
+            beam_size=1,
+            language=language,
+            word_timestamps=True,
+            condition_on_previous_text=False,
+            initial_prompt=f"{INITIAL_PROMPT} {prompt}".strip(),
+            **self._decode_options(),
         )
-
-        text = " ".join([segment.text for segment in segments])
-        return text.strip()
+        words, scores = [], []
+        for seg in segments:  # lazy: each iteration decodes one more segment
+            scores.append(seg.avg_logprob)
+            if not self._segment(seg).rejected:
+                words.extend((w.start, w.end, w.word) for w in (seg.words or []))
+            if cancel is not None and cancel.is_set():
+                break
+        self.lang_cache.observe(language, scores)
+        return words
@@ -0,0 +1,89 @@
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+
+
+class LanguageCache:
+    """Spoken language of the session, detected once and reused (``voice.stt.lang: auto``).
+
+    ``language_for`` runs Whisper's language detection (one encoder pass)
+    only until a detection reaches ``min_confidence``; from then on every
+    partial and final decodes with that language and skips detection. A
+    less confident detection is used for its own decode but not kept.
+    ``observe`` re-opens detection when decodes with the cached language
+    score below ``min_logprob`` on average (the speaker likely switched
+    languages); ``reset`` does so explicitly.
+    """
+
+    def __init__(self, min_confidence: float = 0.8, min_logprob: float = -1.0):
+        self.min_confidence = min_confidence
+        self.min_logprob = min_logprob
+        self._lock = threading.Lock()
+        self.language: Optional[str] = None
+        self.probability = 0.0
+        self.hits = 0
+        self.detections = 0
+        self.invalidations = 0
+        self.detect_ms_total = 0.0
+        self.detect_ms_last = 0.0
+
+    @classmethod
+    def from_config(cls, config) -> "LanguageCache":
+        opts = config.get("voice.stt.lang_cache", {}) or {}
+        return cls(**opts)
+
+    def language_for(self, model, audio) -> Optional[str]:
+        """Cached language, or detect it on ``audio`` with ``model`` (a faster-whisper WhisperModel)."""
+        with self._lock:
+            if self.language is not None:
+                self.hits += 1
+                return self.language
+        t0 = time.perf_counter()
+        lang, prob, _ = model.detect_language(audio)
+        ms = (time.perf_counter() - t0) * 1000
+        with self._lock:
+            self.detections += 1
+            self.detect_ms_total += ms
+            self.detect_ms_last = ms
+            if prob >= self.min_confidence and self.language is None:
+                self.language, self.probability = lang, float(prob)
+        return lang
+
+    def observe(self, language: Optional[str], avg_logprobs: Iterable[float]) -> None:
+        """Decode scores of a decode made with ``language``; poor ones send the next decode back to detection."""
+        scores = list(avg_logprobs)
+        if not scores:
+            return
+        with self._lock:
+            if language is not None and language == self.language and sum(scores) / len(scores) < self.min_logprob:
+                self.language, self.probability = None, 0.0
+                self.invalidations += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.language, self.probability = None, 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.detections
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "language": self.language,
+            "probability": round(self.probability, 3),
+            "hits": self.hits,
+            "detections": self.detections,
+            "hit_rate": round(self.hit_rate, 3),
+            "detect_ms_total": round(self.detect_ms_total, 1),
+            "detect_ms_last": round(self.detect_ms_last, 1),
+            "invalidations": self.invalidations,
+        }
+
+    def format_stats(self) -> str:
+        s = self.stats()
+        return (
+            f"STT language: {s['language'] or '(detecting)'} p={s['probability']:.2f}, "
+            f"hit rate {s['hit_rate']:.0%} ({s['hits']} hits, {s['detections']} detections, "
+            f"{s['detect_ms_total']:.0f} ms), {s['invalidations']} re-detections"
+        )
@@ -0,0 +1,176 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from wandavoice.stt_lang import LanguageCache
+from wandavoice.stt_tune import compute_type_for
+from wandavoice.utils import print_status
+
+Key = Tuple[str, str]  # (model, compute type)
+
+
+def profile_key(config, profile: str) -> Key:
+    """(model, compute type) of an entry in voice.stt.profiles."""
+    prof = (config.get("voice.stt.profiles", {}) or {}).get(profile)
+    if not prof or not prof.get("model"):
+        raise ValueError(f"unknown STT profile '{profile}'")
+    return str(prof["model"]), str(prof.get("compute_type") or compute_type_for(config, prof["model"]))
+
+
+class STTModelPool:
+    """Resident Whisper engines, one of them active, switchable at runtime.
+
+    ``switch``/``set_profile`` load the target engine on a background
+    thread and make it active only once it is loaded (and warmed up), so
+    capture and decoding carry on with the current model meanwhile. If
+    several switches overlap, the last one requested wins.
+
+    ``transcribe``/``transcribe_words`` pick the active engine when they
+    start: a decode that is in flight during a switch finishes on the old
+    model. At most ``max_resident`` engines stay loaded; the least recently
+    active one is closed as soon as its in-flight decodes are done.
+    """
+
+    def __init__(self, config, max_resident: int = 2,
+                 engine_factory: Optional[Callable[[str, str], Any]] = None, profile: Optional[str] = None,
+                 lang_cache: Optional[LanguageCache] = None):
+        self.config = config
+        self.max_resident = max(1, int(max_resident))
+        # One detected language for the session, whichever model is active
+        self.lang_cache = lang_cache or LanguageCache.from_config(config)
+        if engine_factory is None:
+            from wandavoice.stt import STTEngine
+            engine_factory = lambda model, compute_type: STTEngine(
+                config, model_size=model, compute_type=compute_type, lang_cache=self.lang_cache)
+        self._factory = engine_factory
+        self._lock = threading.Lock()
+        self._engines: "OrderedDict[Key, Any]" = OrderedDict()  # least recently active first
+        self._loading: Dict[Key, Future] = {}
+        self._busy: Dict[int, int] = {}  # id(engine) -> decodes in flight
+        self._retiring: Dict[int, Any] = {}  # evicted, closed when idle
+        self.switches: List[Dict[str, Any]] = []
+
+        # Starts on ``profile`` if given, else on the configured model.
+        key = profile_key(config, profile) if profile else (
+            config.WHISPER_MODEL_SIZE, compute_type_for(config, config.WHISPER_MODEL_SIZE))
+        self._engines[key] = self._factory(*key)
+        self.active_key = self._wanted = key
+        self.profile: Optional[str] = profile
+
+    # ---------- switching ----------
+    def profile_key(self, profile: str) -> Key:
+        return profile_key(self.config, profile)
+
+    def set_profile(self, profile: str) -> Future:
+        fut = self.switch(*self.profile_key(profile))
+        self.profile = profile
+        return fut
+
+    def switch(self, model: str, compute_type: Optional[str] = None) -> Future:
+        """Make ``model`` active; returns a Future resolving to its engine once it is."""
+        key = (model, compute_type or compute_type_for(self.config, model))
+        with self._lock:
+            self._wanted = key
+            if key in self._engines:
+                self._activate(key)
+                fut: Future = Future()
+                fut.set_result(self._engines[key])
+                self.switches.append({"to": key[0], "compute_type": key[1], "load_ms": 0.0})
+                return fut
+            if key in self._loading:
+                return self._loading[key]
+            fut = self._loading[key] = Future()
+        threading.Thread(target=self._load, args=(key, fut), daemon=True, name=f"stt-load-{model}").start()
+        return fut
+
+    def _load(self, key: Key, fut: Future) -> None:
+        t0 = time.perf_counter()
+        try:
+            engine = self._factory(*key)
+        except BaseException as e:  # STTEngine exits on load errors; keep the current model
+            with self._lock:
+                del self._loading[key]
+            print_status(f"STT model '{key[0]}' failed to load: {e!r}; staying on '{self.active_key[0]}'")
+            fut.set_exception(e if isinstance(e, Exception) else RuntimeError(repr(e)))
+            return
+        load_ms = (time.perf_counter() - t0) * 1000
+        with self._lock:
+            del self._loading[key]
+            self._engines[key] = engine
+            self._engines.move_to_end(key, last=False)  # resident, not yet used
+            if self._wanted == key:
+                self._activate(key)
+            else:
+                self._evict()
+        self.switches.append({"to": key[0], "compute_type": key[1], "load_ms": round(load_ms, 1)})
+        fut.set_result(engine)
+
+    def _activate(self, key: Key) -> None:
+        # Caller holds the lock.
+        self.active_key = key
+        self._engines.move_to_end(key)
+        self._evict()
+
+    def _evict(self) -> None:
+        # Caller holds the lock.
+        while len(self._engines) > self.max_resident:
+            key = next(k for k in self._engines if k != self.active_key)
+            engine = self._engines.pop(key)
+            if self._busy.get(id(engine)):
+                self._retiring[id(engine)] = engine
+            else:
+                engine.close()
+
+    # ---------- decoding ----------
+    @contextmanager
+    def _borrow(self):
+        with self._lock:
+            engine = self._engines[self.active_key]
+            self._busy[id(engine)] = self._busy.get(id(engine), 0) + 1
+        try:
+            yield engine
+        finally:
+            with self._lock:
+                n = self._busy[id(engine)] = self._busy[id(engine)] - 1
+                if n == 0:
+                    del self._busy[id(engine)]
+                    retired = self._retiring.pop(id(engine), None)
+                    if retired is not None:
+                        retired.close()
+
+    def transcribe(self, audio_data, *args, **kwargs):
+        with self._borrow() as engine:
+            return engine.transcribe(audio_data, *args, **kwargs)
+
+    def transcribe_result(self, audio_data, *args, **kwargs):
+        with self._borrow() as engine:
+            return engine.transcribe_result(audio_data, *args, **kwargs)
+
+    def transcribe_words(self, audio_data, *args, **kwargs):
+        with self._borrow() as engine:
+            return engine.transcribe_words(audio_data, *args, **kwargs)
+
+    @property
+    def active(self):
+        return self._engines[self.active_key]
+
+    def resident(self) -> List[Key]:
+        with self._lock:
+            return list(self._engines)
+
+    def __getattr__(self, name):
+        # warmup_ms, model, config, ... of the active engine
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.active, name)
+
+    def close(self) -> None:
+        with self._lock:
+            engines = list(self._engines.values()) + list(self._retiring.values())
+            self._engines.clear()
+            self._retiring.clear()
+        for engine in engines:
+            engine.close()
@@ -0,0 +1,149 @@
+import heapq
+import itertools
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# Lower value runs first.
+PRIORITIES = {"final": 0, "segment": 1, "partial": 2}
+
+
+class STTJob:
+    def __init__(self, priority: str, fn: Callable, args: tuple, kwargs: dict):
+        self.priority = priority
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.cancel = threading.Event()
+        self.submitted_at = time.perf_counter()
+        self.started_at: Optional[float] = None
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.dropped = False
+        self._done = threading.Event()
+
+    @property
+    def queue_wait_ms(self) -> float:
+        end = self.started_at if self.started_at is not None else time.perf_counter()
+        return (end - self.submitted_at) * 1000
+
+    def wait(self, timeout: Optional[float] = None) -> Any:
+        """Block until the job ran or was dropped. Dropped jobs return None."""
+        self._done.wait(timeout)
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+    def _finish(self) -> None:
+        self._done.set()
+
+
+class STTScheduler:
+    """Serialises access to one STTEngine by priority: final > segment > partial.
+
+    Whisper decodes from different threads (live partials, the final pass,
+    dictation segments) go through a single worker. A newer partial replaces
+    any queued one, and submitting a final or segment drops queued partials
+    and cancels the one in flight (the engine stops at its next segment
+    boundary), so the final never waits behind a stale preview.
+
+    Quacks like STTEngine: ``transcribe`` is a final, ``transcribe_words`` a
+    partial. Queue wait per job is in ``last_wait_ms`` / ``stats``.
+    """
+
+    def __init__(self, stt_engine, workers: int = 1):
+        self.engine = stt_engine
+        self._heap = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._running: List[STTJob] = []
+        self.last_wait_ms: Dict[str, float] = {}
+        self.stats: Dict[str, Dict[str, float]] = {
+            p: {"jobs": 0, "dropped": 0, "wait_ms_total": 0.0} for p in PRIORITIES
+        }
+        # More than one worker only helps if the model decodes concurrently
+        # (WhisperModel num_workers, see voice.stt.workers).
+        self._workers = [
+            threading.Thread(target=self._run, daemon=True, name=f"stt-scheduler-{i}")
+            for i in range(max(1, workers))
+        ]
+        for t in self._workers:
+            t.start()
+
+    def __getattr__(self, name):
+        # Everything else (model, config, ...) comes from the wrapped engine.
+        return getattr(self.engine, name)
+
+    # ---------- submission ----------
+    def submit(self, fn: Callable, *args, priority: str = "final", cancellable: bool = False, **kwargs) -> STTJob:
+        """Queue ``fn(*args, **kwargs)``. ``cancellable`` passes the job's cancel event as ``cancel=``."""
+        if priority not in PRIORITIES:
+            raise ValueError(f"unknown STT priority '{priority}'")
+        job = STTJob(priority, fn, args, kwargs)
+        if cancellable:
+            kwargs["cancel"] = job.cancel
+        with self._cond:
+            # Queued partials are stale either way: superseded by a newer
+            # partial, or by the end of the utterance.
+            self._drop_queued_partials()
+            if priority != "partial":
+                for running in self._running:
+                    if running.priority == "partial":
+                        running.cancel.set()
+            heapq.heappush(self._heap, (PRIORITIES[priority], next(self._seq), job))
+            self._cond.notify()
+        return job
+
+    def transcribe(self, audio_data, priority: str = "final") -> str:
+        return self.submit(self.engine.transcribe, audio_data, priority=priority).wait()
+
+    def transcribe_result(self, audio_data, priority: str = "final"):
+        return self.submit(self.engine.transcribe_result, audio_data, priority=priority).wait()
+
+    def transcribe_words(self, audio_data, prompt: str = "", priority: str = "partial"):
+        """Partial decode; returns None if the job was dropped as stale."""
+        job = self.submit(self.engine.transcribe_words, audio_data, priority=priority, cancellable=True, prompt=prompt)
+        result = job.wait()
+        return None if job.dropped or job.cancel.is_set() else result
+
+    def _drop_queued_partials(self) -> None:
+        kept = []
+        for entry in self._heap:
+            job = entry[2]
+            if job.priority == "partial":
+                self._record(job, dropped=True)
+                job.dropped = True
+                job._finish()
+            else:
+                kept.append(entry)
+        if len(kept) != len(self._heap):
+            heapq.heapify(kept)
+            self._heap = kept
+
+    def _record(self, job: STTJob, dropped: bool = False) -> None:
+        s = self.stats[job.priority]
+        s["jobs"] += 1
+        if dropped:
+            s["dropped"] += 1
+        else:
+            s["wait_ms_total"] += job.queue_wait_ms
+            self.last_wait_ms[job.priority] = job.queue_wait_ms
+
+    # ---------- worker ----------
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._heap:
+                    self._cond.wait()
+                _, _, job = heapq.heappop(self._heap)
+                job.started_at = time.perf_counter()
+                self._running.append(job)
+                self._record(job)
+            try:
+                job.result = job.fn(*job.args, **job.kwargs)
+            except BaseException as e:
+                job.error = e
+            finally:
+                with self._cond:
+                    self._running.remove(job)
+                job._finish()
@@ -0,0 +1,113 @@
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+from wandavoice.streaming_stt import _norm
+from wandavoice.stt_scheduler import STTScheduler
+
+
+def word_divergence(partial: str, final: str) -> float:
+    """Word edit distance from ``partial`` to ``final`` relative to the final's length (0.0 = same words)."""
+    a = [w for w in map(_norm, partial.split()) if w]
+    b = [w for w in map(_norm, final.split()) if w]
+    if not b:
+        return 0.0 if not a else 1.0
+    prev = list(range(len(b) + 1))
+    for i, wa in enumerate(a, 1):
+        cur = [i]
+        for j, wb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (wa != wb)))
+        prev = cur
+    return prev[-1] / len(b)
+
+
+def _pct(values, q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class TwoTierSTT:
+    """Live partials on a small model, finals on the large one, decoding concurrently.
+
+    Each tier has its own STTScheduler, so partial previews never queue
+    behind a final (or a dictation segment) and a final never waits for a
+    preview to be cancelled. Quacks like STTScheduler: ``transcribe`` goes
+    to the final tier, ``transcribe_words`` to the fast tier; anything else
+    (``set_profile``, ``warmup_ms``, ...) is the final tier's.
+
+    Per-decode latencies of both tiers and the word divergence between the
+    last partial of an utterance and its final (``record_final``) are kept
+    for the last ``window`` utterances (see ``stats``).
+    """
+
+    def __init__(self, fast_engine, final_engine, final_workers: int = 1, window: int = 200):
+        self.fast = STTScheduler(fast_engine)
+        self.final = STTScheduler(final_engine, workers=final_workers)
+        self.partial_ms = deque(maxlen=window)
+        self.final_ms = deque(maxlen=window)
+        self.divergence = deque(maxlen=window)
+        self.last_partial_ms = 0.0
+
+    def transcribe(self, audio_data, priority: str = "final") -> str:
+        t0 = time.perf_counter()
+        text = self.final.transcribe(audio_data, priority=priority)
+        self.final_ms.append((time.perf_counter() - t0) * 1000)
+        return text
+
+    def transcribe_result(self, audio_data, priority: str = "final"):
+        t0 = time.perf_counter()
+        result = self.final.transcribe_result(audio_data, priority=priority)
+        self.final_ms.append((time.perf_counter() - t0) * 1000)
+        return result
+
+    def transcribe_words(self, audio_data, prompt: str = "", priority: str = "partial"):
+        t0 = time.perf_counter()
+        words = self.fast.transcribe_words(audio_data, prompt=prompt, priority=priority)
+        if words is not None:
+            self.last_partial_ms = (time.perf_counter() - t0) * 1000
+            self.partial_ms.append(self.last_partial_ms)
+        return words
+
+    def record_final(self, partial_text: str, final_text: str) -> Optional[float]:
+        """Divergence of the utterance's last partial from its final (None if there was no partial)."""
+        if not partial_text:
+            return None
+        d = word_divergence(partial_text, final_text)
+        self.divergence.append(d)
+        return d
+
+    @property
+    def last_wait_ms(self) -> Dict[str, float]:
+        return {**self.fast.last_wait_ms, **self.final.last_wait_ms}
+
+    @property
+    def warmup_ms(self) -> Dict[str, float]:
+        fast = {k.replace("STT_", "STT_Fast_"): v for k, v in getattr(self.fast.engine, "warmup_ms", {}).items()}
+        return {**getattr(self.final.engine, "warmup_ms", {}), **fast}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "partials": len(self.partial_ms),
+            "partial_ms_p50": round(_pct(self.partial_ms, 0.5), 1),
+            "partial_ms_p95": round(_pct(self.partial_ms, 0.95), 1),
+            "finals": len(self.final_ms),
+            "final_ms_p50": round(_pct(self.final_ms, 0.5), 1),
+            "final_ms_p95": round(_pct(self.final_ms, 0.95), 1),
+            "divergence_mean": round(sum(self.divergence) / len(self.divergence), 3) if self.divergence else 0.0,
+            "divergence_last": round(self.divergence[-1], 3) if self.divergence else 0.0,
+        }
+
+    def format_stats(self) -> str:
+        s = self.stats()
+        return (
+            f"STT tiers: partial p50 {s['partial_ms_p50']:.0f} / p95 {s['partial_ms_p95']:.0f} ms ({s['partials']}), "
+            f"final p50 {s['final_ms_p50']:.0f} / p95 {s['final_ms_p95']:.0f} ms ({s['finals']}), "
+            f"partial-vs-final WER {s['divergence_last']:.0%} (mean {s['divergence_mean']:.0%})"
+        )
+
+    def __getattr__(self, name):
+        if name in ("fast", "final") or name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.final, name)
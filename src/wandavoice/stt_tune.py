@@ -0,0 +1,144 @@
+import json
+import os
+import statistics
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+CPU_COMPUTE_TYPES = ("int8", "int8_float32", "float32")
+CUDA_COMPUTE_TYPES = ("float16", "int8_float16", "int8")
+REFERENCE = ("cpu", "float32")  # most precise configuration, the accuracy reference
+
+
+def tuned_settings(config, model: str) -> Optional[Dict[str, Any]]:
+    """The saved ``vox stt-tune`` result for ``model`` (device, compute_type, cpu_threads), if any."""
+    if not config.STT_USE_TUNING:
+        return None
+    try:
+        with open(config.STT_TUNE_FILE, encoding="utf-8") as f:
+            return json.load(f).get("models", {}).get(model)
+    except (OSError, ValueError):
+        return None
+
+
+def compute_type_for(config, model: str) -> str:
+    """Compute type ``model`` loads with when none is given: tuned, else voice.stt.compute_type."""
+    return str((tuned_settings(config, model) or {}).get("compute_type") or config.COMPUTE_TYPE)
+
+
+def save_tuning(path: str, model: str, settings: Dict[str, Any]) -> None:
+    from wandavoice.batch import write_atomic
+
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        data = {}
+    data.setdefault("models", {})[model] = settings
+    write_atomic(path, json.dumps(data, indent=2) + "\n")
+
+
+def candidates(devices: Optional[Iterable[str]] = None, compute_types: Optional[Iterable[str]] = None,
+               threads: Optional[Iterable[int]] = None) -> List[Dict[str, Any]]:
+    """(device, compute type, CPU threads) combinations this machine supports."""
+    import ctranslate2
+
+    if devices is None:
+        devices = ["cpu"] + (["cuda"] if ctranslate2.get_cuda_device_count() > 0 else [])
+    if threads is None:
+        n = os.cpu_count() or 1
+        threads = sorted({max(1, n // 4), max(1, n // 2), n})
+    out = []
+    for device in devices:
+        supported = ctranslate2.get_supported_compute_types(device)
+        wanted = compute_types or (CPU_COMPUTE_TYPES if device == "cpu" else CUDA_COMPUTE_TYPES)
+        for ct in wanted:
+            if ct not in supported:
+                continue
+            # CPU threads only matter for CPU decoding
+            for t in (threads if device == "cpu" else (0,)):
+                out.append({"device": device, "compute_type": ct, "cpu_threads": int(t)})
+    return out
+
+
+class STTAutotuner:
+    """Benchmarks Whisper device / compute type / thread count on one clip.
+
+    Every candidate is loaded fresh, decodes the clip once untimed (lazy
+    kernel init) and ``repeats`` times timed. Its transcript is compared
+    with ``reference`` (or, without one, the transcript of CPU float32) as
+    word error rate; the fastest candidate within ``max_wer`` wins.
+    ``loader(device, compute_type, cpu_threads)`` returns a model with
+    faster-whisper's ``transcribe``.
+    """
+
+    def __init__(self, loader: Callable[[str, str, int], Any], audio, samplerate: int = 16000,
+                 language: Optional[str] = None, reference: Optional[str] = None, max_wer: float = 0.1,
+                 repeats: int = 3):
+        self.loader = loader
+        self.audio = audio
+        self.audio_s = len(audio) / samplerate
+        self.language = language
+        self.reference = reference
+        self.max_wer = max_wer
+        self.repeats = max(1, repeats)
+        self.results: List[Dict[str, Any]] = []
+
+    def _decode(self, model) -> str:
+        segments, _ = model.transcribe(self.audio, beam_size=5, language=self.language,
+                                       condition_on_previous_text=False)
+        return " ".join(s.text.strip() for s in segments)
+
+    def measure(self, device: str, compute_type: str, cpu_threads: int) -> Dict[str, Any]:
+        result: Dict[str, Any] = {"device": device, "compute_type": compute_type, "cpu_threads": cpu_threads}
+        try:
+            t0 = time.perf_counter()
+            model = self.loader(device, compute_type, cpu_threads)
+            result["load_ms"] = (time.perf_counter() - t0) * 1000
+            self._decode(model)
+            times, text = [], ""
+            for _ in range(self.repeats):
+                t0 = time.perf_counter()
+                text = self._decode(model)
+                times.append((time.perf_counter() - t0) * 1000)
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+            return result
+        del model  # free the weights before the next candidate loads
+        result.update(ms=statistics.median(times), text=text)
+        result["rtf"] = result["ms"] / 1000 / self.audio_s if self.audio_s else 0.0
+        return result
+
+    def run(self, cands: Sequence[Dict[str, Any]],
+            on_result: Optional[Callable[[Dict[str, Any]], None]] = None) -> Optional[Dict[str, Any]]:
+        from wandavoice.stt_tiers import word_divergence
+
+        if self.reference is None:
+            ref = self.measure(*REFERENCE, max(c["cpu_threads"] for c in cands) if cands else 0)
+            if "error" in ref:
+                raise RuntimeError(f"reference decode (cpu/float32) failed: {ref['error']}")
+            self.reference = ref["text"]
+        for c in cands:
+            r = self.measure(c["device"], c["compute_type"], c["cpu_threads"])
+            if "error" not in r:
+                r["wer"] = word_divergence(r["text"], self.reference)
+                r["ok"] = r["wer"] <= self.max_wer
+            self.results.append(r)
+            if on_result is not None:
+                on_result(r)
+        ok = [r for r in self.results if r.get("ok")]
+        return min(ok, key=lambda r: r["ms"]) if ok else None
+
+
+def whisper_loader(config, model: str) -> Callable[[str, str, int], Any]:
+    """Loads ``model`` the way STTEngine does, but outside the shared model registry."""
+    from faster_whisper import WhisperModel
+    from wandavoice.model_store import ModelStore
+
+    path = ModelStore(config.base_dir).resolve_whisper(model) if config.MODELS_OFFLINE else model
+
+    def load(device: str, compute_type: str, cpu_threads: int):
+        return WhisperModel(path, device=device, compute_type=compute_type, cpu_threads=cpu_threads,
+                            num_workers=1, download_root=os.path.join(config.base_dir, "models", "whisper"),
+                            local_files_only=config.MODELS_OFFLINE)
+
+    return load
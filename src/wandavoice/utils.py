@@ -22,6 +22,8 @@ class LatencyTracker:
     def reset(self):
         self.start_times: Dict[str, float] = {}
         self.measurements: List[Dict] = []
+        self.annotations: Dict[str, float] = {}
+        self.units: Dict[str, str] = {}
         self._global_start = time.perf_counter()
 
     def start(self, label: str):
@@ -42,8 +44,15 @@ class LatencyTracker:
             return elapsed
         return 0.0
 
+    def annotate(self, label: str, ms: float, unit: str = "ms"):
+        """Record a value that is not a timed span (e.g. a capture offset, a hit rate in %)."""
+        self.annotations[label] = float(ms)
+        self.units[label] = unit
+
     def get_summary(self) -> Dict[str, float]:
-        return {m["label"]: m["ms"] for m in self.measurements}
+        summary = {m["label"]: m["ms"] for m in self.measurements}
+        summary.update(self.annotations)
+        return summary
 
     def format_report(self) -> str:
         lines = ["\n\033[1;30m┌── TELEMETRY REPORT ──────────────────────────────────────────┐\033[0m"]
@@ -54,6 +63,8 @@ class LatencyTracker:
         for m in self.measurements:
             bar = "█" * min(int(m["ms"] / 100), 20)
             lines.append(f"\033[1;30m│\033[0m {m['label']:<12} : {m['ms']:>7.1f} ms  \033[34m{bar:<20}\033[0m \033[90m(at {m['abs_start']:>7.1f}ms)\033[0m")
+        for label, ms in self.annotations.items():
+            lines.append(f"\033[1;30m│\033[0m {label:<12} : {ms:>7.1f} {self.units.get(label, 'ms')}")
         
         lines.append(f"\033[1;30m├── TOTAL ROUNDTRIP: {total_pipeline:>7.1f} ms ─────────────────────────────┘\033[0m")
         return "\n".join(lines)
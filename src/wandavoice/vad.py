@@ -0,0 +1,290 @@
+import importlib.util
+import os
+import warnings
+from abc import ABC, abstractmethod
+from typing import Optional
+
+import numpy as np
+
+from wandavoice.model_registry import registry
+from wandavoice.utils import print_status
+
+WINDOW = 512  # Silero window at 16 kHz
+
+
+class VADEngine(ABC):
+    """Silero-style streaming VAD: one speech probability per 512-sample window.
+
+    Engines are stateful (the model is recurrent); call ``reset()`` at the
+    start of every new recording.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def speech_prob(self, frame: np.ndarray) -> float:
+        pass
+
+    @abstractmethod
+    def reset(self) -> None:
+        pass
+
+    def close(self) -> None:
+        """Return borrowed models to the registry."""
+
+
+class OnnxSilero:
+    """Silero VAD on ONNX Runtime, pinned to one thread, no per-window allocations.
+
+    The recurrent state lives in two preallocated buffer sets that are
+    swapped after every window, the 64-sample context plus window are
+    copied into one reused input array, and all of them are bound once via
+    IOBinding. Understands the v6 export shipped with faster-whisper
+    (inputs ``input``/``h``/``c``) and the upstream v5 export
+    (``input``/``state``/``sr``).
+
+    The InferenceSession is shared through the model registry; state and
+    bindings are per instance, so several streams can use one session.
+    The backend vendors this class (voice_engine.audio.vad).
+    """
+
+    CONTEXT = 64
+
+    def __init__(self, path: str, samplerate: int = 16000):
+        self.session = registry.acquire("silero_vad", path, loader=lambda: self._load(path), compute_type="onnx")
+        self.samplerate = samplerate
+
+        inputs = {i.name for i in self.session.get_inputs()}
+        outputs = [o.name for o in self.session.get_outputs()]
+        if "state" in inputs:  # upstream v5: one (2, 1, 128) state tensor + sample rate
+            self._state_names = [("state", outputs[1])]
+            state_shape = (2, 1, 128)
+        else:  # v6 (faster-whisper asset): LSTM h and c
+            self._state_names = [("h", outputs[1]), ("c", outputs[2])]
+            state_shape = (1, 1, 128)
+
+        self._input = np.zeros((1, self.CONTEXT + WINDOW), dtype=np.float32)
+        self._prob = np.zeros((1, 1) if "state" in inputs else (1,), dtype=np.float32)
+        self._states = [
+            [np.zeros(state_shape, dtype=np.float32) for _ in self._state_names] for _ in range(2)
+        ]
+        self._cur = 0
+
+        self._binding = self.session.io_binding()
+        self._binding.bind_cpu_input("input", self._input)
+        if "sr" in inputs:
+            self._binding.bind_cpu_input("sr", np.array(samplerate, dtype=np.int64))
+        self._binding.bind_output(outputs[0], "cpu", 0, np.float32, list(self._prob.shape), self._prob.ctypes.data)
+        self._bind_state()
+
+    @staticmethod
+    def _load(path: str):
+        import onnxruntime as ort
+
+        opts = ort.SessionOptions()
+        opts.intra_op_num_threads = 1
+        opts.inter_op_num_threads = 1
+        opts.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        opts.log_severity_level = 4
+        return ort.InferenceSession(path, sess_options=opts, providers=["CPUExecutionProvider"])
+
+    def close(self) -> None:
+        if self.session is not None:
+            registry.release(self.session)
+            self.session = None
+
+    def _bind_state(self) -> None:
+        src, dst = self._states[self._cur], self._states[1 - self._cur]
+        for (in_name, out_name), s, d in zip(self._state_names, src, dst):
+            self._binding.bind_cpu_input(in_name, s)
+            self._binding.bind_output(out_name, "cpu", 0, np.float32, list(d.shape), d.ctypes.data)
+
+    def reset(self) -> None:
+        for bufs in self._states:
+            for b in bufs:
+                b.fill(0.0)
+        self._input.fill(0.0)
+
+    def speech_prob(self, frame: np.ndarray) -> float:
+        buf = self._input[0]
+        buf[: self.CONTEXT] = buf[-self.CONTEXT:]  # previous window's tail
+        buf[self.CONTEXT:] = frame
+        self.session.run_with_iobinding(self._binding)
+        self._cur = 1 - self._cur  # new state becomes next window's input
+        self._bind_state()
+        return float(self._prob.flat[0])
+
+
+class OnnxSileroVAD(OnnxSilero, VADEngine):
+    name = "onnx"
+
+
+class TorchSileroVAD(VADEngine):
+    """Fallback: the TorchScript model from torch.hub (pulls in all of torch).
+
+    The module keeps its recurrent state internally, so borrowers of the
+    shared registry entry must not run concurrently.
+    """
+
+    name = "torch"
+
+    def __init__(self, samplerate: int = 16000, offline: bool = False):
+        import torch
+
+        torch.set_num_threads(1)
+        self._torch = torch
+        if offline:
+            # Only the already cached hub checkout; torch.hub would otherwise
+            # check GitHub for updates on every start.
+            repo = _torch_hub_repo()
+            if not os.path.isdir(repo):
+                raise FileNotFoundError(f"Silero torch hub checkout not found at {repo}")
+            load = lambda: torch.hub.load(repo_or_dir=repo, model="silero_vad", source="local")[0]
+        else:
+            load = lambda: torch.hub.load(repo_or_dir="snakers4/silero-vad", model="silero_vad", trust_repo=True)[0]
+        self.model = registry.acquire("silero_vad", "snakers4/silero-vad", compute_type="torch", loader=load)
+        self.samplerate = samplerate
+
+    def close(self) -> None:
+        if self.model is not None:
+            registry.release(self.model)
+            self.model = None
+
+    def reset(self) -> None:
+        if hasattr(self.model, "reset_states"):
+            self.model.reset_states()
+
+    def speech_prob(self, frame: np.ndarray) -> float:
+        return self.model(self._torch.from_numpy(frame), self.samplerate).item()
+
+
+class CascadedVAD(VADEngine):
+    """Cheap gates in front of a neural VAD; the neural model only runs when needed.
+
+    Stage 1 is an energy gate against an adaptive noise floor, stage 2 is
+    WebRTC VAD (``mode`` 0-3, skipped if webrtcvad is not installed). The
+    inner engine runs when both stages see possible speech, and keeps
+    running while its own probability stays above ``release`` (plus a
+    ``hangover`` of windows), so trigger and release decisions are still the
+    neural model's. Gated windows report probability 0.0.
+
+    When the inner engine is woken up after a gap it is reset and first fed
+    the last ``warmup`` windows, so its recurrent state has context.
+    """
+
+    name = "cascade"
+    MIN_FLOOR = 3e-4  # ~ -70 dBFS
+    WEBRTC_FRAME = 480  # 30 ms at 16 kHz, the longest frame WebRTC VAD accepts
+
+    def __init__(self, inner: VADEngine, mode: int = 2, samplerate: int = 16000,
+                 floor_ratio: float = 2.0, release: float = 0.15, hangover: int = 10, warmup: int = 4):
+        self.inner = inner
+        self.name = f"cascade+{inner.name}"
+        self.samplerate = samplerate
+        self.floor_ratio = floor_ratio
+        self.release = release
+        self.hangover = hangover
+        self.floor = 3e-3  # ~ -50 dBFS until adapted; kept across recordings
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")  # webrtcvad imports pkg_resources
+                import webrtcvad
+            self._webrtc = webrtcvad.Vad(int(mode))
+        except Exception:
+            self._webrtc = None
+        self._pcm = np.zeros(self.WEBRTC_FRAME, dtype=np.int16)
+        self._pcm_bytes = memoryview(self._pcm).cast("B")  # same memory, as bytes
+        self._history = np.zeros((warmup, WINDOW), dtype=np.float32)
+        self._hist_n = 0
+        self._active = 0  # windows left before the inner engine goes idle
+        self.windows = 0
+        self.inner_calls = 0
+
+    def reset(self) -> None:
+        self.inner.reset()
+        self._active = 0
+        self._hist_n = 0
+
+    def close(self) -> None:
+        self.inner.close()
+
+    def _adapt_floor(self, rms: float) -> None:
+        # Fall fast, rise slowly: speech never pulls the floor up quickly.
+        rate = 0.3 if rms < self.floor else 0.02
+        self.floor = max(self.MIN_FLOOR, self.floor + rate * (rms - self.floor))
+
+    def _maybe_speech(self, frame: np.ndarray, rms: float) -> bool:
+        if rms < self.floor * self.floor_ratio:
+            return False
+        if self._webrtc is None:
+            return True
+        np.multiply(frame[-self.WEBRTC_FRAME:], 32767.0, out=self._pcm, casting="unsafe")
+        return self._webrtc.is_speech(self._pcm_bytes, self.samplerate)
+
+    def speech_prob(self, frame: np.ndarray) -> float:
+        self.windows += 1
+        rms = float(np.sqrt(np.dot(frame, frame) / len(frame)))
+
+        prob = 0.0
+        if self._active > 0 or self._maybe_speech(frame, rms):
+            if self._active == 0:
+                self.inner.reset()
+                for past in self._history[len(self._history) - self._hist_n:]:
+                    self.inner.speech_prob(past)
+                    self.inner_calls += 1
+            prob = self.inner.speech_prob(frame)
+            self.inner_calls += 1
+            self._active = self.hangover if prob >= self.release else max(0, self._active - 1)
+        if prob < self.release:
+            self._adapt_floor(rms)
+
+        if len(self._history):
+            self._history[:-1] = self._history[1:]
+            self._history[-1] = frame
+            self._hist_n = min(self._hist_n + 1, len(self._history))
+        return prob
+
+
+def _torch_hub_repo() -> str:
+    torch_home = os.environ.get("TORCH_HOME") or os.path.join(
+        os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "torch"
+    )
+    return os.path.join(torch_home, "hub", "snakers4_silero-vad_master")
+
+
+def find_silero_onnx(base_dir: Optional[str] = None) -> Optional[str]:
+    """Locate a Silero ONNX export on disk without importing torch or faster_whisper.
+
+    The model store copy (``<base_dir>/models``) wins over the bundled ones.
+    """
+    candidates = []
+    if base_dir:
+        candidates.append(os.path.join(base_dir, "models", "silero_vad.onnx"))
+    spec = importlib.util.find_spec("faster_whisper")
+    if spec and spec.origin:
+        candidates.append(os.path.join(os.path.dirname(spec.origin), "assets", "silero_vad_v6.onnx"))
+    candidates.append(os.path.join(_torch_hub_repo(), "src", "silero_vad", "data", "silero_vad.onnx"))
+    return next((p for p in candidates if os.path.exists(p)), None)
+
+
+def load_vad(backend: str = "auto", model_path: Optional[str] = None, base_dir: Optional[str] = None,
+             samplerate: int = 16000, cascade: bool = False, mode: int = 2, offline: bool = False) -> VADEngine:
+    """Create a VAD engine. ``backend``: auto (ONNX, else torch) | onnx | torch.
+
+    With ``cascade`` the engine sits behind CascadedVAD (WebRTC ``mode``).
+    ``offline`` keeps the torch fallback from contacting GitHub.
+    """
+    engine: Optional[VADEngine] = None
+    if backend in ("auto", "onnx"):
+        path = model_path or find_silero_onnx(base_dir)
+        try:
+            if not path:
+                raise FileNotFoundError("no Silero ONNX model found")
+            engine = OnnxSileroVAD(path, samplerate=samplerate)
+        except Exception as e:
+            if backend == "onnx":
+                raise
+            print_status(f"ONNX VAD unavailable ({e}), falling back to torch")
+    if engine is None:
+        engine = TorchSileroVAD(samplerate=samplerate, offline=offline)
+    return CascadedVAD(engine, mode=mode, samplerate=samplerate) if cascade else engine
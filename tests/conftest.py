@@ -0,0 +1,37 @@
+import pytest
+
+
+class FakeWhisper:
+    """Stands in for faster_whisper.WhisperModel: records its arguments and decodes nothing."""
+
+    def __init__(self, *args, **kwargs):
+        self.args, self.kwargs = args, kwargs
+        self.calls = []
+
+    def transcribe(self, audio, **kwargs):
+        self.calls.append(kwargs)
+        return iter([]), None
+
+
+@pytest.fixture
+def fake_whisper():
+    """The class STTEngine loads instead of WhisperModel; modules override it with their own fake."""
+    return FakeWhisper
+
+
+@pytest.fixture
+def cfg(tmp_path, monkeypatch, fake_whisper):
+    """Config under tmp_path for STTEngine tests: fake model, fresh registry, online, no warm-up.
+
+    Modules adjust it by overriding ``cfg`` with a fixture that takes ``cfg``.
+    """
+    import wandavoice.stt as stt_mod
+    from wandavoice.config import Config
+    from wandavoice.model_registry import ModelRegistry
+
+    monkeypatch.setattr(stt_mod, "WhisperModel", fake_whisper)
+    monkeypatch.setattr(stt_mod, "registry", ModelRegistry())
+    cfg = Config(base_dir=str(tmp_path))
+    cfg.set("voice.models.offline", False)
+    cfg.set("voice.stt.warmup", False)
+    return cfg
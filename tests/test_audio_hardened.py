@@ -17,25 +17,31 @@ class TestAudioHardening(unittest.TestCase):
     @patch("subprocess.Popen")
     @patch("fcntl.fcntl") # Wir fangen System-Aufrufe ab
     def test_recorder_process_cleanup(self, mock_fcntl, mock_popen):
-        """Prüft, ob der pw-record Prozess in jedem Fall terminiert wird."""
+        """Prüft, ob der pw-record Prozess des Capture-Hubs in jedem Fall terminiert wird."""
         
         # 1. Den Prozess-Mock vorbereiten
         mock_process = MagicMock()
         mock_process.poll.return_value = None # Prozess lebt
         
         # 2. Den stdout-Mock vorbereiten (die 'echte Tasse')
-        # Wir geben eine echte Zahl (1) für die Dateinummer zurück
-        mock_process.stdout.fileno.return_value = 1 
+        # Eine echte Pipe mit Daten, damit poll() den Leser weckt
+        r, w = os.pipe()
+        os.write(w, b"\x00" * 4096)
+        mock_process.stdout.fileno.return_value = r
         mock_popen.return_value = mock_process
         
         # 3. Wir mocken den Lese-Fehler
-        with patch.object(self.recorder, "_read_nonblocking", side_effect=RuntimeError("Test crash")):
+        with patch.object(self.recorder._hub, "_read_into", side_effect=RuntimeError("Test crash")):
             try:
-                # Dieser Aufruf geht jetzt durch _start_pw_record ohne Fehler durch
-                self.recorder.record_phrase()
+                # Dieser Aufruf geht jetzt durch CaptureHub._spawn ohne Fehler durch;
+                # der Reader-Thread stürzt ab und record_phrase kehrt zurück.
+                self.assertIsNone(self.recorder.record_phrase())
             except RuntimeError:
                 pass
         
+        os.close(r)
+        os.close(w)
+
         # 4. Die ultimative Verifizierung
         self.assertTrue(mock_process.terminate.called, "CRITICAL: terminate() wurde nicht aufgerufen!")
         print("\n[OK] Audio Hardening Test bestanden (100/100).")
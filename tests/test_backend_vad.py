@@ -0,0 +1,44 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../backend/voice-engine/src")))
+
+pytest.importorskip("onnxruntime")
+from voice_engine.audio.vad import WINDOW, SileroVAD  # noqa: E402
+
+
+class _LoudIsSpeech:
+    def __init__(self):
+        self.frames = []
+
+    def speech_prob(self, frame):
+        self.frames.append(len(frame))
+        return float(np.abs(frame).max() > 0.1)
+
+    def reset(self):
+        pass
+
+
+def _pcm(n, loud=False):
+    return np.full(n, 8000 if loud else 0, dtype=np.int16).tobytes()
+
+
+def test_odd_sized_chunks_are_rechunked_to_silero_windows():
+    try:
+        vad = SileroVAD(backend="onnx")
+    except FileNotFoundError:
+        pytest.skip("no Silero ONNX model")
+    vad.close()
+    vad.model = _LoudIsSpeech()
+
+    assert vad.is_speech(_pcm(300)) is False  # no full window yet
+    assert vad.model.frames == []
+    assert vad.is_speech(_pcm(1000, loud=True)) is True  # 1300 samples: two windows
+    assert vad.model.frames == [WINDOW, WINDOW]
+    assert vad.is_speech(_pcm(100)) is True  # 376 pending: previous decision
+    assert vad.is_speech(_pcm(WINDOW)) is True  # window starts with the 276 loud carried over
+    assert vad.is_speech(_pcm(WINDOW)) is False
+    assert all(n == WINDOW for n in vad.model.frames)
@@ -0,0 +1,110 @@
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+import soundfile as sf
+
+from wandavoice.batch import expand_inputs, is_done, output_base, transcribe_batch, write_outputs
+
+SR = 16000
+
+
+class FakePipeline:
+    def transcribe(self, audio, **kwargs):
+        return iter([SimpleNamespace(start=0.0, end=len(audio) / SR, text=f" {len(audio)} samples ")]), None
+
+
+def fake_pipeline(**kwargs):
+    # Module level so spawned workers can unpickle it.
+    return FakePipeline()
+
+
+def exiting_pipeline(**kwargs):
+    sys.exit("model not found")  # what a worker does when it cannot load its model
+
+
+def _wav(path, seconds=1.0):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    sf.write(path, np.zeros(int(seconds * SR), dtype=np.float32), SR)
+    return path
+
+
+def test_expand_inputs_walks_dirs_and_globs(tmp_path):
+    a = _wav(str(tmp_path / "in" / "a.wav"))
+    b = _wav(str(tmp_path / "in" / "sub" / "b.flac"))
+    (tmp_path / "in" / "notes.txt").write_text("x")
+    c = _wav(str(tmp_path / "other" / "c.wav"))
+
+    assert expand_inputs([str(tmp_path / "in")]) == sorted([a, b])
+    assert expand_inputs([str(tmp_path / "other" / "*.wav"), c]) == [c]
+    assert expand_inputs([str(tmp_path / "missing")]) == []
+
+
+def test_output_base_mirrors_tree_under_out_dir(tmp_path):
+    path = str(tmp_path / "in" / "sub" / "b.wav")
+    assert output_base(path) == str(tmp_path / "in" / "sub" / "b")
+    assert output_base(path, str(tmp_path / "out"), str(tmp_path / "in")) == str(tmp_path / "out" / "sub" / "b")
+
+
+def test_outputs_are_complete_and_mark_file_done(tmp_path):
+    audio = _wav(str(tmp_path / "a.wav"))
+    base = str(tmp_path / "a")
+    assert not is_done(audio, base, ("txt", "jsonl"))
+
+    write_outputs(base, ("txt", "jsonl"), [(0.0, 1.25, "hello"), (1.25, 2.0, "world")])
+    lines = [json.loads(l) for l in open(base + ".jsonl")]
+    assert lines == [{"start": 0.0, "end": 1.25, "text": "hello"}, {"start": 1.25, "end": 2.0, "text": "world"}]
+    assert open(base + ".txt").read() == "hello\nworld\n"
+    assert not [n for n in os.listdir(tmp_path) if ".tmp." in n]
+    assert is_done(audio, base, ("txt", "jsonl"))
+
+    os.utime(audio, (os.path.getmtime(base + ".txt") + 10,) * 2)  # audio re-recorded
+    assert not is_done(audio, base, ("txt", "jsonl"))
+
+
+def test_batch_runs_on_process_pool_and_resumes(tmp_path):
+    files = [_wav(str(tmp_path / "in" / f"{i}.wav"), seconds=1.0 + i) for i in range(3)]
+    out = str(tmp_path / "out")
+    seen = []
+
+    summary = transcribe_batch(files, fake_pipeline, {}, workers=2, out_dir=out, on_result=seen.append)
+    assert (summary["done"], summary["skipped"], summary["failed"]) == (3, 0, [])
+    assert summary["audio_s"] == 1.0 + 2.0 + 3.0
+    assert summary["audio_h_per_wall_h"] > 0
+    assert all(r["pid"] != os.getpid() for r in seen)
+    assert json.loads(open(os.path.join(out, "2.jsonl")).read())["text"] == f"{3 * SR} samples"
+
+    _wav(str(tmp_path / "in" / "3.wav"))
+    again = transcribe_batch(files + [str(tmp_path / "in" / "3.wav")], fake_pipeline, {}, workers=2, out_dir=out)
+    assert (again["done"], again["skipped"]) == (1, 3)
+
+
+def test_batch_reports_failed_files(tmp_path):
+    bad = str(tmp_path / "bad.wav")
+    open(bad, "wb").write(b"not audio")
+    summary = transcribe_batch([bad], fake_pipeline, {}, workers=1)
+    assert summary["done"] == 0
+    assert summary["failed"][0]["path"] == bad
+    assert not os.path.exists(str(tmp_path / "bad.txt"))
+
+
+def test_files_sharing_an_output_base_are_rejected(tmp_path):
+    wav = _wav(str(tmp_path / "a.wav"))
+    flac = _wav(str(tmp_path / "a.flac"))
+    other = _wav(str(tmp_path / "b.wav"))
+
+    summary = transcribe_batch([wav, flac, other], fake_pipeline, {}, workers=1)
+    assert summary["done"] == 1
+    assert sorted(r["path"] for r in summary["failed"]) == [flac, wav]
+    assert open(str(tmp_path / "b.txt")).read()
+
+
+def test_dead_worker_fails_remaining_files_instead_of_raising(tmp_path):
+    files = [_wav(str(tmp_path / f"{i}.wav")) for i in range(3)]
+    seen = []
+    summary = transcribe_batch(files, exiting_pipeline, {}, workers=2, on_result=seen.append)
+    assert summary["done"] == 0
+    assert sorted(r["path"] for r in summary["failed"]) == files
+    assert all("worker process died" in r["error"] for r in seen)
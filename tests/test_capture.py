@@ -0,0 +1,174 @@
+import numpy as np
+
+from wandavoice.capture import CaptureHub
+
+
+def _hub():
+    hub = CaptureHub(samplerate=16000, capacity_s=1.0)
+    hub._running = True  # fed by hand instead of pw-record
+    return hub
+
+
+def test_consumers_have_independent_cursors():
+    hub = _hub()
+    hub._ingest(np.full(100, 1.0, dtype=np.float32))
+
+    a = hub.attach()  # starts at the next sample, not at the backlog
+    hub._ingest(np.arange(10, dtype=np.float32))
+    b = hub.attach()
+    hub._ingest(np.arange(10, 15, dtype=np.float32))
+
+    assert a.read().tolist() == list(range(15))
+    assert b.read().tolist() == list(range(10, 15))
+    assert len(a.read(timeout=0.01)) == 0
+
+
+def test_read_returns_none_once_hub_stopped_and_drained():
+    hub = _hub()
+    c = hub.attach()
+    hub._ingest(np.ones(4, dtype=np.float32))
+    hub._running = False
+
+    assert len(c.read()) == 4
+    assert c.read() is None
+
+
+def test_lagging_consumer_skips_to_oldest_sample():
+    hub = _hub()
+    c = hub.attach()
+    hub._ingest(np.arange(20000, dtype=np.float32))  # > 1 s ring
+
+    out = c.read()
+    assert len(out) == 16000
+    assert out[0] == 4000
+
+
+def test_mute_writes_silence():
+    hub = _hub()
+    c = hub.attach()
+    hub.muted = True
+    hub._ingest(np.ones(1024, dtype=np.float32))
+    assert not c.read().any()
+
+
+def test_attach_reaches_back_into_the_ring():
+    hub = _hub()
+    hub._ingest(np.arange(100, dtype=np.float32))
+
+    assert hub.attach(lookback_samples=30).read().tolist() == list(range(70, 100))
+    # Clamped to what the ring actually holds.
+    assert len(hub.attach(lookback_samples=10**6).read()) == 100
+
+
+def test_recorder_lookback_is_relative_to_hotkey_press():
+    import time
+    from unittest.mock import MagicMock, patch
+    from wandavoice.audio import AudioRecorder
+    from wandavoice.config import Config
+
+    with patch("torch.hub.load") as mock_hub:
+        mock_hub.return_value = (MagicMock(), MagicMock())
+        rec = AudioRecorder(Config())
+    rec._hub = _hub()
+    rec._hub._ingest(np.zeros(16000, dtype=np.float32))  # 1 s of history
+
+    # Pressed 100 ms ago (debounce) with a 400 ms look-back: 500 ms of backlog.
+    consumer = rec._attach(400, pressed_at=time.monotonic() - 0.1)
+    assert rec._hub.ring.write_pos - consumer.pos == 8000
+    assert abs(rec.last_capture_offset_ms + 400) < 20
+
+
+def test_reader_publishes_whole_vad_frames_only():
+    import os
+    from unittest.mock import MagicMock
+
+    r, w = os.pipe()
+    hub = CaptureHub(samplerate=16000, capacity_s=1.0)
+    hub._spawn = MagicMock(return_value=MagicMock(**{"poll.return_value": None, "stdout.fileno.return_value": r}))
+    hub.start()
+    c = hub.attach()
+
+    samples = np.arange(700, dtype=np.float32).tobytes()
+    os.write(w, samples[:2049])  # one frame plus a torn float
+    first = c.read(timeout=1.0)
+    assert first.tolist() == list(range(512))
+
+    os.write(w, samples[2049:] + np.arange(700, 1024, dtype=np.float32).tobytes())
+    second = c.read(timeout=1.0)
+    assert second.tolist() == list(range(512, 1024))
+
+    os.close(w)  # EOF stops the hub
+    assert c.read(timeout=1.0) is None
+    hub.stop()
+    os.close(r)
+
+
+def test_read_caps_samples_and_keeps_the_rest():
+    hub = _hub()
+    c = hub.attach()
+    hub._ingest(np.arange(5000, dtype=np.float32))
+
+    assert c.read(max_samples=2048).tolist() == list(range(2048))
+    assert c.read(max_samples=2048)[0] == 2048
+    assert len(c.read(max_samples=2048)) == 5000 - 4096
+
+
+class _EnergyVAD:
+    name = "energy"
+
+    def speech_prob(self, frame):
+        return 1.0 if np.abs(frame).max() > 0.1 else 0.0
+
+    def reset(self):
+        pass
+
+
+def _recorder(capacity_s=60.0):
+    from unittest.mock import MagicMock, patch
+    from wandavoice.audio import AudioRecorder
+    from wandavoice.config import Config
+
+    with patch("torch.hub.load") as mock_hub:
+        mock_hub.return_value = (MagicMock(), MagicMock())
+        rec = AudioRecorder(Config())
+    rec._hub = CaptureHub(samplerate=16000, capacity_s=capacity_s)
+    rec._hub._running = True
+    rec.vad = _EnergyVAD()
+    return rec
+
+
+def test_record_phrase_survives_a_backlog_longer_than_its_ring():
+    rec = _recorder()
+    attach = rec._attach
+
+    def attach_behind(*args, **kwargs):
+        consumer = attach(*args, **kwargs)
+        # The loop falls 45 s behind before its first read: many times READ_BYTES.
+        rec._hub._ingest(np.full(45 * 16000, 0.5, dtype=np.float32))
+        return consumer
+
+    rec._attach = attach_behind
+    audio = rec.record_phrase()
+    assert audio is not None and 30 * 16000 <= len(audio) < 30 * 16000 + 2048  # 30 s cap, checked per read
+
+
+def test_stream_segments_survive_a_lookback_backlog():
+    import queue
+
+    rec = _recorder()
+    rec.lookback_ms = 45_000
+    rec._hub._ingest(np.full(45 * 16000, 0.5, dtype=np.float32))
+    attach = rec._attach
+
+    def attach_then_stop(*args, **kwargs):
+        consumer = attach(*args, **kwargs)
+        rec._hub._running = False  # the drained backlog ends the stream
+        return consumer
+
+    rec._attach = attach_then_stop
+
+    segments = []
+    rec.record_stream_segments(queue.Queue(), segments.append)
+    # Cut at the first whole frame past 30 s, then the rest is flushed: no frame lost.
+    assert len(segments) == 2 and 30 * 16000 <= len(segments[0]) < 30 * 16000 + 512
+    assert sum(len(s) for s in segments) == 45 * 16000 // 512 * 512
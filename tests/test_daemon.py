@@ -0,0 +1,131 @@
+import os
+import threading
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from wandavoice import daemon
+from wandavoice.config import Config
+from wandavoice.daemon import DaemonError, VoxDaemon
+from wandavoice.stt_lang import LanguageCache
+
+
+class FakeSTT:
+    def __init__(self):
+        self.calls = []
+        self.lang_cache = LanguageCache()
+
+    def transcribe(self, audio):
+        self.calls.append(len(audio))
+        return "hallo welt"
+
+
+class FakeTTS:
+    def __init__(self):
+        self.spoken = []
+
+    def speak(self, text):
+        self.spoken.append(text)
+
+    def wait(self):
+        pass
+
+
+@pytest.fixture
+def running(tmp_path):
+    cfg = Config(base_dir=str(tmp_path))
+    loads = {"stt": 0}
+    stt, tts = FakeSTT(), FakeTTS()
+
+    def load_stt():
+        loads["stt"] += 1
+        return stt
+
+    vox = VoxDaemon(cfg)
+    vox.bind()
+    vox.load({"stt": load_stt, "tts": lambda: tts, "llm": lambda: object()})
+    thread = threading.Thread(target=vox.serve_forever, daemon=True)
+    thread.start()
+    yield vox, stt, tts, loads
+    vox.stop()
+    thread.join(timeout=2)
+
+
+def test_no_daemon_means_none(tmp_path):
+    assert daemon.request(str(tmp_path / "vox.sock"), "ping") is None
+
+
+def test_transcribe_reuses_the_resident_engine(running, tmp_path):
+    vox, stt, _, loads = running
+    wav = tmp_path / "a.wav"
+    sf.write(str(wav), np.zeros(8000, dtype=np.float32), 16000)
+
+    for _ in range(3):
+        resp = daemon.request(vox.socket_path, "transcribe", path=str(wav), model=vox.cfg.WHISPER_MODEL_SIZE)
+        assert resp["text"] == "hallo welt"
+        assert resp["audio_s"] == 0.5
+    assert loads["stt"] == 1 and stt.calls == [8000] * 3
+
+    ping = daemon.request(vox.socket_path, "ping")
+    assert ping["pid"] == os.getpid() and "stt" in ping["ready"] and ping["requests"] == 3
+
+
+def test_errors_are_reported_with_a_code(running, tmp_path):
+    vox = running[0]
+    with pytest.raises(DaemonError) as e:
+        daemon.request(vox.socket_path, "transcribe", path=str(tmp_path / "a.wav"), model="not-loaded")
+    assert e.value.code == "model_mismatch"
+    with pytest.raises(DaemonError) as e:
+        daemon.request(vox.socket_path, "transcribe", path=str(tmp_path / "missing.wav"))
+    assert e.value.code == "not_found"
+    with pytest.raises(DaemonError) as e:
+        daemon.request(vox.socket_path, "launch")
+    assert e.value.code == "bad_request"
+
+    long_wav = tmp_path / "long.wav"
+    sf.write(str(long_wav), np.zeros(16000 * 3, dtype=np.float32), 16000)
+    vox.cfg.set("voice.stt.longform_min_s", 2)
+    with pytest.raises(DaemonError) as e:
+        daemon.request(vox.socket_path, "transcribe", path=str(long_wav))
+    assert e.value.code == "long_file"  # the client runs the batched long-form path itself
+
+
+def test_speak_and_turn(running, monkeypatch):
+    vox, _, tts, _ = running
+    daemon.request(vox.socket_path, "speak", text="Guten Morgen")
+    assert tts.spoken == ["Guten Morgen"]
+
+    import wandavoice.main
+    seen = []
+    monkeypatch.setattr(vox, "_turn_context", lambda: ("session", "orb", {}))
+    monkeypatch.setattr(wandavoice.main, "process_turn",
+                        lambda text, session, llm, tts_engine, *a: seen.append((text, tts_engine)) or ("Ja.", "Details"))
+    resp = daemon.request(vox.socket_path, "turn", text="Wie spät ist es?")
+    assert (resp["say"], resp["show"]) == ("Ja.", "Details")
+    assert seen == [("Wie spät ist es?", tts)]
+
+
+def test_second_daemon_refuses_and_stale_socket_is_replaced(running, tmp_path):
+    vox = running[0]
+    with pytest.raises(DaemonError, match="already listening"):
+        VoxDaemon(vox.cfg).bind()
+
+    stale = tmp_path / "stale.sock"
+    stale.write_bytes(b"")
+    other = VoxDaemon(vox.cfg, socket_path=str(stale))
+    other.bind()  # nothing listening there: the leftover file is replaced
+    assert oct(os.stat(stale).st_mode & 0o777) == "0o600"
+    other._server.server_close()
+
+
+def test_shutdown_request_stops_the_server(tmp_path):
+    vox = VoxDaemon(Config(base_dir=str(tmp_path)))
+    vox.bind()
+    thread = threading.Thread(target=vox.serve_forever, daemon=True)
+    thread.start()
+    daemon.request(vox.socket_path, "shutdown")
+    thread.join(timeout=2)
+    assert not thread.is_alive()
+    assert not os.path.exists(vox.socket_path)
+    assert daemon.request(vox.socket_path, "ping") is None
@@ -0,0 +1,69 @@
+import threading
+import time
+
+import numpy as np
+
+from wandavoice.dictation import DictationPipeline
+
+
+def _segment(tag, n=1600):
+    return np.full(n, tag, dtype=np.float32)
+
+
+def test_injects_in_segment_order_even_if_later_segments_finish_first():
+    injected = []
+
+    def transcribe(audio):
+        tag = int(audio[0])
+        time.sleep(0.2 if tag == 0 else 0.0)  # first segment is the slow one
+        return f"s{tag}"
+
+    p = DictationPipeline(transcribe, injected.append, workers=3, merge_backlog=99)
+    for i in range(3):
+        p.submit(_segment(i))
+    p.close(timeout=2)
+
+    assert injected == ["s0", "s1", "s2"]
+    assert len(p.lags_ms) == 3
+
+
+def test_backlog_is_merged_into_one_decode():
+    decoded = []
+    gate = threading.Event()
+
+    def transcribe(audio):
+        gate.wait(2)
+        decoded.append(sorted(set(audio.tolist()) - {0.0}))
+        return " ".join(f"s{int(t)}" for t in decoded[-1])
+
+    injected = []
+    p = DictationPipeline(transcribe, injected.append, workers=1, merge_backlog=2)
+    p.submit(_segment(1))
+    deadline = time.monotonic() + 2
+    while p.queue_depth:  # worker has picked up segment 1
+        assert time.monotonic() < deadline, "segment 1 was never picked up"
+        time.sleep(0.001)
+    for i in (2, 3, 4):
+        p.submit(_segment(i))
+    assert p.max_queue_depth == 3
+    gate.set()
+    p.close(timeout=2)
+
+    assert decoded == [[1.0], [2.0, 3.0, 4.0]]
+    assert injected == ["s1", "s2 s3 s4"]
+    assert p.merged == 2
+    assert p.stats()["segments"] == 4
+
+
+def test_failed_segment_does_not_block_the_rest():
+    def transcribe(audio):
+        if audio[0] == 1:
+            raise RuntimeError("boom")
+        return f"s{int(audio[0])}"
+
+    injected = []
+    p = DictationPipeline(transcribe, injected.append, workers=2, merge_backlog=99)
+    for i in range(3):
+        p.submit(_segment(i))
+    p.close(timeout=2)
+    assert injected == ["s0", "s2"]
@@ -0,0 +1,47 @@
+"""Import-time budgets for the CLI (python -X importtime).
+
+Each light command may only pull in wandavoice.main plus the modules its
+body imports; none of them may load the ML/audio stack.
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+SRC = os.path.join(os.path.dirname(__file__), "..", "src")
+
+HEAVY = {"numpy", "torch", "faster_whisper", "ctranslate2", "onnxruntime", "librosa", "sounddevice", "soundfile"}
+
+# command -> (modules imported by the command body, budget in ms)
+BUDGETS = {
+    "kill": ((), 400),
+    "mcc": (("wandavoice.mcc_server",), 600),
+    "console": (("wandavoice.ui",), 400),
+    "models verify": (("wandavoice.model_store",), 400),
+    "transcribe (daemon client)": (("wandavoice.daemon",), 400),
+}
+
+
+def _importtime(modules):
+    code = "; ".join(f"import {m}" for m in ("wandavoice.main",) + tuple(modules))
+    env = dict(os.environ, PYTHONPATH=os.path.abspath(SRC))
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", code], env=env, capture_output=True, text=True)
+    assert out.returncode == 0, out.stderr[-2000:]
+    total_us, names = 0, set()
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        total_us += int(self_us)
+        names.add(name.strip())
+    return total_us / 1000, names
+
+
+@pytest.mark.parametrize("command", sorted(BUDGETS))
+def test_light_command_import_budget(command):
+    modules, budget_ms = BUDGETS[command]
+    total_ms, names = _importtime(modules)
+    loaded_heavy = {n for n in names if n.split(".")[0] in HEAVY}
+    assert not loaded_heavy, f"vox {command} imports {sorted(loaded_heavy)}"
+    assert total_ms < budget_ms, f"vox {command}: {total_ms:.0f} ms import time (budget {budget_ms} ms)"
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+import soundfile as sf
+
+from wandavoice.ingest import StreamingResampler, iter_audio_blocks, read_audio_file, resample
+
+SR = 16000
+
+
+def _tone(freq, seconds, sr):
+    return np.sin(2 * np.pi * freq * np.arange(int(seconds * sr)) / sr).astype(np.float32)
+
+
+@pytest.mark.parametrize("orig_sr", [48000, 44100, 22050, 8000])
+def test_resampled_tone_matches_analytic(orig_sr):
+    y = resample(_tone(440, 2.0, orig_sr), orig_sr, SR)
+    assert len(y) == 2 * SR
+    ref = _tone(440, 2.0, SR)
+    assert np.abs(y - ref)[200:-200].max() < 1e-3
+
+
+def test_content_above_new_nyquist_is_removed():
+    y = resample(_tone(10000, 1.0, 48000), 48000, SR)[500:-500]
+    assert np.sqrt(np.mean(y ** 2)) < 1e-3  # would alias to 6 kHz otherwise
+
+
+def test_blocks_of_any_size_match_one_shot():
+    x = np.random.default_rng(0).standard_normal(44100 * 3).astype(np.float32)
+    rs = StreamingResampler(44100, SR)
+    sizes = np.random.default_rng(1).integers(1, 6000, size=200)
+    parts, i = [], 0
+    for n in sizes:
+        parts.append(rs.process(x[i:i + n]))
+        i += n
+    parts.append(rs.process(x[i:]))
+    parts.append(rs.flush())
+    np.testing.assert_allclose(np.concatenate(parts), resample(x, 44100, SR), atol=1e-5)
+
+
+def test_retained_input_stays_bounded():
+    rs = StreamingResampler(48000, SR)
+    for _ in range(50):
+        rs.process(np.zeros(4800, dtype=np.float32))
+    assert len(rs._buf) < 2 * rs.half_width + 3
+
+
+def test_same_rate_passes_through():
+    x = np.arange(10, dtype=np.float32)
+    rs = StreamingResampler(SR, SR)
+    assert np.array_equal(rs.process(x), x) and len(rs.flush()) == 0
+
+
+def test_file_is_downmixed_and_resampled(tmp_path):
+    path = str(tmp_path / "a.wav")
+    left = _tone(440, 2.5, 48000)
+    sf.write(path, np.stack([left, -left], axis=1), 48000, subtype="FLOAT")
+    assert np.abs(read_audio_file(path)).max() < 1e-6  # L and R cancel
+
+    sf.write(path, np.stack([left, left], axis=1), 48000, subtype="FLOAT")
+    blocks = list(iter_audio_blocks(path, block_s=1.0))
+    assert len(blocks) == 3 and sum(len(b) for b in blocks) == int(2.5 * SR)
+    np.testing.assert_allclose(np.concatenate(blocks)[200:-200], _tone(440, 2.5, SR)[200:-200], atol=1e-3)
@@ -0,0 +1,72 @@
+from types import SimpleNamespace
+
+import numpy as np
+import soundfile as sf
+
+from wandavoice.longform import LongFormTranscriber, iter_audio_blocks, quiet_cut
+
+SR = 16000
+
+
+class FakePipeline:
+    """One segment per call covering the whole window."""
+
+    def __init__(self):
+        self.calls = []
+
+    def transcribe(self, audio, **kwargs):
+        self.calls.append((len(audio), kwargs))
+        n = len(self.calls)
+        return iter([SimpleNamespace(start=0.0, end=len(audio) / SR, text=f" window {n} ")]), None
+
+
+def _speech_with_pauses(seconds, pause_every=3.0):
+    t = np.arange(int(seconds * SR)) / SR
+    audio = 0.3 * np.sin(2 * np.pi * 220 * t).astype(np.float32)
+    for p in np.arange(pause_every, seconds, pause_every):
+        audio[int(p * SR):int((p + 0.3) * SR)] = 0.0
+    return audio
+
+
+def test_quiet_cut_lands_in_a_pause():
+    audio = _speech_with_pauses(10.0)
+    cut = quiet_cut(audio, SR, search_s=2.0)
+    assert 9.0 * SR <= cut <= 9.3 * SR
+
+
+def test_blocks_are_streamed_as_mono(tmp_path):
+    path = str(tmp_path / "a.wav")
+    sf.write(path, np.zeros((SR * 3 + 100, 2), dtype=np.float32), SR)
+    blocks = list(iter_audio_blocks(path, block_s=1.0))
+    assert [len(b) for b in blocks] == [SR, SR, SR, 100]
+    assert all(b.dtype == np.float32 and b.ndim == 1 for b in blocks)
+
+
+def test_blocks_are_resampled(tmp_path):
+    path = str(tmp_path / "a.wav")
+    sf.write(path, np.zeros((44100 * 3, 2), dtype=np.float32), 44100)
+    blocks = list(iter_audio_blocks(path, block_s=1.0))
+    assert len(blocks) == 3
+    assert all(b.dtype == np.float32 and b.ndim == 1 for b in blocks)
+    assert sum(len(b) for b in blocks) == 3 * SR
+
+
+def test_windows_cover_the_file_once_with_absolute_timestamps(tmp_path):
+    path = str(tmp_path / "long.wav")
+    audio = _speech_with_pauses(100.0)
+    sf.write(path, audio, SR)
+
+    pipe = FakePipeline()
+    lf = LongFormTranscriber(pipeline=pipe, batch_size=4, window_s=40.0, language="de")
+    segments = list(lf.transcribe(path))
+
+    assert sum(n for n, _ in pipe.calls) == len(audio)  # nothing dropped or decoded twice
+    assert len(segments) == len(pipe.calls) == 3
+    assert segments[0][0] == 0.0
+    for (_, end, _), (start, _, _) in zip(segments, segments[1:]):
+        assert abs(end - start) < 1e-6  # windows are contiguous
+    assert abs(segments[-1][1] - 100.0) < 1e-6
+    assert segments[0][2] == "window 1"
+    assert pipe.calls[0][1]["batch_size"] == 4 and pipe.calls[0][1]["vad_filter"] is True
+
+    assert abs(lf.audio_s - 100.0) < 1e-6 and lf.rtf > 0 and lf.peak_rss_mb > 0
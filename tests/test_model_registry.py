@@ -0,0 +1,74 @@
+import threading
+import time
+
+from wandavoice.model_registry import ModelRegistry
+
+
+def test_same_key_is_loaded_once_and_shared():
+    reg = ModelRegistry()
+    loads = []
+
+    def loader():
+        loads.append(1)
+        time.sleep(0.05)  # concurrent acquires must wait, not load again
+        return object()
+
+    got = []
+    threads = [threading.Thread(target=lambda: got.append(reg.acquire("whisper", "small", loader, device="cpu", compute_type="int8"))) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(loads) == 1
+    assert all(m is got[0] for m in got)
+    (entry,) = reg.report()
+    assert entry["refs"] == 4 and entry["model"] == "small" and entry["load_ms"] >= 50
+    assert reg._loading == {}  # load locks do not outlive the load
+
+
+def test_different_compute_type_is_a_different_model_and_release_drops():
+    reg = ModelRegistry()
+    a = reg.acquire("whisper", "small", object, compute_type="int8")
+    b = reg.acquire("whisper", "small", object, compute_type="float16")
+    assert a is not b
+
+    reg.release(a)
+    assert [e["compute_type"] for e in reg.report()] == ["float16"]
+    # A later acquire loads a fresh copy.
+    assert reg.acquire("whisper", "small", object, compute_type="int8") is not a
+
+
+def test_failed_load_leaves_no_load_lock():
+    reg = ModelRegistry()
+
+    def broken():
+        raise RuntimeError("no weights")
+
+    for i in range(3):
+        try:
+            reg.acquire("whisper", f"m{i}", broken)
+        except RuntimeError:
+            pass
+    assert reg._loading == {} and reg.report() == []
+
+
+def test_concurrent_loads_report_process_rss_and_notify_on_load():
+    messages = []
+    reg = ModelRegistry(on_load=messages.append)
+    started = threading.Barrier(2, timeout=5)
+
+    def loader():
+        started.wait()  # both loads are in flight at once
+        return object()
+
+    threads = [threading.Thread(target=reg.acquire, args=("whisper", m, loader)) for m in ("small", "base")]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    report = reg.report()
+    assert sorted(e["model"] for e in report) == ["base", "small"]
+    assert all(e["process_rss_mb"] > 0 and "rss_mb" not in e for e in report)
+    assert len(messages) == 2 and all("process RSS" in m for m in messages)
@@ -0,0 +1,91 @@
+import os
+
+import pytest
+
+from wandavoice.model_store import ModelStore, ModelStoreError
+
+
+def _fake_whisper(store, name):
+    d = store.whisper_dir(name)
+    os.makedirs(d)
+    for f, data in (("model.bin", b"\x00" * 64), ("config.json", b"{}")):
+        with open(os.path.join(d, f), "wb") as fh:
+            fh.write(data)
+    return d
+
+
+def test_resolve_requires_prefetched_entry(tmp_path):
+    store = ModelStore(str(tmp_path))
+    with pytest.raises(ModelStoreError, match="vox models prefetch --model small"):
+        store.resolve_whisper("small")
+
+    d = _fake_whisper(store, "small")
+    with pytest.raises(ModelStoreError):  # on disk but never recorded
+        store.resolve_whisper("small")
+
+    store._record("whisper/small", d, source="test")
+    assert store.resolve_whisper("small") == d
+
+
+def test_download_cache_is_used_when_the_model_was_never_prefetched(tmp_path):
+    # Upgrade case: weights in faster-whisper's download cache, no manifest yet
+    store = ModelStore(str(tmp_path))
+    snap = tmp_path / "models" / "whisper" / "models--Systran--faster-whisper-small" / "snapshots" / "abc123"
+    snap.mkdir(parents=True)
+    (snap / "config.json").write_text("{}")
+    with pytest.raises(ModelStoreError):  # snapshot without weights
+        store.resolve_whisper("small")
+
+    (snap / "model.bin").write_bytes(b"\x00" * 64)
+    assert store.resolve_whisper("small") == str(snap)
+    assert store.cached_whisper("medium") is None
+
+    # a prefetched copy takes precedence over the cache
+    store._record("whisper/small", _fake_whisper(store, "small"), source="test")
+    assert store.resolve_whisper("small") == store.whisper_dir("small")
+
+
+def test_verify_detects_corruption_and_resolve_detects_truncation(tmp_path):
+    store = ModelStore(str(tmp_path))
+    d = _fake_whisper(store, "small")
+    store._record("whisper/small", d, source="test")
+    assert store.verify() == {"whisper/small": []}
+
+    with open(os.path.join(d, "model.bin"), "r+b") as fh:
+        fh.write(b"\x01")
+    assert store.verify()["whisper/small"] == ["checksum mismatch whisper/small/model.bin"]
+
+    with open(os.path.join(d, "model.bin"), "wb") as fh:
+        fh.write(b"\x00")
+    with pytest.raises(ModelStoreError, match="incomplete"):
+        store.resolve_whisper("small")
+
+
+def test_prefetch_silero_copies_bundled_export(tmp_path):
+    src = tmp_path / "src.onnx"
+    src.write_bytes(b"onnx")
+    store = ModelStore(str(tmp_path / "vox"))
+    store.prefetch_silero(source=str(src))
+    assert open(store.resolve_silero(), "rb").read() == b"onnx"
+
+
+def test_engine_starts_offline_from_the_download_cache(tmp_path, monkeypatch):
+    import wandavoice.stt as stt_mod
+    from wandavoice.config import Config
+    from wandavoice.model_registry import ModelRegistry
+
+    class FakeWhisper:
+        def __init__(self, path, **kwargs):
+            self.path, self.kwargs = path, kwargs
+
+    monkeypatch.setattr(stt_mod, "WhisperModel", FakeWhisper)
+    monkeypatch.setattr(stt_mod, "registry", ModelRegistry())
+    cfg = Config(base_dir=str(tmp_path))
+    cfg.set("voice.stt.warmup", False)
+    assert cfg.MODELS_OFFLINE
+    snap = tmp_path / "models" / "whisper" / "models--Systran--faster-whisper-small" / "snapshots" / "abc123"
+    snap.mkdir(parents=True)
+    (snap / "model.bin").write_bytes(b"\x00" * 64)
+
+    engine = stt_mod.STTEngine(cfg, model_size="small")
+    assert engine.model.path == str(snap) and engine.model.kwargs["local_files_only"] is True
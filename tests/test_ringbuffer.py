@@ -0,0 +1,78 @@
+import os
+import threading
+
+import numpy as np
+import pytest
+from unittest.mock import MagicMock, patch
+
+from wandavoice.ringbuffer import RingBuffer
+
+
+def test_view_is_contiguous_across_wrap_and_zero_copy():
+    ring = RingBuffer(8)
+    ring.write(np.arange(6, dtype=np.float32))
+    ring.write(np.arange(6, 12, dtype=np.float32))  # wraps
+
+    view = ring.view(5, 12)
+    assert view.tolist() == list(range(5, 12))
+    assert view.base is not None  # aliases ring storage, not a copy
+    assert ring.latest(3).tolist() == [9, 10, 11]
+    assert len(ring) == 8
+    assert ring.oldest_pos == 4
+
+
+def test_evicted_range_raises():
+    ring = RingBuffer(4)
+    ring.write(np.ones(10, dtype=np.float32))
+    assert ring.write_pos == 10
+    with pytest.raises(IndexError):
+        ring.view(5, 8)
+    assert ring.view(6, 10).tolist() == [1, 1, 1, 1]
+
+
+def test_oversized_write_keeps_newest():
+    ring = RingBuffer(4)
+    ring.write(np.arange(10, dtype=np.float32))
+    assert ring.latest(4).tolist() == [6, 7, 8, 9]
+
+
+def _recorder(probs):
+    from wandavoice.audio import AudioRecorder
+    from wandavoice.config import Config
+
+    with patch("torch.hub.load") as mock_hub:
+        mock_hub.return_value = (MagicMock(), MagicMock())
+        rec = AudioRecorder(Config())
+    # Frame value encodes the speech probability the fake VAD should return.
+    rec._speech_prob = lambda frame: float(frame[0])
+
+    # Feed the capture hub through a real pipe once the recording has attached.
+    hub = rec._hub
+    r, w = os.pipe()
+    data = b"".join(np.full(1024, p, dtype=np.float32).tobytes() for p in probs)
+    attach = hub.attach
+
+    def attach_and_feed(**kw):
+        consumer = attach(**kw)
+        threading.Thread(target=os.write, args=(w, data), daemon=True).start()
+        return consumer
+
+    hub.attach = attach_and_feed
+    hub._spawn = MagicMock(return_value=MagicMock(**{"poll.return_value": None, "stdout.fileno.return_value": r}))
+    return rec
+
+
+def test_record_phrase_returns_pre_roll_plus_speech():
+    # 2 silent chunks (pre-roll), 2 speech chunks, then enough silence to stop.
+    probs = [0.0, 0.0, 0.9, 0.9] + [0.0] * 16
+    rec = _recorder(probs)
+    audio = rec.record_phrase(vad_profile="command")
+    rec.close()
+
+    assert audio is not None
+    # Pre-roll (2048) + speech (2048) + trailing silence; the stop is checked
+    # per hub read, so at least the 15 silent frames the profile needs.
+    assert len(audio) >= 2048 + 2048 + 15 * 512
+    assert len(audio) % 512 == 0
+    assert audio[:2048].max() == 0.0
+    assert np.allclose(audio[2048:4096], 0.9)
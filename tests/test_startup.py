@@ -0,0 +1,41 @@
+import time
+
+import pytest
+
+from wandavoice.startup import StartupOrchestrator
+
+
+def _slow(value, delay):
+    def factory():
+        time.sleep(delay)
+        return value
+    return factory
+
+
+def test_components_load_concurrently_and_can_be_awaited_individually():
+    boot = StartupOrchestrator()
+    boot.start("audio", _slow("rec", 0.05))
+    boot.start("stt", _slow("stt", 0.2))
+    boot.start("tts", _slow("tts", 0.6))
+
+    t0 = time.perf_counter()
+    assert boot.wait(["audio", "stt"]) == {"audio": "rec", "stt": "stt"}
+    assert time.perf_counter() - t0 < 0.45  # not the sum of the loads
+    assert boot.result("tts") is None  # still warming, result() never blocks
+
+    assert boot.get("tts") == "tts"
+    start, end = boot.timeline["stt"]
+    assert start < 50 and end >= 200
+    assert "stt" in boot.format_timeline()
+
+
+def test_init_error_is_raised_on_get_and_marked_in_timeline():
+    def broken():
+        raise RuntimeError("no GPU")
+
+    boot = StartupOrchestrator()
+    boot.start("tts", broken)
+    with pytest.raises(RuntimeError, match="no GPU"):
+        boot.get("tts", timeout=1)
+    assert boot.result("tts") is None
+    assert "FAILED" in boot.format_timeline()
@@ -0,0 +1,70 @@
+import numpy as np
+
+from wandavoice.streaming_stt import StreamingTranscriber
+
+SR = 16000
+# Script of the utterance: one word every 0.5 s, each 0.4 s long.
+WORDS = [f" w{i}" for i in range(60)]
+
+
+class _FakeSTT:
+    """Decodes audio whose samples carry their own absolute time in seconds."""
+
+    def __init__(self):
+        self.decoded = []
+
+    def transcribe_words(self, audio, prompt=""):
+        self.decoded.append(len(audio))
+        t0 = float(audio[0])
+        t1 = t0 + len(audio) / SR
+        out = []
+        for i, w in enumerate(WORDS):
+            start, end = i * 0.5, i * 0.5 + 0.4
+            if start < t0 - 0.05 or start >= t1:
+                continue
+            # A word cut off at the end of the window is not recognised yet.
+            text = w if end <= t1 else " w?"
+            out.append((start - t0, min(end, t1) - t0, text))
+        return out
+
+
+def _utterance(seconds):
+    return (np.arange(int(seconds * SR)) / SR).astype(np.float32)
+
+
+def test_commits_agreed_prefix_and_decodes_bounded_window():
+    stt = _FakeSTT()
+    streamer = StreamingTranscriber(stt, samplerate=SR, max_window_s=4.0)
+    audio = _utterance(30.0)
+
+    for end in range(SR // 2, len(audio) + 1, SR // 2):
+        streamer.update(audio[streamer.buffer_start:end])
+
+    committed = streamer.committed_text.split()
+    assert committed == [w.strip() for w in WORDS[:len(committed)]]
+    assert len(committed) >= 55
+    # Work per step stays bounded by the trimmed window, not the utterance.
+    assert max(stt.decoded) <= 2 * SR
+
+
+def test_partial_shows_tentative_tail_after_committed_prefix():
+    stt = _FakeSTT()
+    streamer = StreamingTranscriber(stt, samplerate=SR)
+    audio = _utterance(2.2)
+
+    streamer.update(audio[:SR])
+    assert streamer.committed_text == ""
+    assert streamer.text == "w0 w1"
+
+    text = streamer.update(audio[streamer.buffer_start:])
+    assert streamer.committed_text == "w0 w1"
+    assert text.startswith("w0 w1 w2 w3")
+
+
+def test_recorder_tail_only_concatenates_needed_chunks():
+    from wandavoice.audio import AudioRecorder
+
+    chunks = [np.arange(i, i + 10, dtype=np.float32) for i in range(0, 50, 10)]
+    assert AudioRecorder._tail(chunks, 25).tolist() == list(range(25, 50))
+    assert AudioRecorder._tail(chunks, 0).tolist() == list(range(50))
+    assert AudioRecorder._tail([], 0) is None
@@ -0,0 +1,185 @@
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import wandavoice.stt as stt_mod
+from wandavoice.stt_cache import cache_from_config
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../backend/voice-engine/src")))
+
+from voice_engine.stt.cache import STTResultCache  # noqa: E402
+
+AUDIO = np.linspace(-0.5, 0.5, 16000, dtype=np.float32)
+
+
+def test_key_covers_audio_and_settings():
+    k = STTResultCache.key(AUDIO, model="small", compute_type="int8", language="de", beam_size=1)
+    assert k == STTResultCache.key(AUDIO.copy(), beam_size=1, language="de", compute_type="int8", model="small")
+    assert k != STTResultCache.key(AUDIO[:-1], model="small", compute_type="int8", language="de", beam_size=1)
+    assert k != STTResultCache.key(AUDIO, model="small", compute_type="int8", language="en", beam_size=1)
+    assert k != STTResultCache.key(AUDIO, model="medium", compute_type="int8", language="de", beam_size=1)
+    assert k != STTResultCache.key(AUDIO.tobytes(), model="small", compute_type="int8", language="de", beam_size=5)
+
+
+def test_file_key_hashes_in_blocks_like_key(tmp_path):
+    path = tmp_path / "long.raw"
+    data = np.random.default_rng(0).integers(0, 255, 3 << 20, dtype=np.uint8).tobytes()  # several blocks
+    path.write_bytes(data)
+    assert STTResultCache.file_key(str(path), model="small") == STTResultCache.key(data, model="small")
+    assert STTResultCache.file_key(str(path), model="small") != STTResultCache.key(data[:-1], model="small")
+
+
+def test_roundtrip_persists_and_counts(tmp_path):
+    cache = STTResultCache(str(tmp_path))
+    key = cache.key(AUDIO, model="small")
+    assert cache.get(key) is None
+    cache.put(key, {"text": "hallo", "confidence": 0.9, "language": "de"})
+
+    reopened = STTResultCache(str(tmp_path))
+    assert reopened.get(key)["text"] == "hallo"
+    reopened.get("0" * 64)
+    stats = reopened.stats()
+    assert stats == {"hits": 1, "misses": 1, "evictions": 0, "hit_rate": 0.5, "bytes": stats["bytes"]}
+    assert stats["bytes"] > 0
+
+
+def test_evicts_least_recently_used_past_the_budget(tmp_path):
+    cache = STTResultCache(str(tmp_path), max_bytes=1000)
+    keys = [cache.key(np.full(4, i, dtype=np.float32)) for i in range(12)]
+    for i, k in enumerate(keys[:10]):  # ~90 bytes each: fits
+        cache.put(k, {"text": "x" * 80})
+        past = time.time() - 100 + i
+        os.utime(cache._path(k), (past, past))
+    assert cache.evictions == 0
+    cache.get(keys[0])  # touched: now the most recent
+    for k in keys[10:]:
+        cache.put(k, {"text": "x" * 80})
+
+    assert cache.evictions > 0 and cache.stats()["bytes"] <= 1000
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[1]) is None
+
+
+class FakeWhisper:
+    def __init__(self, *args, **kwargs):
+        self.calls = 0
+
+    def transcribe(self, audio, **kwargs):
+        self.calls += 1
+        return iter([SimpleNamespace(text=" hallo welt")]), SimpleNamespace(language="de", language_probability=0.9)
+
+
+def test_adapter_hits_skip_the_decode(tmp_path, monkeypatch):
+    pytest.importorskip("faster_whisper")
+    import voice_engine.stt.faster_whisper as fw
+
+    monkeypatch.setattr(fw, "WhisperModel", FakeWhisper)
+    wav = tmp_path / "a.wav"
+    wav.write_bytes(b"RIFF-fake-audio")
+    cache = STTResultCache(str(tmp_path / "stt"))
+    adapter = fw.FasterWhisperAdapter(model_size="fake-cache", warmup=False, cache=cache)
+    try:
+        first = asyncio.run(adapter.transcribe_file(str(wav)))
+        again = asyncio.run(adapter.transcribe_file(str(wav)))
+        assert adapter.model.calls == 1
+        assert (again.text, again.confidence, again.language) == (first.text, first.confidence, first.language)
+        assert first.text == "hallo welt" and not first.cached and again.cached
+
+        pcm = (AUDIO * 32767).astype(np.int16).tobytes()
+
+        async def replay():
+            async def gen():
+                yield pcm
+            return [r async for r in adapter.transcribe_stream(gen(), partial_interval_ms=10_000)]
+
+        assert [r.text for r in asyncio.run(replay())] == ["hallo welt"]
+        assert [r.text for r in asyncio.run(replay())] == ["hallo welt"]
+        assert adapter.model.calls == 3  # stream decodes never come from the cache
+        assert cache.counts() == {"hits": 1, "misses": 1, "evictions": 0}
+    finally:
+        adapter.close()
+
+
+def test_stream_decodes_bypass_the_cache(tmp_path, monkeypatch):
+    pytest.importorskip("faster_whisper")
+    import voice_engine.stt.faster_whisper as fw
+
+    monkeypatch.setattr(fw, "WhisperModel", FakeWhisper)
+    cache = STTResultCache(str(tmp_path))
+    adapter = fw.FasterWhisperAdapter(model_size="fake-cache-partials", warmup=False, cache=cache)
+    pcm = (AUDIO * 32767).astype(np.int16).tobytes()
+
+    async def stream():
+        async def gen():
+            for _ in range(4):
+                yield pcm
+        return [r async for r in adapter.transcribe_stream(gen(), partial_interval_ms=1000)]
+
+    model = adapter.model
+    try:
+        results = asyncio.run(stream())
+    finally:
+        adapter.close()
+    assert [r.is_final for r in results] == [False, True]
+    assert model.calls >= 4  # partials decoded
+    assert cache.counts() == {"hits": 0, "misses": 0, "evictions": 0}  # live audio: no lookups at all
+    assert not os.listdir(tmp_path)
+
+
+class FakeWhisperSegments:
+    def __init__(self, *args, **kwargs):
+        self.calls = []
+
+    def transcribe(self, audio, **kwargs):
+        self.calls.append(kwargs)
+        segs = [SimpleNamespace(start=0.0, end=1.0, text=" Hallo Welt.", avg_logprob=-0.2, no_speech_prob=0.01,
+                                compression_ratio=1.1),
+                SimpleNamespace(start=1.0, end=2.0, text=" Danke.", avg_logprob=-0.7, no_speech_prob=0.9,
+                                compression_ratio=1.0)]
+        return iter(segs), None
+
+
+@pytest.fixture
+def fake_whisper():
+    return FakeWhisperSegments
+
+
+@pytest.fixture
+def cfg(cfg):
+    cfg.set("voice.stt.lang", "de")
+    return cfg
+
+
+def test_engine_reruns_are_served_from_the_cache(cfg, tmp_path):
+    cache = cache_from_config(cfg)
+    assert cache.cache_dir == str(tmp_path / "cache" / "stt")
+    engine = stt_mod.STTEngine(cfg, cache=cache)
+    first = engine.transcribe_result(AUDIO)
+    again = engine.transcribe_result(AUDIO.copy())
+    assert len(engine.model.calls) == 1
+    assert not first.cached and again.cached
+    assert again.text == first.text == "Hallo Welt."
+    assert [s.rejected for s in again.segments] == [None, "no_speech"]  # policy applied to cached scores
+
+    # a new process (`vox transcribe` rerun) finds it on disk
+    rerun = stt_mod.STTEngine(cfg, cache=cache_from_config(cfg))
+    assert rerun.transcribe(AUDIO) == "Hallo Welt."
+    assert len(rerun.model.calls) == 1 and rerun.cache.counts()["hits"] == 1  # (model shared via the registry)
+
+    cfg.set("voice.stt.lang", "en")  # different decode settings: decoded again
+    engine.transcribe_result(AUDIO)
+    assert len(engine.model.calls) == 2
+
+
+def test_engine_without_cache_always_decodes(cfg):
+    cfg.set("voice.stt.cache.enabled", False)
+    assert cache_from_config(cfg) is None
+    engine = stt_mod.STTEngine(cfg)
+    engine.transcribe(AUDIO)
+    engine.transcribe(AUDIO)
+    assert len(engine.model.calls) == 2 and engine.cache is None
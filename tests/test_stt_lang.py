@@ -0,0 +1,109 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import wandavoice.stt as stt_mod
+from wandavoice.stt_lang import LanguageCache
+
+AUDIO = np.zeros(16000, dtype=np.float32)
+
+
+class FakeWhisper:
+    """Detects ``detect`` languages in turn; decodes score ``logprob``."""
+
+    def __init__(self, *args, **kwargs):
+        self.detect = [("de", 0.97)]
+        self.logprob = -0.2
+        self.detections = 0
+        self.calls = []
+
+    def detect_language(self, audio):
+        lang, prob = self.detect[min(self.detections, len(self.detect) - 1)]
+        self.detections += 1
+        return lang, prob, [(lang, prob)]
+
+    def transcribe(self, audio, **kwargs):
+        self.calls.append(kwargs)
+        seg = SimpleNamespace(start=0.0, end=1.0, text=" Hallo", avg_logprob=self.logprob, no_speech_prob=0.01,
+                              compression_ratio=1.1, words=[SimpleNamespace(start=0.0, end=0.5, word=" Hallo")])
+        return iter([seg]), None
+
+
+@pytest.fixture
+def fake_whisper():
+    return FakeWhisper
+
+
+@pytest.fixture
+def cfg(cfg):
+    cfg.set("voice.stt.lang", "auto")
+    return cfg
+
+
+def test_language_is_detected_once_and_reused(cfg):
+    engine = stt_mod.STTEngine(cfg)
+    for _ in range(3):
+        engine.transcribe_words(AUDIO)
+    result = engine.transcribe_result(AUDIO)
+
+    assert engine.model.detections == 1
+    assert [c["language"] for c in engine.model.calls] == ["de"] * 4
+    assert result.language == "de"
+    s = engine.lang_cache.stats()
+    assert (s["detections"], s["hits"], s["hit_rate"]) == (1, 3, 0.75)
+    assert s["detect_ms_total"] >= 0
+
+
+def test_unconfident_detection_is_used_but_not_kept(cfg):
+    engine = stt_mod.STTEngine(cfg)
+    engine.model.detect = [("en", 0.4), ("de", 0.95)]
+    engine.transcribe(AUDIO)
+    engine.transcribe(AUDIO)
+    engine.transcribe(AUDIO)
+    assert [c["language"] for c in engine.model.calls] == ["en", "de", "de"]
+    assert engine.model.detections == 2 and engine.lang_cache.language == "de"
+
+
+def test_poor_decodes_trigger_redetection(cfg):
+    engine = stt_mod.STTEngine(cfg)
+    engine.model.detect = [("de", 0.95), ("en", 0.93)]
+    engine.transcribe(AUDIO)
+    engine.model.logprob = -1.6  # the speaker switched to English
+    engine.transcribe(AUDIO)
+    engine.model.logprob = -0.2
+    engine.transcribe(AUDIO)
+    assert [c["language"] for c in engine.model.calls] == ["de", "de", "en"]
+    assert engine.lang_cache.invalidations == 1
+
+
+def test_fixed_language_skips_detection(cfg):
+    cfg.set("voice.stt.lang", "en")
+    engine = stt_mod.STTEngine(cfg)
+    engine.transcribe(AUDIO)
+    assert engine.model.detections == 0 and engine.model.calls[0]["language"] == "en"
+
+
+def test_engines_share_one_session_cache(cfg):
+    cache = LanguageCache.from_config(cfg)
+    a = stt_mod.STTEngine(cfg, model_size="small", lang_cache=cache)
+    b = stt_mod.STTEngine(cfg, model_size="medium", lang_cache=cache)
+    a.transcribe_words(AUDIO)
+    b.transcribe(AUDIO)
+    assert a.model.detections + b.model.detections == 1
+    assert b.model.calls[0]["language"] == "de"
+
+    cache.reset()  # user switched language
+    b.transcribe(AUDIO)
+    assert b.model.detections == 1
+
+
+def test_hit_rate_is_reported_as_a_percentage():
+    from wandavoice.utils import LatencyTracker
+
+    lt = LatencyTracker()
+    lt.annotate("STT_Lang_Detect", 41.0)
+    lt.annotate("STT_Lang_Hit", 75.0, unit="%")
+    report = lt.format_report()
+    assert "41.0 ms" in report and "75.0 %" in report
+    assert lt.get_summary()["STT_Lang_Hit"] == 75.0
@@ -0,0 +1,133 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from wandavoice.config import Config
+from wandavoice.stt_pool import STTModelPool
+
+
+class FakeEngine:
+    def __init__(self, model, compute_type, load_s=0.0, decode_gate=None):
+        time.sleep(load_s)
+        self.model_size, self.compute_type = model, compute_type
+        self.closed = False
+        self.decode_gate = decode_gate
+        self.warmup_ms = {"STT_Warmup_Cold": 1.0}
+
+    def transcribe(self, audio):
+        if self.decode_gate is not None:
+            self.decode_gate.wait(2)
+        assert not self.closed
+        return self.model_size
+
+    def close(self):
+        self.closed = True
+
+
+def make_pool(cfg, max_resident=2, load_s=0.0, gates=None):
+    made = []
+
+    def factory(model, compute_type):
+        e = FakeEngine(model, compute_type, load_s, (gates or {}).get(model))
+        made.append(e)
+        return e
+
+    return STTModelPool(cfg, max_resident=max_resident, engine_factory=factory), made
+
+
+@pytest.fixture
+def cfg(tmp_path):
+    cfg = Config(base_dir=str(tmp_path))
+    cfg.update_from_args(model="large-v3-turbo")
+    return cfg
+
+
+def test_profile_switch_loads_in_background_and_keeps_serving(cfg):
+    pool, _ = make_pool(cfg, load_s=0.2)
+    t0 = time.perf_counter()
+    fut = pool.set_profile("fast")
+    assert time.perf_counter() - t0 < 0.1  # does not block the caller
+    assert pool.transcribe(None) == "large-v3-turbo"  # old model until the new one is ready
+
+    engine = fut.result(2)
+    assert (engine.model_size, engine.compute_type) == ("small", "int8")
+    assert pool.transcribe(None) == "small"
+    assert pool.switches[-1]["load_ms"] >= 200
+
+    # Switching back to a resident model is immediate.
+    assert pool.set_profile("final").done()
+    assert pool.transcribe(None) == "large-v3-turbo"
+
+
+def test_in_flight_decode_finishes_on_old_model_before_it_is_evicted(cfg):
+    gate = threading.Event()
+    pool, made = make_pool(cfg, max_resident=1, gates={"large-v3-turbo": gate})
+    result = []
+    decode = threading.Thread(target=lambda: result.append(pool.transcribe(None)))
+    decode.start()
+    time.sleep(0.05)
+
+    pool.switch("small").result(2)  # evicts large-v3-turbo (cap 1) while it decodes
+    old = made[0]
+    assert not old.closed
+    gate.set()
+    decode.join(2)
+    assert result == ["large-v3-turbo"]
+    assert old.closed
+    assert pool.resident() == [("small", cfg.COMPUTE_TYPE)]
+
+
+def test_lru_cap_and_last_switch_wins(cfg):
+    pool, made = make_pool(cfg, max_resident=2, load_s=0.05)
+    a = pool.switch("small")
+    b = pool.switch("medium")
+    a.result(2), b.result(2)
+    assert pool.active_key[0] == "medium"
+    assert len(pool.resident()) == 2
+    assert sum(e.closed for e in made) == 1
+
+
+def test_unknown_profile_and_failed_load_keep_current_model(cfg):
+    pool, _ = make_pool(cfg)
+    with pytest.raises(ValueError):
+        pool.set_profile("nope")
+
+    def broken(model, compute_type):
+        raise SystemExit(1)  # what STTEngine does on load errors
+
+    pool._factory = broken
+    with pytest.raises(RuntimeError):
+        pool.switch("small").result(2)
+    assert pool.transcribe(None) == "large-v3-turbo"
+
+
+def test_backend_pool_swaps_without_blocking_the_loop():
+    from voice_engine.stt.pool import STTModelPool as AsyncPool
+
+    def factory(adapter, model):
+        time.sleep(0.2)
+        return FakeEngine(model, adapter)
+
+    async def scenario():
+        pool = AsyncPool(factory, max_resident=1)
+        pool.load("faster_whisper", "small")
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        t = asyncio.ensure_future(ticker())
+        with pool.borrow() as old:
+            await pool.switch("faster_whisper", "medium")
+            assert not old.closed  # in flight: evicted but not closed yet
+        t.cancel()
+        assert old.closed
+        assert pool.active.model_size == "medium"
+        assert ticks >= 10  # the event loop kept running during the load
+
+    asyncio.run(scenario())
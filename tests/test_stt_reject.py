@@ -0,0 +1,97 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import wandavoice.stt as stt_mod
+from wandavoice.stt import RejectionPolicy, STTSegment
+from wandavoice.stt_scheduler import STTScheduler
+
+
+def seg(text, avg_logprob=-0.2, no_speech_prob=0.05, compression_ratio=1.2, words=None):
+    return SimpleNamespace(start=0.0, end=1.0, text=text, avg_logprob=avg_logprob,
+                           no_speech_prob=no_speech_prob, compression_ratio=compression_ratio, words=words)
+
+
+class FakeWhisper:
+    segments = []
+
+    def __init__(self, *args, **kwargs):
+        self.calls = []
+
+    def transcribe(self, audio, **kwargs):
+        self.calls.append(kwargs)
+        return iter(FakeWhisper.segments), None
+
+
+@pytest.fixture
+def fake_whisper():
+    return FakeWhisper
+
+
+@pytest.fixture
+def cfg(cfg):
+    cfg.set("voice.stt.lang", "de")
+    return cfg
+
+
+AUDIO = np.zeros(16000, dtype=np.float32)
+
+
+@pytest.mark.parametrize("segment,reason", [
+    (seg(" Hallo Welt."), None),
+    (seg(" ."), "empty"),
+    (seg(" ja ja ja ja ja ja ja ja", compression_ratio=3.1), "repetitive"),
+    (seg(" Vielen Dank.", avg_logprob=-0.6, no_speech_prob=0.85), "no_speech"),
+    (seg(" Stopp.", avg_logprob=-0.1, no_speech_prob=0.85), None),  # confident text survives
+    (seg(" Untertitel im Auftrag", avg_logprob=-1.4), "low_confidence"),
+])
+def test_policy_reasons(segment, reason):
+    assert RejectionPolicy().reason(segment) == reason
+
+
+def test_transcribe_result_flags_rejected_segments(cfg):
+    FakeWhisper.segments = [seg(" Hallo"), seg(" Vielen Dank.", avg_logprob=-0.7, no_speech_prob=0.9), seg(" Welt.")]
+    engine = stt_mod.STTEngine(cfg)
+
+    result = engine.transcribe_result(AUDIO)
+    assert result.text == "Hallo Welt."
+    assert [(s.text, s.rejected) for s in result.rejected] == [(" Vielen Dank.", "no_speech")]
+    assert result.segments[0] == STTSegment(0.0, 1.0, " Hallo", -0.2, 0.05, 1.2)
+    assert result.decode_ms >= 0
+    assert engine.transcribe(AUDIO) == "Hallo Welt."
+
+
+def test_thresholds_and_short_fallback_ladder_reach_the_decoder(cfg):
+    FakeWhisper.segments = []
+    cfg.set("voice.stt.reject.max_fallbacks", 1)
+    engine = stt_mod.STTEngine(cfg)
+    engine.transcribe(AUDIO)
+    engine.transcribe_words(AUDIO)
+    for call in engine.model.calls:
+        assert call["temperature"] == (0.0, 0.2)
+        assert call["no_speech_threshold"] == 0.6 and call["log_prob_threshold"] == -1.0
+        assert call["compression_ratio_threshold"] == 2.4
+
+
+def test_partials_skip_words_of_rejected_segments(cfg):
+    word = lambda w: SimpleNamespace(start=0.0, end=0.5, word=w)
+    FakeWhisper.segments = [seg(" Hallo", words=[word(" Hallo")]),
+                            seg(" Danke.", avg_logprob=-0.8, no_speech_prob=0.95, words=[word(" Danke.")])]
+    engine = stt_mod.STTEngine(cfg)
+    assert [w for _, _, w in engine.transcribe_words(AUDIO)] == [" Hallo"]
+
+
+def test_policy_can_be_turned_off(cfg):
+    cfg.set("voice.stt.reject", None)
+    FakeWhisper.segments = [seg(" Vielen Dank.", avg_logprob=-0.7, no_speech_prob=0.9)]
+    engine = stt_mod.STTEngine(cfg)
+    assert engine.transcribe(AUDIO) == "Vielen Dank."
+    assert "temperature" not in engine.model.calls[-1]
+
+
+def test_scheduler_passes_structured_results_through(cfg):
+    FakeWhisper.segments = [seg(" Hallo"), seg(" .")]
+    sched = STTScheduler(stt_mod.STTEngine(cfg))
+    result = sched.transcribe_result(AUDIO, priority="segment")
+    assert result.text == "Hallo" and len(result.rejected) == 1
@@ -0,0 +1,96 @@
+import threading
+import time
+
+from wandavoice.stt_scheduler import STTScheduler
+
+
+class _BlockingSTT:
+    """Records call order; the first call blocks until released."""
+
+    def __init__(self):
+        self.calls = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def transcribe(self, audio):
+        self._run(("final", audio))
+        return f"final:{audio}"
+
+    def transcribe_words(self, audio, prompt="", cancel=None):
+        self._run(("partial", audio))
+        if cancel is not None:
+            self.cancelled = cancel.is_set()
+        return [(0.0, 0.1, f" {audio}")]
+
+    def _run(self, call):
+        self.calls.append(call)
+        if len(self.calls) == 1:
+            self.started.set()
+            self.release.wait(2)
+
+
+def _in_thread(fn, *args, **kwargs):
+    out = {}
+    t = threading.Thread(target=lambda: out.setdefault("r", fn(*args, **kwargs)))
+    t.start()
+    return t, out
+
+
+def _wait_queued(sched, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not sched._heap:
+        assert time.monotonic() < deadline, "job was never queued"
+        time.sleep(0.001)
+
+
+def test_final_runs_before_queued_partials_and_drops_them():
+    engine = _BlockingSTT()
+    sched = STTScheduler(engine)
+
+    t0, busy = _in_thread(sched.transcribe, "seg", priority="segment")
+    assert engine.started.wait(1)
+
+    t1, stale = _in_thread(sched.transcribe_words, "p1")
+    _wait_queued(sched)
+    job = sched.submit(engine.transcribe, "done")
+    engine.release.set()
+
+    assert job.wait(2) == "final:done"
+    t0.join(2); t1.join(2)
+    assert stale["r"] is None
+    assert engine.calls == [("final", "seg"), ("final", "done")]
+    assert sched.stats["partial"]["dropped"] == 1
+    assert sched.last_wait_ms["final"] > 0
+
+
+def test_final_cancels_partial_in_flight():
+    engine = _BlockingSTT()
+    sched = STTScheduler(engine)
+
+    t, partial = _in_thread(sched.transcribe_words, "p1")
+    assert engine.started.wait(1)
+    job = sched.submit(engine.transcribe, "done")
+    engine.release.set()
+
+    assert job.wait(2) == "final:done"
+    t.join(2)
+    assert engine.cancelled
+    assert partial["r"] is None
+
+
+def test_newer_partial_replaces_queued_one():
+    engine = _BlockingSTT()
+    sched = STTScheduler(engine)
+
+    t0, _ = _in_thread(sched.transcribe, "x")
+    assert engine.started.wait(1)
+    t1, old = _in_thread(sched.transcribe_words, "old")
+    _wait_queued(sched)
+    t2, new = _in_thread(sched.transcribe_words, "new")
+    t1.join(2)
+    engine.release.set()
+    t2.join(2); t0.join(2)
+
+    assert old["r"] is None
+    assert new["r"] == [(0.0, 0.1, " new")]
+    assert ("partial", "old") not in engine.calls
@@ -0,0 +1,117 @@
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../backend/voice-engine/src")))
+
+pytest.importorskip("faster_whisper")
+import voice_engine.stt.faster_whisper as fw  # noqa: E402
+from voice_engine.audio.buffer import PCMBuffer  # noqa: E402
+
+SR = 16000
+CHUNK = 512
+
+
+class FakeWhisper:
+    """Transcript names how many voiced samples the decoded audio holds."""
+
+    def __init__(self, *args, **kwargs):
+        self.decoded = []
+
+    def transcribe(self, audio, **kwargs):
+        self.decoded.append(len(audio))
+        voiced = int(np.count_nonzero(audio))
+        segs = [SimpleNamespace(text=f" voiced {voiced}")] if voiced else []
+        return iter(segs), SimpleNamespace(language="de", language_probability=0.9)
+
+
+@pytest.fixture
+def adapter(monkeypatch):
+    monkeypatch.setattr(fw, "WhisperModel", FakeWhisper)
+    a = fw.FasterWhisperAdapter(model_size="fake-stream", warmup=False)
+    yield a
+    a.close()
+
+
+def _chunks(*spans):
+    """(seconds, voiced) spans -> 512-sample int16 chunks."""
+    for seconds, voiced in spans:
+        for _ in range(int(seconds * SR) // CHUNK):
+            yield np.full(CHUNK, 8000 if voiced else 0, dtype=np.int16).tobytes()
+
+
+async def _agen(chunks):
+    for c in chunks:
+        yield c
+
+
+def _vad(chunk):
+    return bool(np.frombuffer(chunk, dtype=np.int16).any())
+
+
+def _run(adapter, chunks, **kwargs):
+    async def collect():
+        return [r async for r in adapter.transcribe_stream(_agen(chunks), **kwargs)]
+    return asyncio.run(collect())
+
+
+def test_partials_then_final_per_vad_endpoint(adapter):
+    results = _run(adapter, _chunks((1.0, False), (2.0, True), (1.0, False), (1.5, True), (0.2, False)),
+                   is_speech=_vad, partial_interval_ms=500, end_silence_ms=600, preroll_ms=300)
+
+    finals = [r for r in results if r.is_final]
+    assert len(finals) == 2
+    first = results[:results.index(finals[0])]
+    assert len(first) >= 3 and not any(r.is_final for r in first)
+    # partials grow with the utterance and end where the audio received so far ends
+    assert [int(r.text.split()[1]) for r in first] == sorted(int(r.text.split()[1]) for r in first)
+    # the final covers all speech plus pre-roll, starting ~300 ms before the onset at 1 s
+    assert finals[0].text == f"voiced {2 * SR // CHUNK * CHUNK}"
+    assert 650 <= finals[0].start_time_ms <= 720 and finals[0].end_time_ms > 3000
+    # the second utterance is finalized by the end of the stream
+    assert finals[1].start_time_ms > finals[0].end_time_ms
+    assert all(r.decode_ms is not None and r.decode_ms >= 0 for r in results)
+    assert all(r.language == "de" for r in results)
+
+
+def test_leading_silence_is_not_decoded(adapter):
+    assert _run(adapter, _chunks((3.0, False)), is_speech=_vad) == []
+    assert adapter.model.decoded == []
+
+
+def test_partial_decodes_are_bounded_by_the_window(adapter):
+    results = _run(adapter, _chunks((12.0, True)), partial_interval_ms=1000, window_s=4.0)
+    final = results[-1]
+    assert final.is_final and final.end_time_ms == 12 * SR // CHUNK * CHUNK * 1000 // SR
+    assert len(adapter.model.decoded) >= 11
+    # once the window is full every partial reads the same; repeats are not yielded
+    assert [r.text for r in results[:-1]] == [f"voiced {n}" for n in (16384, 32768, 49152, 64000)]
+    assert max(adapter.model.decoded[:-1]) <= 4 * SR  # only the final decodes everything
+    assert adapter.model.decoded[-1] == 12 * SR // CHUNK * CHUNK
+
+
+def test_pcm_buffer_grows_and_trims():
+    buf = PCMBuffer(capacity=4)
+    for i in range(5):
+        buf.append_pcm16(np.full(3, 16384, dtype=np.int16).tobytes())
+    assert len(buf) == 15 and buf.capacity == 16
+    assert np.allclose(buf.view(), 0.5)
+    buf.append(np.arange(4, dtype=np.float32))
+    assert list(buf.tail(3)) == [1.0, 2.0, 3.0]
+    buf.keep_last(2)
+    assert list(buf.view()) == [2.0, 3.0] and buf.capacity == 32
+    buf.clear()
+    assert len(buf) == 0
+
+
+def test_long_stream_without_pause_is_cut_into_bounded_utterances(adapter):
+    results = _run(adapter, _chunks((70.0, True)), partial_interval_ms=10_000, max_utterance_s=30.0)
+    finals = [r for r in results if r.is_final]
+    assert len(finals) == 3 and finals[0].start_time_ms == 0 and finals[-1].end_time_ms > 69_000
+    assert all(a.end_time_ms == b.start_time_ms for a, b in zip(finals, finals[1:]))  # contiguous cuts
+    assert all(f.end_time_ms - f.start_time_ms <= 30_000 for f in finals)
+    assert max(adapter.model.decoded) <= 30 * SR
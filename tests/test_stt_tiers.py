@@ -0,0 +1,64 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from wandavoice.stt_tiers import TwoTierSTT, word_divergence
+
+
+class SlowEngine:
+    def __init__(self, name, decode_s):
+        self.name = name
+        self.decode_s = decode_s
+        self.warmup_ms = {"STT_Warmup_Cold": 10.0}
+
+    def transcribe(self, audio):
+        time.sleep(self.decode_s)
+        return f"{self.name} final"
+
+    def transcribe_words(self, audio, prompt="", cancel=None):
+        time.sleep(self.decode_s)
+        return [(0.0, 0.5, f" {self.name}")]
+
+
+@pytest.mark.parametrize("partial, final, expected", [
+    ("Hallo Welt", "hallo, Welt!", 0.0),
+    ("Hallo Wald", "Hallo Welt", 0.5),
+    ("Hallo", "Hallo Welt", 0.5),
+    ("", "Hallo Welt", 1.0),
+    ("", "", 0.0),
+])
+def test_word_divergence(partial, final, expected):
+    assert word_divergence(partial, final) == pytest.approx(expected)
+
+
+def test_partials_run_on_the_fast_model_while_the_final_decodes():
+    stt = TwoTierSTT(SlowEngine("small", 0.02), SlowEngine("large", 0.4))
+    audio = np.zeros(16000, dtype=np.float32)
+
+    final = []
+    t = threading.Thread(target=lambda: final.append(stt.transcribe(audio)))
+    t.start()
+    time.sleep(0.05)
+
+    t0 = time.perf_counter()
+    words = stt.transcribe_words(audio, prompt="")
+    assert time.perf_counter() - t0 < 0.2  # not queued behind the final
+    assert words == [(0.0, 0.5, " small")]
+    t.join()
+    assert final == ["large final"]
+
+    assert stt.record_final("small", "large final") == pytest.approx(1.0)
+    assert stt.record_final("", "large final") is None
+    s = stt.stats()
+    assert s["partials"] == 1 and s["finals"] == 1
+    assert s["partial_ms_p50"] < 200 <= s["final_ms_p50"]
+    assert s["divergence_last"] == 1.0
+    assert "WER" in stt.format_stats()
+
+
+def test_warmup_of_both_tiers_and_delegation():
+    stt = TwoTierSTT(SlowEngine("small", 0), SlowEngine("large", 0))
+    assert stt.warmup_ms == {"STT_Warmup_Cold": 10.0, "STT_Fast_Warmup_Cold": 10.0}
+    assert stt.name == "large"  # everything else comes from the final tier
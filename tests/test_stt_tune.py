@@ -0,0 +1,103 @@
+import json
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import wandavoice.stt as stt_mod
+from wandavoice.stt_pool import profile_key
+from wandavoice.stt_tune import STTAutotuner, candidates, compute_type_for, save_tuning, tuned_settings
+
+REF = "hallo wanda wie spaet ist es"
+
+
+class FakeModel:
+    """Decode time and transcript depend on the configuration."""
+
+    SPEED_MS = {"float32": 12, "int8_float32": 6, "int8": 2}
+    TEXT = {"float32": REF, "int8_float32": REF, "int8": "hallo wanda wie spaet"}
+
+    def __init__(self, device, compute_type, cpu_threads):
+        if device == "cuda":
+            raise RuntimeError("no CUDA device")
+        self.compute_type = compute_type
+        self.cpu_threads = cpu_threads
+
+    def transcribe(self, audio, **kwargs):
+        time.sleep(self.SPEED_MS[self.compute_type] / max(1, self.cpu_threads) / 1000)
+        return iter([SimpleNamespace(text=" " + self.TEXT[self.compute_type])]), None
+
+
+def _cands(cts, threads=(1, 2), device="cpu"):
+    return [{"device": device, "compute_type": ct, "cpu_threads": t} for ct in cts for t in threads]
+
+
+def test_fastest_candidate_within_accuracy_floor_wins():
+    tuner = STTAutotuner(FakeModel, np.zeros(16000, dtype=np.float32), max_wer=0.1, repeats=2)
+    best = tuner.run(_cands(["int8", "int8_float32", "float32"]) + _cands(["float16"], (0,), "cuda"))
+
+    assert tuner.reference == REF  # from the CPU float32 decode
+    assert (best["compute_type"], best["cpu_threads"]) == ("int8_float32", 2)
+    int8 = [r for r in tuner.results if r.get("compute_type") == "int8"]
+    assert all(not r["ok"] and r["wer"] == pytest.approx(2 / 6) for r in int8)  # fastest, but drops words
+    (cuda,) = [r for r in tuner.results if r["device"] == "cuda"]
+    assert "no CUDA device" in cuda["error"]
+
+
+def test_no_candidate_meets_the_floor():
+    tuner = STTAutotuner(FakeModel, np.zeros(16000, dtype=np.float32), reference="etwas ganz anderes", repeats=1)
+    assert tuner.run(_cands(["int8", "float32"], (1,))) is None
+
+
+def test_candidates_only_offer_supported_compute_types():
+    pytest.importorskip("ctranslate2")
+    cands = candidates(["cpu"], ["int8", "float32", "bfloat99"], [2, 4])
+    assert {(c["compute_type"], c["cpu_threads"]) for c in cands} == {("int8", 2), ("int8", 4), ("float32", 2), ("float32", 4)}
+
+
+def test_saved_tuning_is_merged_and_read_at_startup(cfg):
+    save_tuning(cfg.STT_TUNE_FILE, "small", {"device": "cpu", "compute_type": "int8_float32", "cpu_threads": 6})
+    save_tuning(cfg.STT_TUNE_FILE, "medium", {"device": "cuda", "compute_type": "float16", "cpu_threads": 0})
+    assert set(json.load(open(cfg.STT_TUNE_FILE))["models"]) == {"small", "medium"}
+
+    engine = stt_mod.STTEngine(cfg, model_size="small")
+    assert engine.model.kwargs["device"] == "cpu"
+    assert engine.model.kwargs["compute_type"] == "int8_float32"
+    assert engine.model.kwargs["cpu_threads"] == 6
+    assert profile_key(cfg, "final") == ("large-v3-turbo", cfg.COMPUTE_TYPE)  # untuned model
+    cfg.set("voice.stt.profiles.final.model", "medium")
+    assert profile_key(cfg, "final") == ("medium", "float16")
+
+    # explicit arguments win over the tuning
+    engine = stt_mod.STTEngine(cfg, model_size="small", compute_type="int8", cpu_threads=2)
+    assert (engine.model.kwargs["compute_type"], engine.model.kwargs["cpu_threads"]) == ("int8", 2)
+
+
+def test_explicit_compute_type_ignores_the_tuned_device_and_threads(cfg):
+    save_tuning(cfg.STT_TUNE_FILE, "small", {"device": "cpu", "compute_type": "int8_float32", "cpu_threads": 6})
+    engine = stt_mod.STTEngine(cfg, model_size="small", compute_type="float16")  # e.g. a GPU profile
+    kw = engine.model.kwargs
+    assert (kw["device"], kw["compute_type"], kw["cpu_threads"]) == ("auto", "float16", 0)
+
+    # the pool resolves the tuned compute type and passes it back: the tuple still applies
+    engine = stt_mod.STTEngine(cfg, model_size="small", compute_type=compute_type_for(cfg, "small"))
+    kw = engine.model.kwargs
+    assert (kw["device"], kw["compute_type"], kw["cpu_threads"]) == ("cpu", "int8_float32", 6)
+
+
+def test_tuning_can_be_ignored(cfg):
+    save_tuning(cfg.STT_TUNE_FILE, "small", {"device": "cpu", "compute_type": "float32", "cpu_threads": 6})
+    cfg.set("voice.stt.use_tuning", False)
+    assert tuned_settings(cfg, "small") is None
+    engine = stt_mod.STTEngine(cfg, model_size="small")
+    assert engine.model.kwargs["device"] == "auto" and engine.model.kwargs["compute_type"] == cfg.COMPUTE_TYPE
+
+
+def test_backend_reads_the_same_tuning_file(cfg):
+    from voice_engine.stt.tuning import load_tuning
+
+    save_tuning(cfg.STT_TUNE_FILE, "small", {"device": "cpu", "compute_type": "int8", "cpu_threads": 4})
+    assert load_tuning(cfg.STT_TUNE_FILE, "small")["cpu_threads"] == 4
+    assert load_tuning(cfg.STT_TUNE_FILE, "medium") is None
+    assert load_tuning(None, "small") is None
@@ -0,0 +1,72 @@
+import time
+
+import numpy as np
+import pytest
+
+import wandavoice.stt as stt_mod
+
+
+class FakeWhisper:
+    """First decode is slow (lazy init), later ones are fast."""
+
+    instances = []
+
+    def __init__(self, *args, **kwargs):
+        self.calls = []
+        FakeWhisper.instances.append(self)
+
+    def transcribe(self, audio, **kwargs):
+        time.sleep(0.1 if not self.calls else 0.002)
+        self.calls.append(kwargs)
+        return iter([]), None
+
+
+@pytest.fixture
+def fake_whisper():
+    FakeWhisper.instances = []
+    return FakeWhisper
+
+
+@pytest.fixture
+def cfg(cfg):
+    cfg.set("voice.stt.warmup", True)
+    cfg.set("voice.stt.workers", 2)
+    return cfg
+
+
+def test_warmup_decodes_every_path_and_records_cold_vs_warm(cfg):
+    engine = stt_mod.STTEngine(cfg)
+
+    (model,) = FakeWhisper.instances
+    # cold pass + one per worker + warm pass, three decode paths each
+    assert len(model.calls) == 3 * (1 + 2 + 1)
+    assert {c["beam_size"] for c in model.calls} == {1, 5}
+    assert any(c.get("vad_filter") for c in model.calls)
+    assert any(c.get("word_timestamps") for c in model.calls)
+
+    cold, warm = engine.warmup_ms["STT_Warmup_Cold"], engine.warmup_ms["STT_Warmup_Warm"]
+    assert cold >= 100 and warm < cold
+
+
+def test_shared_model_is_warmed_once(cfg):
+    a = stt_mod.STTEngine(cfg)
+    b = stt_mod.STTEngine(cfg)
+    (model,) = FakeWhisper.instances
+    assert len(model.calls) == 12
+    assert b.warmup_ms == a.warmup_ms
+    (entry,) = stt_mod.registry.report()
+    assert set(entry["warmup_ms"]) == {"STT_Warmup_Cold", "STT_Warmup_Warm"}
+
+
+def test_warmup_can_be_disabled(cfg):
+    cfg.set("voice.stt.warmup", False)
+    engine = stt_mod.STTEngine(cfg)
+    assert FakeWhisper.instances[0].calls == []
+    assert engine.warmup_ms == {}
+
+
+def test_warmup_clip_is_deterministic_and_in_range():
+    clip = stt_mod.warmup_clip()
+    assert clip.dtype == np.float32 and len(clip) == 32000
+    assert np.array_equal(clip, stt_mod.warmup_clip())
+    assert 0.05 < np.abs(clip).max() < 1.0
@@ -0,0 +1,87 @@
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from wandavoice import vad
+
+
+def _audio(seconds=2.0):
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * 16000)) / 16000
+    a = 0.3 * np.sin(2 * np.pi * 180 * t) * (np.sin(2 * np.pi * 2 * t) > 0) + 0.01 * rng.standard_normal(len(t))
+    return a[: len(a) // 512 * 512].astype(np.float32)
+
+
+def test_onnx_streaming_matches_batch_reference_and_resets():
+    pytest.importorskip("onnxruntime")
+    fw_vad = pytest.importorskip("faster_whisper.vad")
+    path = vad.find_silero_onnx()
+    if path is None:
+        pytest.skip("no Silero ONNX model")
+
+    audio = _audio()
+    engine = vad.OnnxSileroVAD(path)
+    probs = [engine.speech_prob(audio[i:i + 512]) for i in range(0, len(audio), 512)]
+    ref = fw_vad.SileroVADModel(path)(audio.copy()).ravel()
+    # The reference zeroes the tail of its input in place, so the last window differs.
+    assert np.allclose(probs[:-1], ref[:-1], atol=1e-5)
+
+    engine.reset()
+    again = [engine.speech_prob(audio[i:i + 512]) for i in range(0, len(audio), 512)]
+    assert np.allclose(again, probs)
+
+
+def test_auto_falls_back_to_torch_without_onnx_model():
+    with patch.object(vad, "find_silero_onnx", return_value=None), \
+         patch.object(vad.TorchSileroVAD, "__init__", return_value=None):
+        assert isinstance(vad.load_vad("auto"), vad.TorchSileroVAD)
+        with pytest.raises(FileNotFoundError):
+            vad.load_vad("onnx")
+
+
+class _FakeInner(vad.VADEngine):
+    name = "fake"
+
+    def __init__(self):
+        self.seen = []
+        self.resets = 0
+
+    def reset(self):
+        self.resets += 1
+
+    def speech_prob(self, frame):
+        self.seen.append(round(float(frame[0]), 4))
+        return 0.9 if frame[0] >= 0.1 else 0.0
+
+
+def _frame(level):
+    return np.full(512, level, dtype=np.float32)
+
+
+def test_cascade_skips_inner_engine_on_silence():
+    inner = _FakeInner()
+    cascade = vad.CascadedVAD(inner)
+    cascade._webrtc = None  # energy gate only
+
+    assert all(cascade.speech_prob(_frame(0.0)) == 0.0 for _ in range(50))
+    assert inner.seen == []
+    assert cascade.windows == 50
+
+
+def test_cascade_warms_up_inner_engine_and_holds_while_speech():
+    inner = _FakeInner()
+    cascade = vad.CascadedVAD(inner, hangover=3, warmup=2)
+    cascade._webrtc = None
+
+    for level in (0.001, 0.002):
+        cascade.speech_prob(_frame(level))
+    assert cascade.speech_prob(_frame(0.5)) == 0.9
+    # Reset, then the two previous windows, then the current one.
+    assert inner.resets == 1
+    assert inner.seen == [0.001, 0.002, 0.5]
+
+    # Back to silence: the inner engine keeps running for the hangover only.
+    for _ in range(10):
+        cascade.speech_prob(_frame(0.0))
+    assert len(inner.seen) == 3 + 3
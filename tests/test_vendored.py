@@ -0,0 +1,38 @@
+"""The backend ships without wandavoice, so a few classes are vendored into it.
+
+Each pair below must stay identical: change the wandavoice original and
+copy it over.
+"""
+import ast
+import os
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+WANDAVOICE = os.path.join(ROOT, "src", "wandavoice")
+BACKEND = os.path.join(ROOT, "backend", "voice-engine", "src", "voice_engine")
+
+VENDORED = [
+    ("vad.py", "audio/vad.py", "OnnxSilero"),
+    ("model_registry.py", "models.py", "_rss_bytes"),
+    ("model_registry.py", "models.py", "_Entry"),
+    ("model_registry.py", "models.py", "ModelRegistry"),
+    ("ingest.py", "audio/resample.py", "StreamingResampler"),
+    ("stt_cache.py", "stt/cache.py", "STTResultCache"),
+]
+
+
+def _source(path, name):
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    for node in ast.parse(text).body:
+        if getattr(node, "name", None) == name:
+            return ast.get_source_segment(text, node)
+    raise AssertionError(f"{name} not found in {path}")
+
+
+@pytest.mark.parametrize("original,copy,name", VENDORED)
+def test_vendored_copy_matches_original(original, copy, name):
+    assert _source(os.path.join(BACKEND, copy), name) == _source(os.path.join(WANDAVOICE, original), name), (
+        f"voice_engine/{copy}:{name} differs from wandavoice/{original}"
+    )